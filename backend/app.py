@@ -3,46 +3,36 @@ import ipaddress
 import sqlite3
 import traceback
 from datetime import timedelta  # (남는다면 제거 가능)
-from flask import Flask, g, send_from_directory, abort, request, jsonify
+from flask import Flask, Response, abort, request, jsonify
 from flask_cors import CORS
-from flask_socketio import SocketIO
+
+import db as dbpool
+from realtime import socketio
+import jobs
+import images
+import realtime
+import metrics
+from migrations import migrate
+
+# 블루프린트 (import 시점에 라우트 모듈 / pandas 등을 미리 로드 — serve.py 는 fork 전에 로드)
+from routes.projects import projects_bp
+from routes.parts import parts_bp, order_bp
+from routes.aliases import aliases_bp
+from routes.assemblies import assemblies_bp
+from routes.search import search_bp
+from routes.jobs import jobs_bp
+from routes.stock import stock_bp
 
 # ─────────────────────────────────────────────────────────────
 # 기본 설정
 # ─────────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE = os.path.join(BASE_DIR, "inventory.db")
-
-app = Flask(__name__)
-app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "your_secret_key_here")
-
-app.config["DATABASE"] = DATABASE
-
-CORS(
-    app,
-    supports_credentials=False
-)
-
-# SocketIO 
-socketio = SocketIO(
-    app
-)
+DATABASE = dbpool.DB_PATH
 
 # ─────────────────────────────────────────────────────────────
-# DB 핸들러
+# DB 핸들러 (연결 풀 / PRAGMA는 db.py에서 일괄 관리)
 # ─────────────────────────────────────────────────────────────
-def get_db():
-    if "db" not in g:
-        # SocketIO/스레드 환경 고려
-        g.db = sqlite3.connect(DATABASE, check_same_thread=False)
-        g.db.row_factory = sqlite3.Row
-    return g.db
-
-@app.teardown_appcontext
-def close_db(error):
-    db = g.pop("db", None)
-    if db is not None:
-        db.close()
+get_db = dbpool.get_db
 
 def init_db_once():
     if not os.path.exists(DATABASE):
@@ -53,10 +43,30 @@ def init_db_once():
                 conn.executescript(f.read())
         print("DB 초기화 완료!")
 
+    # 기존 DB 포함, 미적용 스키마 마이그레이션 적용 (PRAGMA user_version)
+    with dbpool.connection() as conn:
+        migrate(conn)
+
+# ─────────────────────────────────────────────────────────────
+# 계측 게이지 (라우트별 지연 / 상태 코드 / SQL 훅은 create_app 에서 등록)
+# ─────────────────────────────────────────────────────────────
+def _pool_gauge():
+    stats = dbpool.pool.stats()
+    return {(("state", k),): stats[k] for k in ("in_use", "idle", "created", "reused", "discarded")}
+
+def _job_gauge():
+    return {(("status", k),): v for k, v in jobs.stats()["jobs"].items()}
+
+metrics.register_gauge("db_pool_connections", "SQLite connection pool counters.", _pool_gauge)
+metrics.register_gauge("jobs", "Background jobs by status.", _job_gauge)
+metrics.register_gauge("realtime_pending_events", "Coalesced SocketIO events waiting to be sent.",
+                       lambda: realtime.stats()["pending_events"])
+metrics.register_gauge("image_jobs_pending", "Image derivative jobs in flight.",
+                       lambda: images.stats()["pending"])
+
 # ─────────────────────────────────────────────────────────────
 # 사내망 IP 제한 (+ CORS preflight 허용)
 # ─────────────────────────────────────────────────────────────
-@app.before_request
 def restrict_to_company_wifi():
     if request.method == "OPTIONS": 
         return None
@@ -76,54 +86,83 @@ def restrict_to_company_wifi():
 # ─────────────────────────────────────────────────────────────
 # 헬스체크
 # ─────────────────────────────────────────────────────────────
-@app.route("/health", methods=["GET"])
 def health():
-    return jsonify({"status": "ok"}), 200
+    return jsonify({
+        "status": "ok",
+        "db_pool": dbpool.pool.stats(),
+        "jobs": jobs.stats(),
+        "realtime": realtime.stats(),
+        "images": images.stats(),
+    }), 200
+
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 # ─────────────────────────────────────────────────────────────
 # 정적 파일 (이미지) 서빙
+#   내용 해시 이름은 1년 immutable 캐시, ETag / Range 지원 (images.send_image)
 # ─────────────────────────────────────────────────────────────
-@app.route("/static/images/parts/<path:filename>")
 def serve_part_image(filename):
     try:
-        static_dir = os.path.join(BASE_DIR, "static", "images", "parts")
-        full_path = os.path.join(static_dir, filename)
-        if not os.path.isfile(full_path):
-            return "Not Found", 404
-        return send_from_directory(static_dir, filename)
+        return images.send_image("parts", filename)
     except Exception:
         traceback.print_exc()
         return "Internal Server Error", 500
 
-@app.route("/static/images/assemblies/<path:filename>")
 def serve_assembly_image(filename):
     try:
-        static_dir = os.path.join(BASE_DIR, "static", "images", "assemblies")
-        full_path = os.path.join(static_dir, filename)
-        if not os.path.isfile(full_path):
-            return "Not Found", 404
-        return send_from_directory(static_dir, filename)
+        return images.send_image("assemblies", filename)
     except Exception:
         traceback.print_exc()
         return "Internal Server Error", 500
 
 # ─────────────────────────────────────────────────────────────
-# 블루프린트 등록 (프로젝트 구조에 맞게 유지)
+# 앱 팩토리
+#   개발: python app.py (리로더 / 디버거)
+#   운영: python serve.py --workers N (serve.py 참고)
 # ─────────────────────────────────────────────────────────────
-from routes.projects import projects_bp
-from routes.parts import parts_bp, order_bp
-from routes.aliases import aliases_bp
-from routes.assemblies import assemblies_bp
-
-app.register_blueprint(projects_bp)
-app.register_blueprint(parts_bp)
-app.register_blueprint(order_bp)
-app.register_blueprint(assemblies_bp)
-app.register_blueprint(aliases_bp)
+def create_app(**socketio_options):
+    """
+    Flask 앱 생성 + 훅 / 라우트 / 블루프린트 등록.
+    socketio_options 는 SocketIO.init_app 으로 그대로 전달 (async_mode, client_manager 등).
+    """
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "your_secret_key_here")
+    app.config["DATABASE"] = DATABASE
+
+    CORS(
+        app,
+        supports_credentials=False
+    )
+
+    # SocketIO (인스턴스/이벤트 핸들러는 realtime.py)
+    socketio.init_app(app, **socketio_options)
+
+    dbpool.init_app(app)
+
+    # 계측은 IP 제한보다 먼저 등록해야 거부된 요청도 집계됨
+    metrics.init_app(app)
+    app.before_request(restrict_to_company_wifi)
+
+    app.add_url_rule("/health", view_func=health, methods=["GET"])
+    app.add_url_rule("/metrics", view_func=prometheus_metrics, methods=["GET"])
+    app.add_url_rule("/static/images/parts/<path:filename>", view_func=serve_part_image)
+    app.add_url_rule("/static/images/assemblies/<path:filename>", view_func=serve_assembly_image)
+
+    # 블루프린트 등록 (projects_bp 가 먼저: /api/assemblies 등 겹치는 규칙은 먼저 등록된 쪽)
+    app.register_blueprint(projects_bp)
+    app.register_blueprint(parts_bp)
+    app.register_blueprint(order_bp)
+    app.register_blueprint(assemblies_bp)
+    app.register_blueprint(aliases_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(stock_bp)
+    return app
 
 # ─────────────────────────────────────────────────────────────
-# 엔트리포인트
+# 엔트리포인트 (개발 서버)
 # ─────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     init_db_once()
-    socketio.run(app, host="0.0.0.0", port=8000, debug=True)
+    socketio.run(create_app(), host="0.0.0.0", port=8000, debug=True)
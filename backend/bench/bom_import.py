@@ -0,0 +1,200 @@
+# backend/bench/bom_import.py
+"""
+BOM CSV 업로드 벤치마크: 기존 iterrows() 경로 vs 컬럼 연산 + executemany 경로.
+
+    cd backend && python -m bench.bom_import --lines 20000
+
+두 경로를 같은 CSV / 같은 초기 DB로 돌려 결과(parts, assembly_parts, 경고)가
+동일한지 확인하고 소요 시간을 출력한다.
+"""
+import argparse
+import io
+import random
+import re
+import sqlite3
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+from migrations import migrate
+from routes.assemblies import (
+    canon_compare_py, sanitize_token_py, parse_qty_py,
+    resolve_bom_columns, derive_bom_rows, group_bom_rows, insert_bom_rows,
+)
+
+SCHEMA_PATH = __file__.rsplit("bench", 1)[0] + "schema.sql"
+
+DEVICES = ["R-US_0603", "C-US_0603", "C-US_0805", "LED_0603", "STM32F411CEU6", "LM1117-3.3",
+           "PINHD-1X4", "USB-C", "FUSE_1206", "BSS138", "TPS62130", "CRYSTAL_16MHZ"]
+VALUES = ["10k", "4.7k", "100nF", "1uF", "10uF", "RED", "GREEN", "", "3.3V", "16MHz", "1k–5%"]
+PACKAGES = ["R0603", "C0603", "C0805", "SOT23", "QFN48", "SOT223", "", "1X04"]
+
+
+def make_bom_csv(lines, seed=1):
+    """EAGLE/KiCad 혼합 형태의 BOM CSV (빈 행, 수량 0, 이름 없는 행 포함)"""
+    rnd = random.Random(seed)
+    out = io.StringIO()
+    out.write("Qty,Value,Device,Package,Parts,Description,Manufacturer,part_name\n")
+    for i in range(lines):
+        r = rnd.random()
+        if r < 0.01:
+            out.write(",,,,,,,\n")
+            continue
+        dev = rnd.choice(DEVICES)
+        val = rnd.choice(VALUES)
+        qty = rnd.choice(["1", "2", "4", "0", "1,000", "3 pcs", "2.0"]) if r < 0.05 else str(rnd.randint(1, 8))
+        refs = ";".join(f"{dev[0]}{rnd.randint(1, 999)}" for _ in range(rnd.randint(1, 3)))
+        name = f"PN-{rnd.randint(1, lines // 4)}" if r > 0.6 else ""
+        if r < 0.02:
+            dev, val, refs = "", "", ""
+        out.write(f'"{qty}","{val}","{dev}",{rnd.choice(PACKAGES)},"{refs}",desc {i % 97},MFR{i % 13},{name}\n')
+    return out.getvalue()
+
+
+def legacy_import(df, cur, assembly_id):
+    """기존 upload_assembly_csv 의 행 단위 처리 (비교 기준)"""
+    cols = resolve_bom_columns(df.columns)
+    col_part_name, col_quantity, col_reference = cols["part_name"], cols["quantity"], cols["reference"]
+    col_description, col_package, col_device = cols["description"], cols["package"], cols["device"]
+    col_value, col_mfr, col_category = cols["value"], cols["mfr"], cols["category"]
+
+    grouped_parts = defaultdict(lambda: {"quantity": 0, "reference": [], "row": None})
+    skipped_empty = 0
+    skipped_zero = 0
+    failed_rows = []
+
+    for idx, row in df.iterrows():
+        pn = ""
+        if col_part_name and col_part_name in row and pd.notna(row[col_part_name]):
+            pn = str(row[col_part_name]).strip()
+        if not pn:
+            device_raw = (str(row[col_device]).strip() if col_device and col_device in row and pd.notna(row[col_device]) else "")
+            value_raw = (str(row[col_value]).strip() if col_value and col_value in row and pd.notna(row[col_value]) else "")
+            dev_norm = canon_compare_py(device_raw)
+            val_norm = canon_compare_py(value_raw)
+            device_tok = sanitize_token_py(device_raw)
+            value_tok = sanitize_token_py(value_raw)
+            if dev_norm and val_norm:
+                if (dev_norm == val_norm) or (re.sub(r'[^a-z0-9]', '', dev_norm) == re.sub(r'[^a-z0-9]', '', val_norm)):
+                    base = device_tok
+                else:
+                    base = f"{device_tok}_{value_tok}"
+            elif dev_norm:
+                base = device_tok
+            elif val_norm:
+                base = value_tok
+            else:
+                ref_raw = (str(row[col_reference]).strip() if col_reference and col_reference in row and pd.notna(row[col_reference]) else "")
+                base = sanitize_token_py(ref_raw)
+            pn = base
+        if not pn:
+            if all((not pd.notna(row[c]) or str(row[c]).strip() == "") for c in df.columns):
+                skipped_empty += 1
+                continue
+            failed_rows.append((int(idx) + 2, "part_name empty"))
+            continue
+        raw_q = row[col_quantity] if col_quantity in row else None
+        try:
+            qty = int(float(raw_q)) if (raw_q is not None and not pd.isnull(raw_q)) else 0
+        except Exception:
+            qty = parse_qty_py(raw_q)
+        if not qty:
+            skipped_zero += 1
+            continue
+        ref = ""
+        if col_reference and col_reference in row and pd.notna(row[col_reference]):
+            ref = str(row[col_reference]).strip()
+        refs = [r.strip() for chunk in str(ref).split(';') for r in chunk.split(',') if r and r.strip()]
+        grouped_parts[pn]["quantity"] += qty
+        grouped_parts[pn]["reference"].extend(refs)
+        grouped_parts[pn]["row"] = row
+
+    inserted = 0
+    for part_name, data in grouped_parts.items():
+        row = data["row"]
+
+        def get_opt(col):
+            return (str(row[col]).strip() if (col and col in row and pd.notna(row[col])) else "")
+
+        try:
+            cur.execute("SELECT id FROM parts WHERE part_name = ?", (part_name,))
+            existing = cur.fetchone()
+            if existing:
+                part_id = existing[0]
+            else:
+                cur.execute("""
+                    INSERT INTO parts (
+                        part_name, manufacturer, description, package,
+                        category_large, memo, create_date, update_date
+                    ) VALUES (?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+                """, (part_name, get_opt(col_mfr), get_opt(col_description),
+                      get_opt(col_package) or part_name, get_opt(col_category), ""))
+                part_id = cur.lastrowid
+            cur.execute("""
+                INSERT INTO assembly_parts (assembly_id, part_id, quantity_per, reference)
+                VALUES (?, ?, ?, ?)
+            """, (assembly_id, part_id, data["quantity"], ', '.join(data["reference"])))
+            inserted += 1
+        except Exception as e:
+            failed_rows.append((int(getattr(row, 'name', 0)) + 2, str(e)))
+    return inserted, skipped_empty, skipped_zero, failed_rows
+
+
+def vectorized_import(df, cur, assembly_id):
+    rows, skipped_empty, skipped_zero, failed_rows = derive_bom_rows(df, resolve_bom_columns(df.columns))
+    inserted, insert_failures, _ = insert_bom_rows(cur, assembly_id, group_bom_rows(rows))
+    return inserted, skipped_empty, skipped_zero, failed_rows + insert_failures
+
+
+def fresh_db(existing_parts):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        conn.executescript(f.read())
+    migrate(conn, verbose=False)
+    conn.executemany("INSERT INTO parts (part_name, quantity) VALUES (?, 5)",
+                     [(n,) for n in existing_parts])
+    conn.execute("INSERT INTO assemblies (id, assembly_name) VALUES (1, 'bench')")
+    conn.commit()
+    return conn
+
+
+def snapshot(conn):
+    parts = conn.execute(
+        "SELECT id, part_name, manufacturer, description, package, category_large FROM parts ORDER BY id"
+    ).fetchall()
+    links = conn.execute(
+        "SELECT part_id, quantity_per, reference FROM assembly_parts ORDER BY part_id"
+    ).fetchall()
+    return [tuple(r) for r in parts], [tuple(r) for r in links]
+
+
+def run(lines, seed):
+    text = make_bom_csv(lines, seed)
+    existing = [f"PN-{i}" for i in range(1, lines // 8)] + ["R-US_0603_10k"]
+    results = {}
+    for label, fn in (("iterrows", legacy_import), ("vectorized", vectorized_import)):
+        df = pd.read_csv(io.StringIO(text), sep=None, engine="python")
+        df.columns = [str(c).strip().strip('"').strip() for c in df.columns]
+        conn = fresh_db(existing)
+        t0 = time.perf_counter()
+        out = fn(df, conn.cursor(), 1)
+        conn.commit()
+        elapsed = time.perf_counter() - t0
+        results[label] = (out, snapshot(conn), elapsed)
+        print(f"{label:>10}: {elapsed * 1000:9.1f} ms  inserted={out[0]} "
+              f"empty={out[1]} zero={out[2]} failed={len(out[3])}")
+
+    (a_out, a_snap, a_t), (b_out, b_snap, b_t) = results["iterrows"], results["vectorized"]
+    identical = a_out == b_out and a_snap == b_snap
+    print(f"identical results: {identical}   speedup: x{a_t / b_t:.1f}")
+    return identical
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lines", type=int, default=20000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    raise SystemExit(0 if run(args.lines, args.seed) else 1)
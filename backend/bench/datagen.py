@@ -0,0 +1,229 @@
+# backend/bench/datagen.py
+"""
+벤치마크용 대용량 DB 생성기 (seed 고정 -> 같은 옵션이면 같은 데이터).
+
+    cd backend && python -m bench.datagen                       # 기본: 부품 10만 / 어셈블리 5천 / BOM 100만 행
+    cd backend && python -m bench.datagen --scale 0.1 --out /tmp/small.db
+
+schema.sql 로 테이블을 만들고 데이터를 넣은 뒤 migrations.migrate() 를 적용한다.
+(인덱스 / FTS / 집계 테이블은 마이그레이션이 한 번에 만들므로 행 단위 트리거 비용이 없음)
+
+분포는 실제 재고와 비슷하게:
+- 부품은 분류(대/중/소)별 이름 규칙, 수동소자가 대부분이고 재고 0 / 음수도 섞임
+- BOM 은 인기 부품(저항/커패시터 등)이 여러 어셈블리에 반복 사용되는 멱함수 분포
+- 어셈블리 일부만 수량 할당, 프로젝트당 어셈블리 5~15개, 비슷한 부품끼리 alias 그룹
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from migrations import migrate
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema.sql")
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bench.db")
+
+# (대, 중, 소, 이름 접두어, 참조 기호, 패키지 후보, 비율)
+CATEGORIES = [
+    ("수동소자", "저항", "칩저항", "RES", "R", ["0402", "0603", "0805", "1206"], 0.30),
+    ("수동소자", "커패시터", "MLCC", "CAP", "C", ["0402", "0603", "0805", "1210"], 0.28),
+    ("수동소자", "커패시터", "전해", "ECAP", "C", ["D5", "D6.3", "D8"], 0.03),
+    ("수동소자", "인덕터", "파워인덕터", "IND", "L", ["0603", "1008", "4x4", "6x6"], 0.05),
+    ("반도체", "다이오드", "TVS", "DIO", "D", ["SOD-123", "SOD-323", "SMA"], 0.06),
+    ("반도체", "트랜지스터", "MOSFET", "FET", "Q", ["SOT-23", "SOT-223", "DFN3x3"], 0.05),
+    ("반도체", "IC", "MCU", "MCU", "U", ["QFN-32", "QFN-48", "LQFP-64"], 0.03),
+    ("반도체", "IC", "전원", "PMIC", "U", ["SOT-23-5", "SOIC-8", "QFN-16"], 0.05),
+    ("반도체", "IC", "인터페이스", "IFC", "U", ["SOIC-8", "TSSOP-16", "QFN-24"], 0.04),
+    ("반도체", "광소자", "LED", "LED", "D", ["0603", "0805", "PLCC-4"], 0.04),
+    ("기구", "커넥터", "헤더", "CON", "J", ["1x04", "2x05", "USB-C", "JST-PH"], 0.05),
+    ("기구", "스위치", "택트", "SW", "SW", ["6x6", "3x4"], 0.02),
+]
+SUPPLIERS = ["DigiKey", "Mouser", "LCSC", "디바이스마트", "엘레파츠", "Arrow"]
+MANUFACTURERS = ["Yageo", "Murata", "Samsung", "TDK", "Vishay", "ST", "TI", "Nexperia",
+                 "onsemi", "Molex", "JST", "Wurth"]
+SCALE_DEFAULTS = {"parts": 100_000, "assemblies": 5_000, "bom_lines": 1_000_000,
+                  "projects": 500, "alias_groups": 3_000, "orders": 20_000}
+
+
+def _dates(rng, n, start="2024-01-01", days=700):
+    base = np.datetime64(start)
+    offs = rng.integers(0, days * 86400, n)
+    return [str(d).replace("T", " ") for d in (base + offs.astype("timedelta64[s]"))]
+
+
+def gen_parts(rng, n):
+    weights = np.array([c[-1] for c in CATEGORIES])
+    cat = rng.choice(len(CATEGORIES), n, p=weights / weights.sum())
+    pkg_pick = rng.integers(0, 8, n)
+    qty = np.where(rng.random(n) < 0.08, rng.integers(-20, 1, n), rng.integers(0, 5000, n))
+    ordered = np.where(rng.random(n) < 0.1, rng.integers(1, 500, n), 0)
+    price = np.round(rng.lognormal(-1.5, 1.6, n), 3)
+    supplier = rng.integers(0, len(SUPPLIERS), n)
+    mfr = rng.integers(0, len(MANUFACTURERS), n)
+    created = _dates(rng, n)
+    updated = _dates(rng, n, start="2025-06-01", days=400)
+    loc = rng.integers(0, 20 * 12 * 6, n)  # 랙 A~T / 칸 01~12 / 단 1~6
+
+    rows = []
+    for i in range(n):
+        large, medium, small, prefix, _, pkgs, _ = CATEGORIES[cat[i]]
+        pkg = pkgs[pkg_pick[i] % len(pkgs)]
+        rows.append((
+            i + 1, f"{prefix}-{pkg}-{i + 1:06d}", int(qty[i]), int(ordered[i]), float(price[i]),
+            SUPPLIERS[supplier[i]], created[i][:10], MANUFACTURERS[mfr[i]],
+            f"{small} {pkg} #{i + 1}", "SMD" if not pkg[0].isalpha() or pkg.startswith("SO") else "THT",
+            pkg, f"{chr(65 + loc[i] // 72)}-{loc[i] // 6 % 12 + 1:02d}-{loc[i] % 6 + 1}",
+            large, medium, small, created[i], updated[i],
+        ))
+    return rows, cat
+
+
+def gen_bom(rng, n_parts, n_assemblies, n_lines):
+    """
+    (assembly_id, part_id) 고유 쌍 n_lines 개.
+    부품 번호가 작을수록 자주 쓰이는 멱함수 분포 (u^2.5), 어셈블리별 행 수는 자연스럽게 들쭉날쭉.
+    """
+    n_lines = min(n_lines, n_parts * n_assemblies)
+    pairs = np.empty(0, dtype=np.int64)
+    while len(pairs) < n_lines:
+        k = int((n_lines - len(pairs)) * 1.3) + 1000
+        asm = rng.integers(1, n_assemblies + 1, k)
+        part = (n_parts * rng.random(k) ** 2.5).astype(np.int64) + 1
+        pairs = np.unique(np.concatenate([pairs, asm * (n_parts + 1) + part]))
+    pairs = np.sort(rng.choice(pairs, n_lines, replace=False))
+    return pairs // (n_parts + 1), pairs % (n_parts + 1)
+
+
+def generate(path, parts, assemblies, bom_lines, projects, alias_groups, orders, seed=1, verbose=True):
+    def log(msg):
+        if verbose:
+            print(f"[{time.perf_counter() - t0:6.1f}s] {msg}")
+
+    t0 = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        conn.executescript(f.read())
+
+    part_rows, part_cat = gen_parts(rng, parts)
+    conn.executemany("""
+        INSERT INTO parts (id, part_name, quantity, ordered_quantity, price, supplier, purchase_date,
+                           manufacturer, description, mounting_type, package, location,
+                           category_large, category_medium, category_small, create_date, update_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, part_rows)
+    log(f"parts {parts}")
+
+    qtb = rng.choice([0, 1, 2, 5, 10, 20, 50, 100], assemblies, p=[.1, .15, .15, .2, .2, .1, .07, .03])
+    created = _dates(rng, assemblies)
+    conn.executemany("""
+        INSERT INTO assemblies (id, assembly_name, quantity_to_build, description, version,
+                                manufacturing_method, create_date, update_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (i + 1, f"PCB-{i + 1:05d}", int(qtb[i]), f"bench assembly {i + 1}", f"v{1 + i % 4}.{i % 10}",
+         "SMT" if i % 5 else "수작업", created[i], created[i])
+        for i in range(assemblies)
+    ])
+    log(f"assemblies {assemblies}")
+
+    asm_ids, part_ids = gen_bom(rng, parts, assemblies, bom_lines)
+    n = len(asm_ids)
+    qp = np.where(rng.random(n) < 0.7, rng.integers(1, 5, n), rng.integers(5, 33, n))
+    # 어셈블리 상태: 계획 60% (할당 없음) / 진행 30% (필요량의 0~100%) / 완료 10% (전부 할당)
+    state = rng.choice(3, assemblies + 1, p=[0.6, 0.3, 0.1])[asm_ids]
+    need = qp * qtb[asm_ids - 1]
+    alloc = np.select([state == 1, state == 2], [(need * rng.random(n)).astype(np.int64), need], 0)
+    ref_letter = [CATEGORIES[c][4] for c in part_cat]
+    conn.executemany("""
+        INSERT INTO assembly_parts (assembly_id, part_id, quantity_per, reference, allocated_quantity)
+        VALUES (?, ?, ?, ?, ?)
+    """, (
+        (int(a), int(p), int(q),
+         ", ".join(f"{ref_letter[p - 1]}{(j * 7 + int(p)) % 400 + 1}" for j in range(min(int(q), 6))),
+         int(al))
+        for a, p, q, al in zip(asm_ids, part_ids, qp, alloc)
+    ))
+    log(f"assembly_parts {n}")
+
+    conn.executemany(
+        "INSERT INTO projects (id, project_name, description, create_date) VALUES (?, ?, ?, ?)",
+        [(i + 1, f"PRJ-{i + 1:04d}", f"bench project {i + 1}", d) for i, d in enumerate(_dates(rng, projects))],
+    )
+    links = set()
+    for pid in range(1, projects + 1):
+        for aid in rng.choice(assemblies, int(rng.integers(5, 16)), replace=False):
+            links.add((pid, int(aid) + 1))
+    conn.executemany("INSERT INTO project_assemblies (project_id, assembly_id) VALUES (?, ?)", sorted(links))
+    log(f"projects {projects} (links {len(links)})")
+
+    # alias 그룹: 같은 분류의 부품 2~4개 (대체 가능 부품)
+    by_cat = [np.flatnonzero(part_cat == c) + 1 for c in range(len(CATEGORIES))]
+    alias_links = set()
+    conn.executemany("INSERT INTO aliases (id, alias_name) VALUES (?, ?)",
+                     [(g + 1, f"ALIAS-{g + 1:05d}") for g in range(alias_groups)])
+    for g in range(alias_groups):
+        pool = by_cat[int(part_cat[int(rng.integers(0, parts))])]
+        for pid in rng.choice(pool, min(len(pool), int(rng.integers(2, 5))), replace=False):
+            alias_links.add((g + 1, int(pid)))
+    conn.executemany("INSERT INTO alias_links (alias_id, part_id) VALUES (?, ?)", sorted(alias_links))
+    log(f"aliases {alias_groups} (links {len(alias_links)})")
+
+    # 미입고 주문: (part_id, order_date) 는 고유
+    seen = set()
+    order_rows = []
+    order_dates = _dates(rng, orders * 2, start="2026-01-01", days=300)
+    order_parts = (parts * rng.random(orders * 2) ** 2).astype(np.int64) + 1
+    for pid, d in zip(order_parts, order_dates):
+        key = (int(pid), d[:10])
+        if key in seen:
+            continue
+        seen.add(key)
+        order_rows.append((key[0], key[1], int(rng.integers(10, 2000))))
+        if len(order_rows) == orders:
+            break
+    conn.executemany("INSERT INTO part_orders (part_id, order_date, quantity_ordered) VALUES (?, ?, ?)",
+                     order_rows)
+    conn.commit()
+    log(f"part_orders {len(order_rows)}")
+
+    migrate(conn, verbose=False)
+    log("migrations (indexes / FTS / rollups)")
+
+    # 할당 상태 반영 (recalculate_assembly_status 와 같은 규칙)
+    conn.execute("""
+        UPDATE assemblies SET status = (
+            SELECT CASE WHEN r.total_required > 0 AND r.total_allocated = r.total_required THEN 'Completed'
+                        WHEN r.total_allocated > 0 THEN 'In Progress'
+                        ELSE 'Planned' END
+              FROM assembly_rollups r WHERE r.assembly_id = assemblies.id)
+        WHERE id IN (SELECT assembly_id FROM assembly_rollups WHERE total_lines > 0)
+    """)
+    conn.commit()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    log(f"done -> {path} ({os.path.getsize(path) / 1e6:.0f} MB)")
+    return path
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="벤치마크용 DB 생성")
+    ap.add_argument("--out", default=DEFAULT_OUT)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--scale", type=float, default=1.0, help="기본 크기에 곱할 배율")
+    for key, value in SCALE_DEFAULTS.items():
+        ap.add_argument(f"--{key.replace('_', '-')}", type=int, default=None, help=f"기본 {value}")
+    args = ap.parse_args()
+
+    sizes = {k: getattr(args, k) or max(1, int(v * args.scale)) for k, v in SCALE_DEFAULTS.items()}
+    generate(args.out, seed=args.seed, **sizes)
@@ -0,0 +1,405 @@
+# backend/bench/endpoints.py
+"""
+엔드포인트 벤치마크: 모든 블루프린트의 주요 API 를 두 가지 방식으로 측정하고 기준선과 비교.
+
+    client  Flask test client 로 순차 호출 (네트워크 / 서버 없이 뷰 + SQL 비용)
+    http    로컬 멀티스레드 HTTP 서버에 동시 요청 (--threads 개 연결, 시나리오당 --duration 초)
+
+    cd backend && python -m bench.datagen                      # bench/data/bench.db 생성 (최초 1회)
+    cd backend && python -m bench.endpoints                    # 측정 + bench/baseline.json 과 비교
+    cd backend && python -m bench.endpoints --save-baseline    # 현재 결과를 기준선으로 저장
+    cd backend && python -m bench.endpoints --mode http --threads 8 --only summary,parts
+    cd backend && python -m bench.endpoints --mode http --url http://127.0.0.1:8000   # 이미 떠 있는 서버
+
+시나리오별 p50 / p95 / p99 (ms), 처리량(req/s), 오류(5xx / 예외) 수를 출력한다.
+기준선 대비 p95 가 (1 + tolerance) 배 + noise-ms 를 넘거나, http 처리량이 1 / (1 + tolerance) 배
+아래로 떨어지면 회귀로 보고 종료 코드 1.
+쓰기 시나리오가 DB 를 바꾸므로 원본 DB 는 임시 복사본으로 측정한다.
+"""
+import argparse
+import http.client
+import io
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import namedtuple
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(BENCH_DIR, "data", "bench.db")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# method, path, json 본문, multipart 파일 {필드: (파일명, bytes)}, multipart 일반 필드
+Request = namedtuple("Request", "method path json files form", defaults=(None, None, None))
+
+
+# ─────────────────────────────────────────────────────────────
+# 시나리오 (이름, 블루프린트, 요청 생성 함수, 무거운 요청 여부)
+#   요청 생성 함수: (rng, fx) -> Request,  fx = 샘플 id 모음 (load_fixtures)
+# ─────────────────────────────────────────────────────────────
+Scenario = namedtuple("Scenario", "name blueprint make heavy")
+
+
+def _bom_csv(rng, lines=200):
+    from bench.bom_import import make_bom_csv
+    return make_bom_csv(lines, seed=rng.randint(1, 10 ** 6)).encode("utf-8")
+
+
+SCENARIOS = [
+    # projects
+    Scenario("projects.list", "projects", lambda r, fx: Request("GET", "/api/projects"), False),
+    Scenario("projects.detail", "projects",
+             lambda r, fx: Request("GET", f"/api/projects/{r.choice(fx['projects'])}"), False),
+    Scenario("projects.summary", "projects",
+             lambda r, fx: Request("GET", f"/api/projects/{r.choice(fx['projects'])}/summary"), False),
+    Scenario("projects.parts", "projects",
+             lambda r, fx: Request("GET", f"/api/projects/{r.choice(fx['projects'])}/parts"), False),
+    Scenario("projects.update", "projects",
+             lambda r, fx: Request("PUT", f"/api/projects/{r.choice(fx['projects'])}",
+                                   json={"description": f"bench {r.random():.6f}"}), False),
+    Scenario("assemblies.simple_list", "projects", lambda r, fx: Request("GET", "/api/assemblies"), False),
+    Scenario("assemblies.low_stock", "projects", lambda r, fx: Request("GET", "/api/assemblies/low_stock"), False),
+    Scenario("mrp", "projects", lambda r, fx: Request("GET", "/api/mrp"), True),
+
+    # parts
+    Scenario("parts.page", "parts", lambda r, fx: Request("GET", "/api/parts?limit=50"), False),
+    Scenario("parts.page_filtered", "parts",
+             lambda r, fx: Request("GET", f"/api/parts?limit=50&category_medium={r.choice(fx['categories'])}"), False),
+    Scenario("parts.all", "parts", lambda r, fx: Request("GET", "/api/parts"), True),
+    Scenario("parts.detail", "parts",
+             lambda r, fx: Request("GET", f"/api/parts/{r.choice(fx['parts'])}"), False),
+    Scenario("parts.update", "parts",
+             lambda r, fx: Request("PUT", f"/api/parts/full/{r.choice(fx['parts'])}",
+                                   json={"memo": f"bench {r.random():.6f}"}), False),
+    Scenario("parts.export_csv", "parts",
+             lambda r, fx: Request("GET", f"/api/parts/export?category_medium={r.choice(fx['categories'])}"), True),
+    Scenario("categories.tree", "parts", lambda r, fx: Request("GET", "/api/categories/tree"), False),
+    Scenario("bom.allocate", "parts",
+             lambda r, fx: Request("PUT", "/api/assemblies/{}/bom/{}/allocate".format(*r.choice(fx["bom"])),
+                                   json={"amount": 1}), False),
+    Scenario("bom.deallocate", "parts",
+             lambda r, fx: Request("PUT", "/api/assemblies/{}/bom/{}/deallocate".format(*r.choice(fx["allocated"])),
+                                   json={"amount": 1}), False),
+    Scenario("assemblies.allocate_all", "parts",
+             lambda r, fx: Request("POST", f"/api/assemblies/{r.choice(fx['assemblies'])}/allocate-all",
+                                   json={"fraction": 0.1}), True),
+
+    # orders
+    Scenario("orders.by_part", "orders",
+             lambda r, fx: Request("GET", f"/api/parts/{r.choice(fx['ordered_parts'])}/orders"), False),
+    Scenario("orders.recent", "orders", lambda r, fx: Request("GET", "/api/part_orders/recent"), False),
+    Scenario("orders.create", "orders",
+             lambda r, fx: Request("POST", "/api/part_orders", json={
+                 "part_id": r.choice(fx["parts"]), "order_date": f"2026-{r.randint(1, 12):02d}-{r.randint(1, 28):02d}",
+                 "quantity_ordered": r.randint(1, 100)}), False),
+
+    # aliases
+    Scenario("aliases.by_part", "aliases",
+             lambda r, fx: Request("GET", f"/api/parts/{r.choice(fx['alias_parts'])}/alias"), False),
+    Scenario("aliases.search", "aliases",
+             lambda r, fx: Request("GET", f"/api/aliases/search?q={r.randint(1, 999)}"), False),
+    Scenario("aliases.links", "aliases",
+             lambda r, fx: Request("GET", f"/api/aliases/{r.choice(fx['aliases'])}/links"), False),
+
+    # assemblies
+    Scenario("assemblies.list", "assemblies", lambda r, fx: Request("GET", "/api/assemblies"), False),
+    Scenario("assemblies.detail", "assemblies",
+             lambda r, fx: Request("GET", f"/api/assemblies/{r.choice(fx['assemblies'])}/detail"), False),
+    Scenario("assemblies.buildable", "assemblies",
+             lambda r, fx: Request("GET", "/api/assemblies/buildable"), True),
+    Scenario("bom.update", "assemblies",
+             lambda r, fx: Request("PUT", "/api/assemblies/{}/bom/{}".format(*r.choice(fx["bom"])),
+                                   json={"reference": "R1", "quantity_per": r.randint(1, 4)}), False),
+    Scenario("assemblies.upload_csv", "assemblies",
+             lambda r, fx: Request("POST", "/api/assemblies/upload_csv",
+                                   files={"file": ("bench.csv", _bom_csv(r))},
+                                   form={"assembly_name": f"bench-{uuid.uuid4().hex[:12]}", "sync": "1"}), True),
+
+    # search / jobs
+    Scenario("search", "search",
+             lambda r, fx: Request("GET", f"/api/search?q={r.choice(fx['search_terms'])}"), False),
+    Scenario("jobs.get", "jobs", lambda r, fx: Request("GET", f"/api/jobs/{fx['job_id']}"), False),
+]
+
+
+def load_fixtures(path, seed):
+    """시나리오가 쓸 id 샘플 (DB 에 실제로 있는 값)"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+
+    def ids(sql, k=200):
+        rows = [r[0] if len(r) == 1 else tuple(r) for r in conn.execute(sql)]
+        return rng.sample(rows, min(k, len(rows))) or [0]
+
+    fx = {
+        "projects": ids("SELECT id FROM projects"),
+        "assemblies": ids("SELECT id FROM assemblies"),
+        "parts": ids("SELECT id FROM parts"),
+        "bom": ids("SELECT assembly_id, part_id FROM assembly_parts WHERE rowid % 97 = 0"),
+        "allocated": ids("SELECT assembly_id, part_id FROM assembly_parts "
+                         "WHERE allocated_quantity > 50 AND rowid % 13 = 0"),
+        "ordered_parts": ids("SELECT DISTINCT part_id FROM part_orders"),
+        "aliases": ids("SELECT id FROM aliases"),
+        "alias_parts": ids("SELECT part_id FROM alias_links"),
+        "categories": [r[0] for r in conn.execute(
+            "SELECT DISTINCT category_medium FROM parts WHERE category_medium IS NOT NULL")] or [""],
+        "search_terms": ["0603", "MLCC", "RES 0402", "MCU", "USB", "TVS", "Murata", "LED 0805"],
+    }
+    conn.close()
+    return fx
+
+
+# ─────────────────────────────────────────────────────────────
+# 측정
+# ─────────────────────────────────────────────────────────────
+def summarize(latencies, elapsed, errors):
+    lat = np.asarray(latencies) * 1000
+    if not len(lat):
+        return {"n": 0, "p50": None, "p95": None, "p99": None, "rps": 0.0, "errors": errors}
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+    return {"n": len(lat), "p50": round(float(p50), 2), "p95": round(float(p95), 2),
+            "p99": round(float(p99), 2), "rps": round(len(lat) / elapsed, 1), "errors": errors}
+
+
+def run_client(app, scenarios, fx, requests, seed):
+    client = app.test_client()
+    env = {"REMOTE_ADDR": "127.0.0.1"}
+    results = {}
+    for sc in scenarios:
+        rng = random.Random(seed)
+        n = max(3, requests // 10) if sc.heavy else requests
+        latencies, errors = [], 0
+        for i in range(n + 2):  # 앞의 2회는 워밍업
+            req = sc.make(rng, fx)
+            kwargs = {"json": req.json} if req.json is not None else {}
+            if req.files:
+                kwargs = {"data": dict(req.form or {}, **{k: (io.BytesIO(v[1]), v[0]) for k, v in req.files.items()}),
+                          "content_type": "multipart/form-data"}
+            t = time.perf_counter()
+            resp = client.open(req.path, method=req.method, environ_base=env, buffered=True, **kwargs)
+            resp.get_data()
+            resp.close()
+            if i >= 2:
+                latencies.append(time.perf_counter() - t)
+                errors += resp.status_code >= 500
+        results[sc.name] = summarize(latencies, sum(latencies), errors)
+        _print_row(sc.name, results[sc.name])
+    return results
+
+
+def _encode(req):
+    """Request -> (body bytes, headers)"""
+    if req.files:
+        boundary = uuid.uuid4().hex
+        parts = []
+        for k, v in (req.form or {}).items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'.encode())
+        for k, (filename, data) in req.files.items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"; filename="{filename}"\r\n'
+                         f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b"\r\n")
+        parts.append(f"--{boundary}--\r\n".encode())
+        return b"".join(parts), {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    if req.json is not None:
+        return json.dumps(req.json).encode(), {"Content-Type": "application/json"}
+    return None, {}
+
+
+def run_http(base_url, scenarios, fx, threads, duration, seed, quiet=False):
+    """시나리오마다 threads 개 연결로 duration 초 동안 요청 (keep-alive)"""
+    url = urlsplit(base_url)
+    results = {}
+    for sc in scenarios:
+        latencies, errors = [], [0]
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def worker(idx):
+            rng = random.Random(seed * 1000 + idx)
+            conn = http.client.HTTPConnection(url.hostname, url.port, timeout=120)
+            local, local_errors = [], 0
+            while time.perf_counter() < deadline:
+                req = sc.make(rng, fx)
+                body, headers = _encode(req)
+                t = time.perf_counter()
+                try:
+                    # 공백 / 한글 분류명은 test client 와 달리 직접 인코딩해야 함
+                    conn.request(req.method, quote(req.path, safe="/?&=%"), body=body, headers=headers)
+                    resp = conn.getresponse()
+                    resp.read()
+                    local.append(time.perf_counter() - t)
+                    local_errors += resp.status >= 500
+                except (OSError, http.client.HTTPException):
+                    local_errors += 1
+                    conn.close()
+                    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=120)
+            conn.close()
+            with lock:
+                latencies.extend(local)
+                errors[0] += local_errors
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        results[sc.name] = summarize(latencies, time.perf_counter() - started, errors[0])
+        if not quiet:
+            _print_row(sc.name, results[sc.name])
+    return results
+
+
+def serve_in_thread(app):
+    """werkzeug 멀티스레드 서버를 임의 포트로 띄우고 base URL 반환"""
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # 요청마다 찍히는 접근 로그 끔
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _print_row(name, r):
+    fmt = lambda v: "-" if v is None else f"{v:9.2f}"
+    print(f"  {name:<26} n={r['n']:<6} p50={fmt(r['p50'])} p95={fmt(r['p95'])} p99={fmt(r['p99'])} ms"
+          f"  {r['rps']:8.1f} req/s  err={r['errors']}")
+
+
+# ─────────────────────────────────────────────────────────────
+# 기준선 비교
+# ─────────────────────────────────────────────────────────────
+def compare(results, baseline, tolerance, noise_ms):
+    """회귀 목록 [(mode, 시나리오, 설명)]"""
+    regressions = []
+    for mode, scenarios in results.items():
+        for name, cur in scenarios.items():
+            base = baseline.get(mode, {}).get(name)
+            if not base or cur["p95"] is None or base.get("p95") is None:
+                continue
+            limit = base["p95"] * (1 + tolerance) + noise_ms
+            if cur["p95"] > limit:
+                regressions.append((mode, name, f"p95 {cur['p95']:.2f} ms > {limit:.2f} ms (기준 {base['p95']:.2f})"))
+            if mode == "http" and base.get("rps") and cur["rps"] < base["rps"] / (1 + tolerance):
+                regressions.append((mode, name, f"처리량 {cur['rps']:.1f} < {base['rps'] / (1 + tolerance):.1f} req/s"
+                                                f" (기준 {base['rps']:.1f})"))
+            if cur["errors"] > base.get("errors", 0):
+                regressions.append((mode, name, f"오류 {cur['errors']}건 (기준 {base.get('errors', 0)})"))
+    return regressions
+
+
+def dataset_meta(path):
+    conn = sqlite3.connect(path)
+    meta = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+            for t in ("parts", "assemblies", "assembly_parts", "projects", "alias_links", "part_orders")}
+    conn.close()
+    return meta
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="엔드포인트 벤치마크")
+    ap.add_argument("--db", default=DEFAULT_DB, help="bench.datagen 으로 만든 DB")
+    ap.add_argument("--mode", choices=["client", "http", "both"], default="both")
+    ap.add_argument("--requests", type=int, default=50, help="client: 시나리오당 요청 수 (무거운 것은 1/10)")
+    ap.add_argument("--threads", type=int, default=4, help="http: 동시 연결 수")
+    ap.add_argument("--duration", type=float, default=3.0, help="http: 시나리오당 초")
+    ap.add_argument("--url", help="http: 이미 실행 중인 서버 (없으면 내장 서버)")
+    ap.add_argument("--only", help="시나리오 이름/블루프린트 부분 문자열 (쉼표 구분)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.3, help="허용 비율 (0.3 = 30%%)")
+    ap.add_argument("--noise-ms", type=float, default=2.0, help="p95 비교에 더하는 절대 여유")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"{args.db} 가 없습니다. 먼저 python -m bench.datagen 으로 생성하세요.")
+        return 2
+
+    scenarios = SCENARIOS
+    if args.only:
+        keys = [k.strip() for k in args.only.split(",") if k.strip()]
+        scenarios = [s for s in SCENARIOS if any(k in s.name or k == s.blueprint for k in keys)]
+
+    # 쓰기 시나리오가 원본을 바꾸지 않도록 임시 복사본 사용 (앱 import 전에 경로 지정)
+    workdir = tempfile.mkdtemp(prefix="inv-bench-")
+    work_db = os.path.join(workdir, "bench.db")
+    shutil.copyfile(args.db, work_db)
+    os.environ["INVENTORY_DB"] = work_db
+    os.environ.setdefault("SLOW_QUERY_MS", "0")  # 느린 쿼리 로그(EXPLAIN)가 측정에 섞이지 않도록
+
+    from app import create_app
+
+    app = create_app()
+
+    fx = load_fixtures(work_db, args.seed)
+    # jobs.get 용 작업 하나 (BOM 업로드는 기본이 작업)
+    resp = app.test_client().post(
+        "/api/assemblies/upload_csv", environ_base={"REMOTE_ADDR": "127.0.0.1"},
+        data={"file": (io.BytesIO(_bom_csv(random.Random(args.seed), 50)), "job.csv"),
+              "assembly_name": "bench-job"},
+        content_type="multipart/form-data",
+    )
+    fx["job_id"] = resp.get_json()["job_id"]
+
+    results = {}
+    try:
+        if args.mode in ("client", "both"):
+            print(f"[client] {len(scenarios)} scenarios, {args.requests} requests each")
+            results["client"] = run_client(app, scenarios, fx, args.requests, args.seed)
+        if args.mode in ("http", "both"):
+            server = None
+            base_url = args.url
+            if not base_url:
+                server, base_url = serve_in_thread(app)
+            print(f"[http] {base_url} threads={args.threads} duration={args.duration}s")
+            try:
+                results["http"] = run_http(base_url, scenarios, fx, args.threads, args.duration, args.seed)
+            finally:
+                if server is not None:
+                    server.shutdown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline["meta"] = {
+            "dataset": dataset_meta(args.db), "python": platform.python_version(),
+            "machine": platform.machine(), "cpus": os.cpu_count(), "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "requests": args.requests, "threads": args.threads, "duration": args.duration,
+        }
+        for mode, scenarios_result in results.items():
+            baseline.setdefault(mode, {}).update(scenarios_result)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"기준선 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("기준선이 없습니다 (--save-baseline 으로 생성).")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.noise_ms)
+    for mode, name, why in regressions:
+        print(f"REGRESSION [{mode}] {name}: {why}")
+    print("회귀 없음" if not regressions else f"회귀 {len(regressions)}건")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
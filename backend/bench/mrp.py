@@ -0,0 +1,120 @@
+# backend/bench/mrp.py
+"""
+MRP(/api/mrp) / 생산 가능 수량(/api/assemblies/buildable) 입력 경계값 확인 + BOM 로딩 시간.
+
+    cd backend && python -m bench.mrp                          # 경계값 확인만
+    cd backend && python -m bench.mrp --db bench/data/bench.db # + 대용량 DB 로딩 / 계산 시간
+
+작은 메모리 DB 에 실제로 저장될 수 있는 값들을 넣고 mrp_report / buildable_report 결과를 손계산과 비교:
+- quantity_per = 2.5 (컬럼 affinity 상 REAL 로 저장됨) -> 올림 3 으로 계산
+- 없는 부품(최대 id 보다 큰 id)을 가리키는 alias_links 행 (FK 강제 전에 남은 행) -> 무시
+어긋나면 종료 코드 1.
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+import mrp
+from migrations import migrate
+
+SCHEMA_PATH = __file__.rsplit("bench", 1)[0] + "schema.sql"
+
+
+def edge_case_db():
+    """
+    부품 1(재고 10), 2(재고 4), 3(재고 0) / 어셈블리 1 (5대, 프로젝트 1 소속)
+    BOM: 부품 1 x 2.5, 부품 2 x 1, 부품 3 x 1
+    호환 그룹: {2, 3}, 그리고 부품 3 과 없는 부품 999 를 잇는 그룹
+    """
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        conn.executescript(f.read())
+    migrate(conn, verbose=False)
+    conn.executemany("INSERT INTO parts (id, part_name, quantity) VALUES (?, ?, ?)",
+                     [(1, "P1", 10), (2, "P2", 4), (3, "P3", 0)])
+    conn.execute("INSERT INTO assemblies (id, assembly_name, quantity_to_build) VALUES (1, 'A1', 5)")
+    conn.execute("INSERT INTO projects (id, project_name) VALUES (1, 'PRJ')")
+    conn.execute("INSERT INTO project_assemblies (project_id, assembly_id) VALUES (1, 1)")
+    conn.executemany("INSERT INTO assembly_parts (assembly_id, part_id, quantity_per) VALUES (1, ?, ?)",
+                     [(1, 2.5), (2, 1), (3, 1)])
+    conn.executemany("INSERT INTO aliases (id, alias_name) VALUES (?, ?)", [(1, "G23"), (2, "G3-dangling")])
+    conn.executemany("INSERT INTO alias_links (alias_id, part_id) VALUES (?, ?)",
+                     [(1, 2), (1, 3), (2, 3), (2, 999)])
+    conn.commit()
+    return conn
+
+
+def check_edge_cases():
+    """-> 실패 메시지 목록"""
+    conn = edge_case_db()
+    failures = []
+
+    def expect(label, got, want):
+        if got != want:
+            failures.append(f"{label}: {got!r} != {want!r}")
+
+    stored = conn.execute("SELECT typeof(quantity_per) FROM assembly_parts WHERE part_id = 1").fetchone()[0]
+    expect("quantity_per 저장 타입", stored, "real")
+
+    # 소요: 부품 1 = 3 x 5 = 15 (재고 10 -> 부족 5), 부품 2/3 = 5 씩
+    # 그룹 {2, 3}: 소요 10, 공급 4 -> 그룹 부족 6 을 부품별 부족(1, 5) 비율로 배분
+    parts = {p["part_id"]: p for p in mrp.mrp_report(conn, include_all=True)["parts"]}
+    expect("mrp 부품 1 소요", parts[1]["gross_demand"], 15)
+    expect("mrp 부품 1 순부족", parts[1]["net_shortage"], 5)
+    expect("mrp 부품 2 순부족", parts[2]["net_shortage"], 1)
+    expect("mrp 부품 3 순부족", parts[3]["net_shortage"], 5)
+    expect("mrp 그룹", (parts[2]["pool_id"], parts[3]["pool_id"], parts[3]["pool_shortage"]), (2, 2, 6))
+
+    # 부품만: 1 -> 10 // 3 = 3, 2 -> 4, 3 -> 0   /  그룹 재고: 3 -> 4 이므로 부품 1 이 제약
+    plain = mrp.buildable_report(conn)[0]
+    expect("buildable", (plain["buildable"], plain["limiting_part"]["part_id"]), (0, 3))
+    pooled = mrp.buildable_report(conn, use_aliases=True)[0]
+    expect("buildable (aliases)", (pooled["buildable"], pooled["limiting_part"]["part_id"],
+                                   pooled["limiting_part"]["quantity_per"]), (3, 1, 3))
+
+    # 없는 부품을 가리키는 연결이 compute_* 에 직접 들어와도 배열 범위를 넘지 않아야 함
+    links = mrp.pd.DataFrame({"alias_id": [2, 2], "part_id": [3, 999]})
+    bom = mrp.load_bom_lines(conn)
+    stock = mrp.load_stock(conn)
+    try:
+        mrp.compute_buildable(bom, stock, links)
+        mrp.compute_mrp(bom.assign(remaining=0), stock, mrp.np.empty((0, 2), dtype=mrp.np.int64), links)
+    except IndexError as e:
+        failures.append(f"alias_links part_id 999: {e}")
+
+    conn.close()
+    return failures
+
+
+def time_report(path):
+    conn = sqlite3.connect(path)
+    t = time.perf_counter()
+    bom = mrp.load_bom_lines(conn)
+    print(f"load_bom_lines    {len(bom):>9} rows  {(time.perf_counter() - t) * 1000:8.1f} ms")
+    t = time.perf_counter()
+    report = mrp.mrp_report(conn, limit=100)
+    print(f"mrp_report        {report['summary']['bom_lines']:>9} rows  {(time.perf_counter() - t) * 1000:8.1f} ms")
+    t = time.perf_counter()
+    items = mrp.buildable_report(conn, use_aliases=True)
+    print(f"buildable_report  {len(items):>9} asm   {(time.perf_counter() - t) * 1000:8.1f} ms")
+    conn.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="MRP / buildable 경계값 확인")
+    ap.add_argument("--db", help="로딩 / 계산 시간을 잴 bench.datagen DB (생략하면 확인만)")
+    args = ap.parse_args(argv)
+
+    failures = check_edge_cases()
+    for why in failures:
+        print(f"FAILED {why}")
+    print("경계값 확인 통과" if not failures else f"경계값 확인 실패 {len(failures)}건")
+    if args.db:
+        time_report(args.db)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
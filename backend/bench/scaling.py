@@ -0,0 +1,150 @@
+# backend/bench/scaling.py
+"""
+워커 수별 처리량 부하 테스트: serve.py 를 --workers 1, 2, 4 ... 로 차례로 띄우고
+같은 읽기 위주 요청 묶음을 같은 동시성으로 보내 req/s 와 지연을 비교한다.
+
+    cd backend && python -m bench.datagen                          # bench/data/bench.db (최초 1회)
+    cd backend && python -m bench.scaling                          # 워커 1, 2, 4
+    cd backend && python -m bench.scaling --workers 1,2,4,8 --clients 4 --threads 8 --duration 10
+    cd backend && python -m bench.scaling --worker-class eventlet
+
+- 부하는 --clients 개 프로세스 x --threads 개 keep-alive 연결 (클라이언트 GIL 이 먼저 막히지 않도록).
+  요청마다 READ_MIX 시나리오 중 하나를 무작위로 고른다 (bench.endpoints 의 시나리오 재사용).
+- p50 / p95 는 클라이언트 프로세스별 값 중 가장 나쁜 값.
+- 처리량은 CPU 코어 수까지 워커 수에 비례해 늘어야 한다. 코어보다 워커가 많으면 의미 없음.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from bench.endpoints import DEFAULT_DB, SCENARIOS, Scenario, load_fixtures, run_http
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 요청 하나가 수~수십 ms 인 읽기 API (초 단위 집계는 빼서 몇 요청이 측정을 좌우하지 않게)
+READ_MIX = (
+    "projects.detail", "parts.page", "parts.page_filtered", "parts.detail", "categories.tree",
+    "orders.by_part", "aliases.by_part", "aliases.search", "assemblies.detail",
+)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, worker_class, env, log_path):
+    port = _free_port()
+    with open(log_path, "wb") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(workers), "--worker-class", worker_class],
+            cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                raise RuntimeError(f"serve.py 종료됨:\n{f.read()}")
+        try:
+            urllib.request.urlopen(base_url + "/health", timeout=1).read()
+            return proc, base_url
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("serve.py 가 60초 안에 응답하지 않음")
+
+
+def stop_server(proc):
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _client(base_url, names, fx, threads, duration, seed):
+    """클라이언트 프로세스: 시나리오 이름으로 섞인 요청 묶음을 만들어 run_http"""
+    chosen = [s for s in SCENARIOS if s.name in names]
+    mixed = Scenario("mixed", "-", lambda r, f: r.choice(chosen).make(r, f), False)
+    return run_http(base_url, [mixed], fx, threads, duration, seed, quiet=True)["mixed"]
+
+
+def measure(base_url, names, fx, clients, threads, duration, seed):
+    args = [(base_url, names, fx, threads, duration, seed * 100 + i) for i in range(clients)]
+    with multiprocessing.get_context("fork").Pool(clients) as pool:
+        parts = pool.starmap(_client, args)
+    worst = lambda key: max((p[key] for p in parts if p[key] is not None), default=None)
+    return {
+        "n": sum(p["n"] for p in parts),
+        "rps": round(sum(p["rps"] for p in parts), 1),
+        "p50": worst("p50"),
+        "p95": worst("p95"),
+        "errors": sum(p["errors"] for p in parts),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="워커 수별 처리량 부하 테스트")
+    ap.add_argument("--db", default=DEFAULT_DB, help="bench.datagen 으로 만든 DB")
+    ap.add_argument("--workers", default="1,2,4", help="비교할 워커 수 (쉼표 구분)")
+    ap.add_argument("--worker-class", default="auto", help="serve.py --worker-class")
+    ap.add_argument("--clients", type=int, default=4, help="부하 생성 프로세스 수")
+    ap.add_argument("--threads", type=int, default=8, help="프로세스당 동시 연결 수")
+    ap.add_argument("--duration", type=float, default=10.0, help="워커 수마다 측정 시간(초)")
+    ap.add_argument("--only", help="READ_MIX 대신 쓸 시나리오 이름 (쉼표 구분)")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"{args.db} 가 없습니다. 먼저 python -m bench.datagen 으로 생성하세요.")
+        return 2
+
+    names = tuple(n.strip() for n in args.only.split(",")) if args.only else READ_MIX
+    counts = [int(n) for n in args.workers.split(",") if n.strip()]
+
+    workdir = tempfile.mkdtemp(prefix="inv-scaling-")
+    work_db = os.path.join(workdir, "bench.db")
+    shutil.copyfile(args.db, work_db)
+    env = dict(os.environ, INVENTORY_DB=work_db, SLOW_QUERY_MS="0")
+    fx = load_fixtures(work_db, args.seed)
+    random.seed(args.seed)
+
+    cpus = os.cpu_count() or 1
+    print(f"CPU {cpus}개, 부하 {args.clients} 프로세스 x {args.threads} 연결, 워커 수마다 {args.duration:g}초")
+    if max(counts) > cpus:
+        print(f"  (워커 {max(counts)}개 > CPU {cpus}개: CPU 수를 넘는 구간은 처리량이 늘지 않음)")
+    print(f"  {'workers':>7} {'req/s':>9} {'x':>6} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+
+    results = {}
+    try:
+        for n in counts:
+            proc, base_url = start_server(n, args.worker_class, env, os.path.join(workdir, f"serve-{n}.log"))
+            try:
+                measure(base_url, names, fx, args.clients, args.threads, 1.0, args.seed)  # 워밍업
+                r = results[n] = measure(base_url, names, fx, args.clients, args.threads,
+                                         args.duration, args.seed)
+            finally:
+                stop_server(proc)
+            base = results[counts[0]]["rps"] or 1
+            print(f"  {n:>7} {r['rps']:>9.1f} {r['rps'] / base:>6.2f} {r['p50']:>8.2f} {r['p95']:>8.2f}"
+                  f" {r['errors']:>7}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if any(r["errors"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
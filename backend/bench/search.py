@@ -0,0 +1,122 @@
+# backend/bench/search.py
+"""
+통합 검색(/api/search) 확인: 부품 20만 건에서 순위 정확성 + 검색어별 지연.
+
+    cd backend && python -m bench.search                       # bench/data/search200k.db 없으면 생성 후 측정
+    cd backend && python -m bench.search --requests 200 --target-ms 8
+
+정확성
+- 오래된(id 가 작은) 부품을 "RES" 로 이름을 바꾸고 q=RES 의 첫 결과인지 확인
+  (일치가 수만 건이어도 가장 좋은 일치가 빠지지 않아야 함)
+- 검색어마다 API 결과 점수가 전체 일치에 대한 bm25 상위 limit 개와 같은지 비교
+
+지연
+- QUERIES: 한두 글자 토큰(완전 일치) / 일치가 3천 건 안팎 이하인 검색어 -> p95 가 --target-ms 이하
+- BROAD_QUERIES: 일치가 수천~수만 건인 넓은 접두어 -> 모든 일치에 bm25 를 계산하므로 일치 수에 비례, 출력만
+
+이름을 바꾸므로 원본 DB 는 임시 복사본으로 측정한다. 정확성 / 목표 중 하나라도 어긋나면 종료 코드 1.
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from urllib.parse import quote
+
+from bench.endpoints import BENCH_DIR, Request, Scenario, run_client
+
+DEFAULT_DB = os.path.join(BENCH_DIR, "data", "search200k.db")
+PARTS = 200_000
+LIMIT = 20
+
+QUERIES = ["r", "c", "re", "10", "USB", "LED 0805"]
+BROAD_QUERIES = ["RES", "CAP", "MLCC", "0603", "RES 0402", "Murata", "MCU"]
+
+
+def check_ranking(client, db_path):
+    """정확성 확인 -> 실패 메시지 목록"""
+    env = {"REMOTE_ADDR": "127.0.0.1"}
+    failures = []
+
+    conn = sqlite3.connect(db_path)
+    old_id = conn.execute("SELECT MIN(id) FROM parts WHERE part_name LIKE 'RES-%'").fetchone()[0]
+    conn.execute("UPDATE parts SET part_name = 'RES' WHERE id = ?", (old_id,))  # parts_fts_au 트리거로 반영
+    conn.commit()
+
+    first = client.get("/api/search?q=RES", environ_base=env).get_json()
+    if not first or first[0]["part_id"] != old_id:
+        got = first[0]["part_id"] if first else None
+        failures.append(f"q=RES: 이름이 정확히 일치하는 오래된 부품 {old_id} 가 첫 결과가 아님 (첫 결과 {got})")
+
+    from routes.search import BM25_WEIGHTS, to_match_query
+
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    for q in QUERIES + BROAD_QUERIES:
+        expected = [round(r[0], 6) for r in conn.execute(
+            f"SELECT bm25(parts_fts, {weights}) AS s FROM parts_fts WHERE parts_fts MATCH ? ORDER BY s LIMIT ?",
+            (to_match_query(q), LIMIT),
+        )]
+        got = [round(r["score"], 6) for r in
+               client.get(f"/api/search?q={quote(q)}&limit={LIMIT}", environ_base=env).get_json()]
+        if got != expected:
+            failures.append(f"q={q!r}: 점수 {got[:3]}... != 전체 bm25 상위 {expected[:3]}...")
+    conn.close()
+    return failures
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="검색 정확성 / 지연 확인 (부품 20만)")
+    ap.add_argument("--db", default=DEFAULT_DB, help=f"없으면 부품 {PARTS:,}건으로 생성")
+    ap.add_argument("--requests", type=int, default=100, help="검색어당 요청 수")
+    ap.add_argument("--target-ms", type=float, default=10.0, help="QUERIES 의 검색어별 p95 목표")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        os.makedirs(os.path.dirname(args.db), exist_ok=True)
+        from bench.datagen import generate
+
+        # 검색은 parts / alias 만 보므로 BOM 등은 작게
+        generate(args.db, parts=PARTS, assemblies=500, bom_lines=50_000, projects=50,
+                 alias_groups=6_000, orders=2_000, seed=args.seed)
+
+    # db 모듈이 import 시점에 경로를 읽으므로 app import 전에 지정
+    workdir = tempfile.mkdtemp(prefix="inv-search-")
+    work_db = os.path.join(workdir, "search.db")
+    shutil.copyfile(args.db, work_db)
+    os.environ["INVENTORY_DB"] = work_db
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+
+    try:
+        from app import create_app, init_db_once
+
+        init_db_once()  # 예전에 만든 DB 면 검색 인덱스 마이그레이션 적용
+        app = create_app()
+
+        failures = check_ranking(app.test_client(), work_db)
+        for why in failures:
+            print(f"RANKING {why}")
+
+        def scenarios(queries):
+            return [Scenario(f"search {q!r}", "search",
+                             lambda r, fx, q=q: Request("GET", f"/api/search?q={quote(q)}"), False)
+                    for q in queries]
+
+        print(f"[client] {len(QUERIES)} queries, {args.requests} requests each, target p95 <= {args.target_ms} ms")
+        results = run_client(app, scenarios(QUERIES), {}, args.requests, args.seed)
+        print(f"[client] broad prefixes (no target), {max(3, args.requests // 10)} requests each")
+        run_client(app, scenarios(BROAD_QUERIES), {}, max(3, args.requests // 10), args.seed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    over = [(name, r["p95"]) for name, r in results.items() if r["errors"] or r["p95"] > args.target_ms]
+    for name, p95 in over:
+        print(f"TARGET MISSED {name}: p95 {p95:.2f} ms > {args.target_ms} ms")
+    ok = not over and not failures
+    print("정확성 / 목표 충족" if ok else f"순위 오류 {len(failures)}건, 목표 초과 {len(over)}건")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# backend/db.py
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from flask import g
+
+import metrics
+
+# ─────────────────────────────────────────────────────────────
+# 경로 / 설정
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.getenv("INVENTORY_DB", os.path.join(BASE_DIR, "inventory.db"))
+
+# 연결마다 한 번만 적용되는 PRAGMA (연결 생성 시점)
+BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE", "256"))
+POOL_MAX_IDLE = int(os.getenv("DB_POOL_MAX_IDLE", "16"))
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    "PRAGMA foreign_keys=ON",
+    f"PRAGMA mmap_size={MMAP_SIZE}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+class ConnectionPool:
+    """
+    SQLite 연결 풀.
+    - 연결은 체크아웃된 동안 한 스레드만 사용하고, 반납되면 유휴 스택에 보관 후 재사용
+    - PRAGMA / statement cache 설정은 연결 생성 시 한 번만 적용
+    - 유휴 연결이 max_idle을 넘으면 반납 시 닫음
+    """
+
+    def __init__(self, path, max_idle=POOL_MAX_IDLE):
+        self.path = path
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "released": 0,
+            "discarded": 0,
+            "in_use": 0,
+        }
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            factory=metrics.TracedConnection,  # 문장 수 / SQL 시간 / 느린 쿼리 계측
+        )
+        metrics.instrument(conn)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            self._stats["in_use"] += 1
+            if conn is not None:
+                self._stats["reused"] += 1
+                return conn
+            self._stats["created"] += 1
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._stats["in_use"] -= 1
+            raise
+
+    def release(self, conn):
+        # 커밋되지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            self._stats["in_use"] -= 1
+            self._stats["released"] += 1
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+            self._stats["discarded"] += 1
+        conn.close()
+
+    def _discard(self, conn):
+        with self._lock:
+            self._stats["in_use"] -= 1
+            self._stats["discarded"] += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, idle=len(self._idle), max_idle=self.max_idle, path=self.path)
+
+
+pool = ConnectionPool(DB_PATH)
+
+
+# ─────────────────────────────────────────────────────────────
+# Flask 요청 단위 핸들러
+# ─────────────────────────────────────────────────────────────
+def get_db():
+    if "db" not in g:
+        g.db = pool.acquire()
+    return g.db
+
+
+def close_db(error=None):
+    db = g.pop("db", None)
+    if db is not None:
+        pool.release(db)
+
+
+@contextmanager
+def connection():
+    """요청 컨텍스트 밖(백그라운드 작업, CLI 등)에서 쓰는 연결."""
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def init_app(app):
+    app.config.setdefault("DATABASE", DB_PATH)
+    app.teardown_appcontext(close_db)
@@ -0,0 +1,232 @@
+# backend/forecast.py
+"""
+부품별 일간 사용량 집계(part_usage_daily) + 소진 예측.
+
+part_usage_daily 는 stock_movements INSERT 트리거로 증분 유지한다 (adjust 는 사용량이 아니므로 제외).
+
+    consumed   allocate 로 나간 수량          (allocate_part / allocate-all)
+    returned   deallocate / swap_return 로 돌아온 수량
+    received   receive 로 들어온 수량          (fulfill_part_order)
+
+예측은 최근 window 일(기본 FORECAST_WINDOW_DAYS)의 집계만 벌크로 읽고 numpy 로 전 부품을 한 번에 계산한다.
+
+    소모율(burn)   = MAX(window 일 이동평균, 최근 SHORT_WINDOW_DAYS 일 이동평균)   (순소모 = consumed - returned)
+    소진까지 일수  = 현재 재고 / burn                   (burn 이 0 이하면 예측 없음)
+    발주 포함      = (현재 재고 + 미입고 주문) / burn
+
+짧은 창을 같이 보는 건 최근에 소모가 늘어난 부품을 긴 평균이 늦게 잡아내지 않게 하려는 것.
+집계가 어긋났다고 의심되면:
+
+    python forecast.py            # 원장(stock_movements)으로 전체 재계산
+"""
+import os
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import db as dbpool
+from mrp import _rows, _part_names, load_stock
+
+WINDOW_DAYS = int(os.getenv("FORECAST_WINDOW_DAYS", "28"))
+SHORT_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 365
+
+USAGE_DDL = """
+CREATE TABLE IF NOT EXISTS part_usage_daily (
+    part_id  INTEGER NOT NULL REFERENCES parts(id) ON DELETE CASCADE,
+    day      TEXT    NOT NULL,  -- 'YYYY-MM-DD' (stock_movements.created_at 의 날짜, 로컬 시각)
+    consumed INTEGER NOT NULL DEFAULT 0,
+    returned INTEGER NOT NULL DEFAULT 0,
+    received INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (part_id, day)
+) WITHOUT ROWID;
+
+-- 예측: 최근 N일 범위만 인덱스로 읽음
+CREATE INDEX IF NOT EXISTS idx_part_usage_daily_day
+    ON part_usage_daily(day, part_id, consumed, returned, received);
+
+CREATE TRIGGER IF NOT EXISTS stock_movements_usage_ai
+AFTER INSERT ON stock_movements WHEN new.kind != 'adjust' BEGIN
+    INSERT INTO part_usage_daily (part_id, day, consumed, returned, received)
+    VALUES (
+        new.part_id,
+        substr(new.created_at, 1, 10),
+        CASE WHEN new.kind = 'allocate' THEN -new.quantity ELSE 0 END,
+        CASE WHEN new.kind IN ('deallocate', 'swap_return') THEN new.quantity ELSE 0 END,
+        CASE WHEN new.kind = 'receive' THEN new.quantity ELSE 0 END
+    )
+    ON CONFLICT (part_id, day) DO UPDATE SET
+        consumed = consumed + excluded.consumed,
+        returned = returned + excluded.returned,
+        received = received + excluded.received;
+END;
+"""
+
+
+def rebuild_usage(conn):
+    """stock_movements 전체로 집계를 다시 계산 (커밋은 호출자 몫)."""
+    conn.execute("DELETE FROM part_usage_daily")
+    conn.execute("""
+        INSERT INTO part_usage_daily (part_id, day, consumed, returned, received)
+        SELECT part_id,
+               substr(created_at, 1, 10) AS day,
+               SUM(CASE WHEN kind = 'allocate' THEN -quantity ELSE 0 END),
+               SUM(CASE WHEN kind IN ('deallocate', 'swap_return') THEN quantity ELSE 0 END),
+               SUM(CASE WHEN kind = 'receive' THEN quantity ELSE 0 END)
+        FROM stock_movements
+        WHERE kind != 'adjust'
+        GROUP BY part_id, day
+    """)
+
+
+# ─────────────────────────────────────────────────────────────
+# 예측 (벌크 쿼리 3회 + numpy)
+# ─────────────────────────────────────────────────────────────
+def load_usage(conn, today, window):
+    """최근 window 일 집계 -> int64 배열 [[part_id, age(오늘=0), 순소모, 입고], ...]"""
+    since = (today - timedelta(days=window - 1)).isoformat()
+    return np.array(
+        _rows(conn, """
+            SELECT part_id,
+                   CAST(julianday(?) - julianday(day) AS INTEGER),
+                   consumed - returned,
+                   received
+            FROM part_usage_daily
+            WHERE day >= ? AND day <= ?
+        """, (today.isoformat(), since, today.isoformat())),
+        dtype=np.int64,
+    ).reshape(-1, 4)
+
+
+def compute_forecast(stock, usage, orders, window, short_window=SHORT_WINDOW_DAYS):
+    """
+    stock: [[part_id, 재고]], usage: load_usage, orders: [[part_id, 미입고 합]]
+    -> DataFrame(index=part_id) 최근 window 일 사용 기록이 있는 부품만
+    """
+    stock = stock[np.argsort(stock[:, 0], kind="stable")]
+    ids, qty = stock[:, 0], stock[:, 1]
+    n = len(ids)
+
+    def per_part(rows, values):
+        """rows 의 part_id 별 values 합 (ids 순서, 없는 부품은 버림)"""
+        idx = np.searchsorted(ids, rows[:, 0])
+        ok = idx < n
+        ok[ok] = ids[idx[ok]] == rows[ok, 0]
+        return np.bincount(idx[ok], weights=values[ok], minlength=n)
+
+    net = usage[:, 2].astype(np.float64)
+    recent = usage[:, 1] < short_window
+    consumed = per_part(usage, net)
+    received = per_part(usage, usage[:, 3].astype(np.float64))
+    burn_long = consumed / window
+    burn_short = per_part(usage[recent], net[recent]) / min(short_window, window)
+    burn = np.maximum(np.maximum(burn_long, burn_short), 0)
+
+    on_order = per_part(orders, orders[:, 1].astype(np.float64))
+    active = burn > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = np.where(active, qty / burn, np.inf)
+        days_with_orders = np.where(active, (qty + on_order) / burn, np.inf)
+
+    has_usage = per_part(usage, np.ones(len(usage))) > 0
+    return pd.DataFrame({
+        "quantity": qty,
+        "on_order": on_order.astype(np.int64),
+        "consumed": consumed.astype(np.int64),
+        "received": received.astype(np.int64),
+        "burn_long": burn_long,
+        "burn_short": burn_short,
+        "burn_rate": burn,
+        "days_to_stockout": days_left,
+        "days_with_orders": days_with_orders,
+    }, index=pd.Index(ids, name="part_id"))[has_usage]
+
+
+SORTS = {
+    # 이름: (컬럼들, 오름차순 여부)
+    "urgency": (["days_to_stockout", "burn_rate"], [True, False]),
+    "coverage": (["days_with_orders", "burn_rate"], [True, False]),
+    "burn": (["burn_rate", "days_to_stockout"], [False, True]),
+}
+
+# (epoch, parts, part_orders 카운터, 오늘, window) 가 같으면 예측 재사용 (정렬 순서도 정렬 키별로 보관)
+_cache = {"key": None, "entry": None}
+_cache_lock = threading.Lock()
+
+
+def _forecast_frame(conn, key, today, window):
+    with _cache_lock:
+        if _cache["key"] != key:
+            stock = load_stock(conn)
+            usage = load_usage(conn, today, window)
+            orders = np.array(
+                _rows(conn, "SELECT part_id, SUM(quantity_ordered) FROM part_orders GROUP BY part_id"),
+                dtype=np.int64,
+            ).reshape(-1, 2)
+            _cache["entry"] = {"frame": compute_forecast(stock, usage, orders, window), "sorted": {}}
+            _cache["key"] = key
+        return _cache["entry"]
+
+
+def forecast_report(conn, versions_key, sort="urgency", limit=None, today=None, window=WINDOW_DAYS):
+    """API 응답용: 사용량이 있는 부품을 sort 순서로 + 요약"""
+    today = today or date.today()
+    entry = _forecast_frame(conn, (versions_key, today, window), today, window)
+    frame = entry["frame"]
+    with _cache_lock:
+        order = entry["sorted"].get(sort)
+        if order is None:
+            columns, ascending = SORTS[sort]
+            order = entry["sorted"][sort] = frame.sort_values(
+                columns, ascending=ascending, kind="stable"
+            ).index.to_numpy()
+    part_ids = order[:limit] if limit else order
+    rows = frame.loc[part_ids]
+    names = _part_names(conn, part_ids)
+
+    def days(v):
+        return None if not np.isfinite(v) else round(float(v), 1)
+
+    items = []
+    for pid, r in zip(part_ids.tolist(), rows.itertuples(index=False)):
+        left = days(r.days_to_stockout)
+        items.append({
+            "part_id": pid,
+            "part_name": names.get(pid),
+            "quantity": int(r.quantity),
+            "on_order": int(r.on_order),
+            "consumed": int(r.consumed),
+            "received": int(r.received),
+            "burn_rate": round(float(r.burn_rate), 3),
+            "burn_short": round(float(r.burn_short), 3),
+            "burn_long": round(float(r.burn_long), 3),
+            "days_to_stockout": left,
+            "stockout_date": (today + timedelta(days=int(left))).isoformat() if left is not None else None,
+            "days_with_orders": days(r.days_with_orders),
+        })
+
+    left = frame["days_to_stockout"].to_numpy()
+    return {
+        "as_of": today.isoformat(),
+        "window_days": window,
+        "sort": sort,
+        "parts": items,
+        "summary": {
+            "parts_with_usage": int(len(frame)),
+            "parts_burning": int((frame["burn_rate"] > 0).sum()),
+            "out_of_stock": int((left <= 0).sum()),
+            "stockout_within_7d": int((left < 7).sum()),
+            "stockout_within_window": int((left < window).sum()),
+        },
+    }
+
+
+if __name__ == "__main__":
+    with dbpool.connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rebuild_usage(conn)
+        conn.commit()
+        n = conn.execute("SELECT COUNT(*) FROM part_usage_daily").fetchone()[0]
+        print(f"part_usage_daily 재계산 완료: {n}행")
@@ -0,0 +1,320 @@
+# backend/images.py
+"""
+업로드 이미지 저장 / 파생본(derivative) 생성 / 서빙.
+
+원본은 내용 해시를 넣은 이름(part_<id>.<sha256 16자>.<ext>)으로 저장하고, 파생본도 그 이름을
+앞부분으로 쓴다. 이름이 바뀌지 않으면 내용도 바뀌지 않으므로 1년 immutable 캐시로 내보낸다.
+
+    image_thumb   목록용 썸네일 (긴 변 THUMB_PX, JPEG)
+    image_detail  상세 화면용 (긴 변 DETAIL_PX, JPEG)
+    image_webp    상세 크기 WebP
+
+리사이즈는 ProcessPoolExecutor 작업 프로세스에서 (요청 스레드 / GIL 과 분리) 하고,
+끝나면 파일명을 image_filename 옆 컬럼에 기록한다.
+Pillow 가 없으면 파생본을 만들지 않고 URL 은 원본으로 대체한다.
+
+    python images.py backfill          # 파생본이 없는 기존 이미지 일괄 생성
+    python images.py backfill --force  # 전부 다시 생성
+"""
+import os
+import re
+import sys
+import glob
+import hashlib
+import mimetypes
+import traceback
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from flask import request, Response
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow 미설치: 원본만 사용
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGE_ROOT = os.path.join(BASE_DIR, "static", "images")
+
+THUMB_PX = int(os.getenv("IMAGE_THUMB_PX", "320"))
+DETAIL_PX = int(os.getenv("IMAGE_DETAIL_PX", "1280"))
+WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+# 테이블(= static/images 하위 폴더) -> 파일명 접두어
+KINDS = {
+    "parts": "part",
+    "assemblies": "assembly",
+}
+DERIVATIVE_COLUMNS = ("image_thumb", "image_detail", "image_webp")
+
+# 내용 해시가 들어간 이름 (원본 / 파생본)
+HASHED_NAME = re.compile(r"^[a-z]+_\d+\.[0-9a-f]{16}(_[a-z]+)?\.[a-z0-9]+$")
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+STAT_CACHE_MAX = 10000
+
+
+def image_dir(kind):
+    return os.path.join(IMAGE_ROOT, kind)
+
+
+def image_url(kind, filename):
+    return f"/static/images/{kind}/{filename}" if filename else None
+
+
+def image_urls(kind, row):
+    """row(dict) -> image_url / thumb_url / detail_url / webp_url (파생본이 없으면 원본 URL)"""
+    original = image_url(kind, row.get("image_filename"))
+    return {
+        "image_url": original,
+        "thumb_url": image_url(kind, row.get("image_thumb")) or original,
+        "detail_url": image_url(kind, row.get("image_detail")) or original,
+        "webp_url": image_url(kind, row.get("image_webp")),
+    }
+
+
+def remove_images(kind, item_id, keep=None):
+    """
+    항목의 원본 / 파생본 파일 삭제.
+    part_<id>.* (원본, 해시 이름 파생본) + part_<id>_* (이전 이름 규칙 파생본)
+    keep 이 주어지면 그 파일과 그 파일의 파생본은 남김.
+    """
+    prefix = os.path.join(image_dir(kind), f"{KINDS[kind]}_{item_id}")
+    keep_stem = keep.rsplit(".", 1)[0] if keep else None
+    for path in glob.glob(prefix + ".*") + glob.glob(prefix + "_*"):
+        if keep_stem and os.path.basename(path).startswith(keep_stem):
+            continue
+        os.remove(path)
+        forget(path)
+
+
+def save_upload(kind, item_id, storage, ext):
+    """
+    업로드 파일(FileStorage)을 내용 해시 이름으로 저장하고 이전 이미지를 지움. 파일명 반환.
+    """
+    data = storage.read()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    filename = f"{KINDS[kind]}_{item_id}.{digest}.{ext}"
+
+    out_dir = image_dir(kind)
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = os.path.join(out_dir, f".{filename}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, os.path.join(out_dir, filename))
+
+    remove_images(kind, item_id, keep=filename)
+    return filename
+
+
+# ─────────────────────────────────────────────────────────────
+# 서빙 (stat 캐시 + ETag / Range + 해시 이름은 immutable)
+# ─────────────────────────────────────────────────────────────
+_stat_cache = {}  # 경로 -> (size, mtime, etag)
+_stat_lock = threading.Lock()
+
+
+def forget(path):
+    with _stat_lock:
+        _stat_cache.pop(path, None)
+
+
+def send_image(kind, filename):
+    """
+    static/images/<kind>/<filename> 응답.
+    isfile + stat 대신 파일을 바로 열고, 크기/ETag 는 처음 한 번만 fstat 해서 캐시한다.
+    (파일이 지워지면 open 이 실패하므로 캐시에서도 뺌)
+    """
+    path = safe_join(image_dir(kind), filename)
+    if path is None:
+        return "Not Found", 404
+    try:
+        f = open(path, "rb")
+    except (FileNotFoundError, IsADirectoryError):
+        forget(path)
+        return "Not Found", 404
+
+    with _stat_lock:
+        entry = _stat_cache.get(path)
+    if entry is None:
+        st = os.fstat(f.fileno())
+        entry = (st.st_size, st.st_mtime, f"{st.st_mtime_ns:x}-{st.st_size:x}")
+        with _stat_lock:
+            if len(_stat_cache) >= STAT_CACHE_MAX:
+                _stat_cache.clear()
+            _stat_cache[path] = entry
+    size, mtime, etag = entry
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    rv = Response(wrap_file(request.environ, f), mimetype=mimetype, direct_passthrough=True)
+    rv.content_length = size
+    rv.last_modified = int(mtime)
+    rv.set_etag(etag)
+    if HASHED_NAME.match(filename):
+        rv.cache_control.public = True
+        rv.cache_control.max_age = IMMUTABLE_MAX_AGE
+        rv.cache_control.immutable = True
+    else:
+        # 이전 규칙(part_<id>.<ext>) 이름은 내용이 바뀔 수 있으므로 매번 ETag 재검증
+        rv.cache_control.no_cache = True
+    return rv.make_conditional(request, accept_ranges=True, complete_length=size)
+
+
+# ─────────────────────────────────────────────────────────────
+# 작업 프로세스에서 실행
+# ─────────────────────────────────────────────────────────────
+def _save(img, out_dir, name, fmt, **opts):
+    # 완성된 파일만 보이도록 임시 파일에 쓰고 교체
+    tmp = os.path.join(out_dir, f".{name}.tmp")
+    img.save(tmp, fmt, **opts)
+    os.replace(tmp, os.path.join(out_dir, name))
+    return name
+
+
+def render_derivatives(src, out_dir, stem, thumb_px=THUMB_PX, detail_px=DETAIL_PX):
+    """원본 -> 파생 파일 3개 생성, {컬럼: 파일명} 반환"""
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)  # 휴대폰 사진 회전 정보 반영
+        if im.mode not in ("RGB", "L"):
+            # 투명 배경은 흰색으로 (JPEG 저장용)
+            rgba = im.convert("RGBA")
+            im = Image.new("RGB", rgba.size, "white")
+            im.paste(rgba, mask=rgba.split()[-1])
+
+        detail = im.copy()
+        detail.thumbnail((detail_px, detail_px), Image.LANCZOS)
+        thumb = detail.copy()
+        thumb.thumbnail((thumb_px, thumb_px), Image.LANCZOS)
+
+        return {
+            "image_thumb": _save(thumb, out_dir, f"{stem}_thumb.jpg", "JPEG", quality=82, optimize=True),
+            "image_detail": _save(detail, out_dir, f"{stem}_detail.jpg", "JPEG",
+                                  quality=85, optimize=True, progressive=True),
+            "image_webp": _save(detail, out_dir, f"{stem}_detail.webp", "WEBP", quality=80, method=4),
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# 프로세스 풀 / DB 기록
+# ─────────────────────────────────────────────────────────────
+_pool = None
+_pool_lock = threading.Lock()
+_inflight = 0  # 제출됐지만 아직 끝나지 않은 리사이즈 작업 수
+
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # fork 대신 spawn: 서버의 스레드 / 소켓 상태를 복제하지 않음
+            _pool = ProcessPoolExecutor(
+                max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def submit(kind, item_id, filename):
+    """파생본 생성 작업 제출 (Pillow 없으면 None)"""
+    global _inflight
+    if Image is None:
+        return None
+    # 파생본 이름 = 원본 이름(확장자 제외) + _thumb 등 -> 원본 해시를 그대로 물려받음
+    future = _executor().submit(
+        render_derivatives,
+        os.path.join(image_dir(kind), filename),
+        image_dir(kind),
+        filename.rsplit(".", 1)[0],
+    )
+    with _pool_lock:
+        _inflight += 1
+    future.add_done_callback(_finished)
+    return future
+
+
+def _finished(_future):
+    global _inflight
+    with _pool_lock:
+        _inflight -= 1
+
+
+def stats():
+    with _pool_lock:
+        return {"workers": WORKERS, "started": _pool is not None, "pending": _inflight,
+                "derivatives": Image is not None}
+
+
+def store(kind, item_id, filename, names):
+    """파생본 파일명 기록. 그 사이 이미지가 바뀌었으면 기록하지 않음."""
+    import db as dbpool
+
+    with dbpool.connection() as conn:
+        conn.execute(
+            f"""
+            UPDATE {kind}
+            SET image_thumb = ?, image_detail = ?, image_webp = ?
+            WHERE id = ? AND image_filename = ?
+            """,
+            (names["image_thumb"], names["image_detail"], names["image_webp"], item_id, filename),
+        )
+        conn.commit()
+
+
+def schedule(kind, item_id, filename):
+    """
+    원본 저장 + image_filename 커밋 직후 호출.
+    작업 프로세스에서 리사이즈하고, 끝나면 (풀 관리 스레드에서) DB에 기록.
+    """
+    future = submit(kind, item_id, filename)
+    if future is None:
+        return None
+
+    def done(f):
+        try:
+            store(kind, item_id, filename, f.result())
+        except Exception:
+            traceback.print_exc()
+
+    future.add_done_callback(done)
+    return future
+
+
+def backfill(force=False):
+    """기존 이미지 파생본 일괄 생성. (처리 수, 실패 수) 반환"""
+    import db as dbpool
+
+    if Image is None:
+        print("Pillow 가 설치되어 있지 않아 파생본을 만들 수 없습니다. (pip install Pillow)")
+        return 0, 0
+
+    pending = {}
+    with dbpool.connection() as conn:
+        for kind in KINDS:
+            sql = f"SELECT id, image_filename FROM {kind} WHERE COALESCE(image_filename, '') != ''"
+            if not force:
+                sql += " AND image_thumb IS NULL"
+            for row in conn.execute(sql).fetchall():
+                if not os.path.isfile(os.path.join(image_dir(kind), row["image_filename"])):
+                    continue
+                future = submit(kind, row["id"], row["image_filename"])
+                pending[future] = (kind, row["id"], row["image_filename"])
+
+    done = failed = 0
+    for future in as_completed(pending):
+        kind, item_id, filename = pending[future]
+        try:
+            store(kind, item_id, filename, future.result())
+            done += 1
+        except Exception as e:
+            failed += 1
+            print(f"{kind} {item_id} ({filename}) 실패: {e}")
+    return done, failed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "backfill":
+        ok, bad = backfill(force="--force" in sys.argv)
+        print(f"파생본 생성: {ok}개, 실패: {bad}개")
+    else:
+        print(__doc__)
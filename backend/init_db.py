@@ -6,5 +6,10 @@ def init_db():
             conn.executescript(f.read())
     print("DB 생성 완료: inventory.db")
 
+    # 인덱스 / 트리거 등 스키마 변경분 적용
+    from migrations import migrate
+    with sqlite3.connect("inventory.db") as conn:
+        migrate(conn)
+
 if __name__ == "__main__":
     init_db()
@@ -0,0 +1,150 @@
+# backend/ipc.py
+"""
+워커 프로세스 간 공유 상태 (serve.py --workers N 용, 로컬 SQLite 파일 하나).
+
+    messages   SocketIO 메시지 큐. 한 워커의 emit / join_room 을 다른 워커들이 폴링해 전달
+    jobs       백그라운드 작업 스냅샷. 작업을 실행하지 않은 워커도 GET /api/jobs/<id> 응답
+
+- 재고 DB(inventory.db)와 파일을 나눠 쓰기 잠금이 서로 막지 않게 한다.
+  내용은 휘발성이라 synchronous=OFF, 오래된 메시지 / 끝난 작업은 주기적으로 지운다.
+- 연결은 프로세스(pid)마다 새로 열므로 fork 전에 부모가 연 연결을 자식이 쓰지 않는다.
+- 단일 프로세스(python app.py)에서는 enabled() 가 False 이고 아무것도 만들지 않는다.
+"""
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+import socketio
+
+import db as dbpool
+
+PATH = os.getenv("INVENTORY_IPC_DB", os.path.splitext(dbpool.DB_PATH)[0] + ".ipc.db")
+POLL_SEC = int(os.getenv("IPC_POLL_MS", "50")) / 1000
+MESSAGE_TTL_SEC = int(os.getenv("IPC_MESSAGE_TTL_SEC", "60"))
+PRUNE_EVERY_SEC = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    snapshot TEXT NOT NULL,
+    finished_at REAL
+);
+"""
+
+
+def enabled():
+    """serve.py 가 워커를 2개 이상 띄울 때 설정"""
+    return os.getenv("INVENTORY_IPC") == "1"
+
+
+def connect():
+    conn = sqlite3.connect(PATH, timeout=5, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def reset():
+    """서버 시작 시 (워커 fork 전) 이전 실행의 메시지 / 작업 정리"""
+    conn = connect()
+    try:
+        conn.execute("DELETE FROM messages")
+        conn.execute("DELETE FROM jobs")
+    finally:
+        conn.close()
+
+
+class _Shared:
+    """프로세스별 연결 하나 + 잠금 (쓰기는 짧은 INSERT 뿐이라 스레드 간 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def run(self, sql, params=()):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._conn, self._pid = connect(), os.getpid()
+            return self._conn.execute(sql, params).fetchall()
+
+
+_shared = _Shared()
+
+
+# ─────────────────────────────────────────────────────────────
+# 백그라운드 작업 스냅샷 (jobs.py)
+# ─────────────────────────────────────────────────────────────
+def save_job(job):
+    _shared.run(
+        "INSERT OR REPLACE INTO jobs (id, snapshot, finished_at) VALUES (?, ?, ?)",
+        (job["id"], json.dumps(job, default=str), job["finished_at"]),
+    )
+
+
+def load_job(job_id):
+    rows = _shared.run("SELECT snapshot FROM jobs WHERE id = ?", (job_id,))
+    return json.loads(rows[0][0]) if rows else None
+
+
+def prune_jobs(before):
+    _shared.run("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (before,))
+
+
+# ─────────────────────────────────────────────────────────────
+# SocketIO 메시지 큐 (python-socketio PubSubManager 백엔드)
+# ─────────────────────────────────────────────────────────────
+class SQLiteManager(socketio.PubSubManager):
+    """
+    Redis / RabbitMQ 대신 messages 테이블을 쓰는 클라이언트 매니저.
+
+    emit 은 이 워커의 클라이언트에게 바로 보내고 행을 하나 INSERT 한다.
+    다른 워커의 리스너가 POLL_SEC 마다 id > 마지막으로 읽은 id 인 행을 읽어 자기 클라이언트에게 보낸다.
+    (AUTOINCREMENT id 는 커밋 순서대로 커지므로 id 만으로 놓치지 않고 이어 읽을 수 있다)
+    """
+    name = "sqlite"
+
+    def __init__(self, channel="socketio", write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        # 부모에서 만든 매니저를 워커들이 물려받으므로 host_id 는 워커마다 새로
+        # (같으면 다른 워커의 메시지를 자기 것으로 보고 버림)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self.host_id = uuid.uuid4().hex
+
+    def _publish(self, data):
+        _shared.run(
+            "INSERT INTO messages (channel, payload, created_at) VALUES (?, ?, ?)",
+            (self.channel, json.dumps(data), time.time()),
+        )
+
+    def _listen(self):
+        conn = connect()
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM messages").fetchone()[0]
+        pruned = time.time()
+        while True:
+            rows = conn.execute(
+                "SELECT id, payload FROM messages WHERE id > ? AND channel = ? ORDER BY id",
+                (last_id, self.channel),
+            ).fetchall()
+            for msg_id, payload in rows:
+                last_id = msg_id
+                yield payload
+            if not rows:
+                self.server.sleep(POLL_SEC)
+
+            now = time.time()
+            if now - pruned > PRUNE_EVERY_SEC:
+                conn.execute("DELETE FROM messages WHERE created_at < ?", (now - MESSAGE_TTL_SEC,))
+                pruned = now
@@ -0,0 +1,111 @@
+# backend/jobs.py
+"""
+백그라운드 작업 (BOM 대량 업로드 등).
+
+    job = jobs.submit("bom_import", fn, *args)   # 즉시 반환
+    fn(report, *args) -> result dict             # 워커 스레드에서 실행
+    report(rows_parsed=..., parts_created=...)   # 진행률 갱신 + SocketIO 전송
+
+상태/결과는 프로세스 메모리에 보관하고 JOB_TTL_SEC 이 지난 완료 작업은 정리한다.
+워커가 여러 개(serve.py --workers N)면 스냅샷을 ipc 파일에도 써서
+다른 워커로 들어온 GET /api/jobs/<id> 도 응답할 수 있게 한다.
+"""
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import ipc
+import realtime
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_TTL_SEC = int(os.getenv("JOB_TTL_SEC", "3600"))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+_jobs = {}
+_lock = threading.Lock()
+
+
+def _prune(now):
+    expired = [
+        jid for jid, job in _jobs.items()
+        if job["finished_at"] and now - job["finished_at"] > JOB_TTL_SEC
+    ]
+    for jid in expired:
+        del _jobs[jid]
+    if ipc.enabled():
+        ipc.prune_jobs(now - JOB_TTL_SEC)
+
+
+def snapshot(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            return dict(job, progress=dict(job["progress"]))
+    # 다른 워커에서 실행 중 / 끝난 작업
+    return ipc.load_job(job_id) if ipc.enabled() else None
+
+
+def _notify(job_id):
+    job = snapshot(job_id)
+    if job is not None:
+        realtime.emit("job_progress", job, room=realtime.job_room(job_id))
+
+
+def _update(job_id, **fields):
+    with _lock:
+        job = _jobs[job_id]
+        progress = fields.pop("progress", None)
+        if progress:
+            job["progress"].update(progress)
+        job.update(fields)
+    if ipc.enabled():
+        ipc.save_job(snapshot(job_id))
+    _notify(job_id)
+
+
+def submit(kind, fn, *args):
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _lock:
+        _prune(now)
+        _jobs[job_id] = {
+            "id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "progress": {},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+        }
+    job = snapshot(job_id)
+    if ipc.enabled():
+        ipc.save_job(job)
+    _executor.submit(_run, job_id, fn, args)
+    return job
+
+
+def _run(job_id, fn, args):
+    _update(job_id, status="running", started_at=time.time())
+
+    def report(**progress):
+        _update(job_id, progress=progress)
+
+    try:
+        result = fn(report, *args)
+        _update(job_id, status="done", result=result, finished_at=time.time())
+    except Exception as e:
+        traceback.print_exc()
+        _update(job_id, status="failed", error=str(e), finished_at=time.time())
+
+
+def stats():
+    with _lock:
+        counts = {}
+        for job in _jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+    return {"workers": JOB_WORKERS, "jobs": counts}
@@ -0,0 +1,311 @@
+# backend/ledger.py
+"""
+재고 이동 원장(stock_movements, append-only) + 부품별 스냅샷(stock_snapshots).
+
+parts.quantity 를 바꾸는 경로는 같은 트랜잭션 안에서(커밋 전에) 이동 행을 남긴다.
+
+    kind         quantity   참조           발생 위치
+    allocate     -n         assembly_id    BOM 할당 (allocate_part / allocate-all)
+    deallocate   +n         assembly_id    할당 취소 (deallocate_part)
+    receive      +n         order_id       발주 입고 (fulfill_part_order / 일괄·부분 입고)
+    swap_return  +n         assembly_id    BOM 교체로 남는 할당 반납 (swap_bom_quantity)
+    adjust       new - old  -              수동 수정 / 부품 등록 / 가져오기 / 원장 시작 잔고
+
+불변식: 부품마다 parts.quantity == SUM(stock_movements.quantity)   (python ledger.py verify)
+
+"D 시점 재고" = D 이전 가장 가까운 스냅샷 + (스냅샷 이후 ~ D) 이동 합.
+스냅샷은 SNAPSHOT_INTERVAL_SEC 마다 그 사이 이동이 있었던 부품만 찍으므로
+합산은 (part_id, id) 인덱스에서 한 주기 분량만 범위 스캔한다.
+스냅샷 값도 원장 합으로 계산하므로 스냅샷이 있든 없든 답은 같다 (가속용).
+
+    python ledger.py snapshot    # 지금 스냅샷 (cron 등 외부 스케줄러용)
+    python ledger.py verify      # 불변식 검사
+"""
+import os
+import sys
+import time
+import threading
+import traceback
+
+import db as dbpool
+
+ALLOCATE = "allocate"
+DEALLOCATE = "deallocate"
+RECEIVE = "receive"
+SWAP_RETURN = "swap_return"
+ADJUST = "adjust"
+KINDS = (ALLOCATE, DEALLOCATE, RECEIVE, SWAP_RETURN, ADJUST)
+
+SNAPSHOT_INTERVAL_SEC = int(os.getenv("LEDGER_SNAPSHOT_SEC", "3600"))  # 0 이하면 자동 스냅샷 끔
+MAX_ROWID = 2 ** 63 - 1  # 범위 상한이 없을 때
+
+# 시각은 다른 테이블(datetime.now())과 같이 로컬 시각 문자열
+NOW = "datetime('now', 'localtime')"
+
+LEDGER_DDL = f"""
+CREATE TABLE IF NOT EXISTS stock_movements (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,  -- 커밋 순서 = id 순서 (재사용 없음)
+    part_id     INTEGER NOT NULL REFERENCES parts(id) ON DELETE CASCADE,
+    kind        TEXT    NOT NULL CHECK (kind IN ({", ".join(f"'{k}'" for k in KINDS)})),
+    quantity    INTEGER NOT NULL,                   -- 재고 증감 (+ 입고 / - 출고)
+    assembly_id INTEGER,                            -- 어셈블리 / 주문은 지워져도 기록은 남김 (FK 없음)
+    order_id    INTEGER,
+    note        TEXT,
+    created_at  TEXT    NOT NULL DEFAULT ({NOW})
+);
+
+-- 부품별 범위 합산 (스냅샷 이후 ~ D) 을 인덱스만으로
+CREATE INDEX IF NOT EXISTS idx_stock_movements_part
+    ON stock_movements(part_id, id, created_at, quantity);
+CREATE INDEX IF NOT EXISTS idx_stock_movements_assembly
+    ON stock_movements(assembly_id, id) WHERE assembly_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_stock_movements_order
+    ON stock_movements(order_id) WHERE order_id IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS stock_snapshots (
+    part_id     INTEGER NOT NULL REFERENCES parts(id) ON DELETE CASCADE,
+    movement_id INTEGER NOT NULL,  -- 이 id 까지의 이동이 반영된 재고
+    taken_at    TEXT    NOT NULL,
+    quantity    INTEGER NOT NULL,
+    PRIMARY KEY (part_id, movement_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_stock_snapshots_time ON stock_snapshots(part_id, taken_at);
+"""
+
+INSERT_SQL = """
+    INSERT INTO stock_movements (part_id, kind, quantity, assembly_id, order_id, note)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+# ─────────────────────────────────────────────────────────────
+# 기록 (호출자의 트랜잭션 안에서, 커밋은 호출자 몫)
+# ─────────────────────────────────────────────────────────────
+def record(conn, kind, moves, assembly_id=None, order_id=None, note=None):
+    """
+    moves: [(part_id, 증감), ...] 을 한 번의 executemany 로 기록 (증감 0 은 건너뜀).
+    """
+    rows = [
+        (int(part_id), kind, int(delta), assembly_id, order_id, note)
+        for part_id, delta in moves if delta
+    ]
+    if rows:
+        conn.executemany(INSERT_SQL, rows)
+        _ensure_snapshotter()
+    return len(rows)
+
+
+def record_receipts(conn, receipts, note=None):
+    """입고: receipts = [(order_id, part_id, 수량), ...] 를 주문별 한 줄씩 (한 번의 executemany)"""
+    rows = [
+        (int(part_id), RECEIVE, int(qty), None, int(order_id), note)
+        for order_id, part_id, qty in receipts if qty
+    ]
+    if rows:
+        conn.executemany(INSERT_SQL, rows)
+        _ensure_snapshotter()
+    return len(rows)
+
+
+def record_query(conn, kind, select_sql, params=(), assembly_id=None, order_id=None, note=None):
+    """
+    집합 단위 기록: select_sql 이 돌려주는 (part_id, quantity) 행들을 INSERT ... SELECT 한 문장으로.
+    (예: allocate-all 의 할당 계획 임시 테이블)
+    """
+    cur = conn.execute(
+        f"""
+        INSERT INTO stock_movements (part_id, kind, quantity, assembly_id, order_id, note)
+        SELECT part_id, ?, quantity, ?, ?, ? FROM ({select_sql}) WHERE quantity != 0
+        """,
+        (kind, assembly_id, order_id, note, *params),
+    )
+    if cur.rowcount:
+        _ensure_snapshotter()
+    return cur.rowcount
+
+
+def record_adjustments(conn, targets, note=None):
+    """
+    수동 수정: targets = [(part_id, 새 수량), ...]. parts 를 UPDATE 하기 *전에* 호출.
+    현재 값과의 차이를 adjust 로 기록 (값이 같으면 기록하지 않음).
+    """
+    rows = [(q, note, int(pid)) for pid, q in targets if q is not None]
+    if rows:
+        conn.executemany(
+            f"""
+            INSERT INTO stock_movements (part_id, kind, quantity, note)
+            SELECT id, '{ADJUST}', CAST(?1 AS INTEGER) - COALESCE(quantity, 0), ?2
+            FROM parts
+            WHERE id = ?3 AND CAST(?1 AS INTEGER) != COALESCE(quantity, 0)
+            """,
+            rows,
+        )
+        _ensure_snapshotter()
+
+
+def record_created(conn, part_ids, note=None):
+    """새로 INSERT 한 부품의 초기 재고를 adjust 로 (저장된 값 기준)"""
+    ids = [int(pid) for pid in part_ids]
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        record_query(
+            conn, ADJUST,
+            f"SELECT id AS part_id, COALESCE(quantity, 0) AS quantity FROM parts "
+            f"WHERE id IN ({','.join('?' * len(chunk))})",
+            chunk, note=note,
+        )
+
+
+def record_opening_balances(conn, note="opening balance"):
+    """원장 시작 시점의 재고를 부품마다 adjust 한 줄로 (마이그레이션에서 한 번)"""
+    conn.execute(
+        f"""
+        INSERT INTO stock_movements (part_id, kind, quantity, note)
+        SELECT id, '{ADJUST}', quantity, ?
+        FROM parts
+        WHERE COALESCE(quantity, 0) != 0
+        ORDER BY id
+        """,
+        (note,),
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# 스냅샷
+# ─────────────────────────────────────────────────────────────
+def take_snapshots(conn):
+    """
+    마지막 스냅샷 이후 이동이 있었던 부품마다 스냅샷 한 줄 (직전 스냅샷 + 새 이동 합).
+    매번 전체 부품을 대상으로 하므로 '모든 스냅샷의 최대 movement_id' 가 다음 시작점이 된다.
+    추가한 스냅샷 수 반환 (커밋은 호출자 몫).
+    """
+    cur = conn.execute(
+        f"""
+        INSERT OR IGNORE INTO stock_snapshots (part_id, movement_id, taken_at, quantity)
+        SELECT m.part_id,
+               MAX(m.id),
+               {NOW},
+               COALESCE((SELECT s.quantity FROM stock_snapshots s
+                         WHERE s.part_id = m.part_id
+                         ORDER BY s.movement_id DESC LIMIT 1), 0) + SUM(m.quantity)
+        FROM stock_movements m
+        WHERE m.id > (SELECT COALESCE(MAX(movement_id), 0) FROM stock_snapshots)
+        GROUP BY m.part_id
+        """
+    )
+    return cur.rowcount
+
+
+def snapshot_now():
+    with dbpool.connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            n = take_snapshots(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return n
+
+
+_snapshotter_pid = None
+_snapshotter_lock = threading.Lock()
+
+
+def _snapshot_loop():
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL_SEC)
+        try:
+            snapshot_now()
+        except Exception:
+            traceback.print_exc()
+
+
+def _ensure_snapshotter():
+    """이 프로세스에서 처음 이동을 기록할 때 주기 스냅샷 스레드 시작 (워커 fork 이후에 뜨도록 지연)"""
+    global _snapshotter_pid
+    if SNAPSHOT_INTERVAL_SEC <= 0 or _snapshotter_pid == os.getpid():
+        return
+    with _snapshotter_lock:
+        if _snapshotter_pid == os.getpid():
+            return
+        _snapshotter_pid = os.getpid()
+        threading.Thread(target=_snapshot_loop, name="ledger-snapshot", daemon=True).start()
+
+
+# ─────────────────────────────────────────────────────────────
+# 조회
+# ─────────────────────────────────────────────────────────────
+def stock_at(conn, part_id, at):
+    """
+    at(로컬 시각 문자열, 'YYYY-MM-DD HH:MM:SS') 시점 재고.
+    -> {quantity, snapshot_at, snapshot_quantity, movements} (스냅샷이 없으면 원장 처음부터)
+    at 직전 스냅샷 ~ 직후 스냅샷 사이의 이동만 (part_id, id) 범위로 읽는다
+    (직후 스냅샷이 없으면 현재까지). 과거 시점이라도 현재까지의 이동을 훑지 않음.
+    """
+    snap = conn.execute(
+        """
+        SELECT movement_id, taken_at, quantity FROM stock_snapshots
+        WHERE part_id = ? AND taken_at <= ?
+        ORDER BY taken_at DESC, movement_id DESC
+        LIMIT 1
+        """,
+        (part_id, at),
+    ).fetchone()
+    base, since = (snap["quantity"], snap["movement_id"]) if snap else (0, 0)
+
+    # 다음 스냅샷의 movement_id 이후 이동은 at 보다 뒤 (id 순서 = 기록 순서)
+    upper = conn.execute(
+        """
+        SELECT movement_id FROM stock_snapshots
+        WHERE part_id = ? AND taken_at > ?
+        ORDER BY taken_at, movement_id
+        LIMIT 1
+        """,
+        (part_id, at),
+    ).fetchone()
+
+    row = conn.execute(
+        """
+        SELECT COALESCE(SUM(quantity), 0) AS delta, COUNT(*) AS n
+        FROM stock_movements
+        WHERE part_id = ? AND id > ? AND id <= ? AND created_at <= ?
+        """,
+        (part_id, since, upper["movement_id"] if upper else MAX_ROWID, at),
+    ).fetchone()
+    return {
+        "quantity": base + row["delta"],
+        "snapshot_at": snap["taken_at"] if snap else None,
+        "snapshot_quantity": base if snap else None,
+        "movements": row["n"],
+    }
+
+
+def verify(conn):
+    """parts.quantity 와 원장 합이 다른 부품 [(part_id, quantity, ledger)]"""
+    return [tuple(r) for r in conn.execute(
+        """
+        SELECT p.id, COALESCE(p.quantity, 0), COALESCE(m.total, 0)
+        FROM parts p
+        LEFT JOIN (SELECT part_id, SUM(quantity) AS total FROM stock_movements GROUP BY part_id) m
+               ON m.part_id = p.id
+        WHERE COALESCE(p.quantity, 0) != COALESCE(m.total, 0)
+        ORDER BY p.id
+        """
+    )]
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else ""
+    if cmd == "snapshot":
+        print(f"스냅샷 {snapshot_now()}건 추가")
+    elif cmd == "verify":
+        with dbpool.connection() as conn:
+            bad = verify(conn)
+        for part_id, qty, total in bad[:50]:
+            print(f"part {part_id}: quantity={qty} ledger={total}")
+        print("불일치 없음" if not bad else f"불일치 {len(bad)}건")
+        sys.exit(1 if bad else 0)
+    else:
+        print(__doc__)
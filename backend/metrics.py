@@ -0,0 +1,344 @@
+# backend/metrics.py
+"""
+요청 / SQL 계측 + Prometheus 텍스트 포맷 출력 (GET /metrics).
+
+    http_request_duration_seconds{method, endpoint}          라우트별 지연 히스토그램
+    http_requests_total{method, endpoint, status}            상태 코드별 요청 수
+    db_queries_total{endpoint}                               실행된 SQL 문 수 (trace 콜백)
+    db_query_seconds_total{endpoint}                         execute / fetch 에 쓴 시간
+    db_slow_queries_total{endpoint}                          SLOW_QUERY_MS 를 넘은 문장 수
+    + register_gauge() 로 등록한 값 (연결 풀, 작업 큐 등)
+
+- endpoint 라벨은 URL 규칙(/api/parts/<int:part_id>)이라 개수가 라우트 수로 제한된다.
+- 지연 시간은 응답이 닫힐 때(call_on_close) 기록하므로 스트리밍 응답은 본문 전송까지 포함된다.
+- SQL 시간은 연결 팩토리(TracedConnection)의 커서에서 잰다. 행 단위 반복(for row in cur)의
+  step 시간은 포함되지 않고, execute 와 fetchone / fetchmany / fetchall 만 포함된다.
+- 문장 수는 trace 콜백으로 센다. executemany 는 콜백 비용이 커서 잠시 끄고 파라미터 묶음 수로 센다.
+- execute + fetch 합계가 SLOW_QUERY_MS 를 넘은 문장은 EXPLAIN QUERY PLAN 과 함께
+  "inventory.sql" 로거로 경고.
+- 값은 프로세스 메모리에 있으므로 워커가 여러 개면 워커별로 따로 집계된다.
+"""
+import os
+import time
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from flask import g, request
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "250"))  # 0 이하면 끔
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BACKGROUND = "(background)"  # 요청 밖(작업 스레드, CLI)에서 실행된 SQL
+
+sql_log = logging.getLogger("inventory.sql")
+
+_lock = threading.Lock()
+_latency = {}  # (method, endpoint) -> [버킷별 개수..., sum, count]
+_requests = {}  # (method, endpoint, status) -> count
+_sql = {}  # endpoint -> [queries, seconds, slow]
+_gauges = []  # (name, help, fn)
+
+# 현재 스레드가 처리 중인 요청의 SQL 누계 [queries, seconds, slow]
+_local = threading.local()
+
+
+def _current():
+    acc = getattr(_local, "sql", None)
+    if acc is None:
+        with _lock:
+            acc = _sql.setdefault(BACKGROUND, [0, 0.0, 0])
+    return acc
+
+
+# ─────────────────────────────────────────────────────────────
+# SQLite 계측 (db.ConnectionPool 이 연결 생성 시 사용)
+# ─────────────────────────────────────────────────────────────
+def _on_statement(sql):
+    # 트리거 안의 문장("-- TRIGGER ...")과 계측용 EXPLAIN 은 세지 않음
+    if sql.startswith("--") or sql.startswith("EXPLAIN QUERY PLAN"):
+        return
+    _current()[0] += 1
+
+
+def _query_plan(conn, sql, params):
+    try:
+        cur = sqlite3.Connection.cursor(conn)  # 계측하지 않는 기본 커서
+        cur.row_factory = None
+        rows = cur.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        return "\n".join(f"  {r[3]}" for r in rows)
+    except sqlite3.Error as e:
+        return f"  (plan unavailable: {e})"
+
+
+def _add_time(elapsed):
+    _current()[1] += elapsed
+
+
+class TracedCursor(sqlite3.Cursor):
+    """
+    execute / fetch 시간을 요청 누계에 더하고, 문장이 끝날 때(결과를 다 읽거나 close)
+    execute + fetch 합계가 SLOW_QUERY_MS 를 넘으면 실행 계획과 함께 기록.
+    """
+    _stmt = None  # 진행 중인 (sql, params)
+    _spent = 0.0
+
+    def _done(self):
+        stmt, self._stmt = self._stmt, None
+        if stmt is None or SLOW_QUERY_MS <= 0 or self._spent * 1000 < SLOW_QUERY_MS:
+            return
+        sql, params = stmt
+        _current()[2] += 1
+        sql_log.warning(
+            "slow query %.1f ms [%s]\n%s\n%s",
+            self._spent * 1000,
+            getattr(_local, "endpoint", BACKGROUND),
+            " ".join(sql.split()),
+            _query_plan(self.connection, sql, params) if params is not None else "",
+        )
+
+    def _fetched(self, t, finished):
+        elapsed = time.perf_counter() - t
+        _add_time(elapsed)
+        self._spent += elapsed
+        if finished:
+            self._done()
+
+    def execute(self, sql, parameters=()):
+        self._done()
+        t = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - t
+            _add_time(elapsed)
+            self._stmt, self._spent = (sql, parameters), elapsed
+            if self.description is None:  # 결과 행이 없는 문장은 여기서 끝
+                self._done()
+
+    def executemany(self, sql, seq_of_parameters):
+        # 대량 실행은 trace 콜백(문장마다 SQL 전개 + 파이썬 호출, 트리거 문장 포함)을 끄고
+        # 파라미터 묶음 수로 셈
+        self._done()
+        count = [0]
+
+        def counted(seq):
+            for params in seq:
+                count[0] += 1
+                yield params
+
+        conn = self.connection
+        conn.set_trace_callback(None)
+        t = time.perf_counter()
+        try:
+            return super().executemany(sql, counted(seq_of_parameters))
+        finally:
+            conn.set_trace_callback(_on_statement)
+            _current()[0] += count[0]
+            self._stmt, self._spent = (sql, None), time.perf_counter() - t
+            _add_time(self._spent)
+            self._done()
+
+    def executescript(self, sql_script):
+        self._done()
+        t = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            _add_time(time.perf_counter() - t)
+
+    def fetchone(self):
+        t = time.perf_counter()
+        row = None
+        try:
+            row = super().fetchone()
+            return row
+        finally:
+            self._fetched(t, row is None)
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        t = time.perf_counter()
+        rows = []
+        try:
+            rows = super().fetchmany(size)
+            return rows
+        finally:
+            self._fetched(t, len(rows) < size)
+
+    def fetchall(self):
+        t = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._fetched(t, True)
+
+    def close(self):
+        self._done()
+        super().close()
+
+
+class TracedConnection(sqlite3.Connection):
+    """cursor() / conn.execute() 등 모든 문장을 TracedCursor 로 실행"""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    # C 구현의 Connection.execute 는 오버라이드한 cursor() 를 거치지 않음
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def instrument(conn):
+    conn.set_trace_callback(_on_statement)
+
+
+@contextmanager
+def untraced(conn):
+    """
+    블록 안에서 trace 콜백을 끄고 문장 1개로 셈.
+    FTS5 bm25 처럼 행마다 내부 문장(docsize 조회)을 실행하는 쿼리는 그때마다 콜백이 불려
+    일치가 많으면 쿼리 시간이 두 배 가까이 된다. (결과는 블록 안에서 다 읽을 것)
+    """
+    conn.set_trace_callback(None)
+    try:
+        yield conn
+    finally:
+        conn.set_trace_callback(_on_statement)
+        _current()[0] += 1
+
+
+# ─────────────────────────────────────────────────────────────
+# Flask 요청 계측
+# ─────────────────────────────────────────────────────────────
+def _endpoint():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "(unmatched)"
+
+
+def _before():
+    g.metrics_start = time.perf_counter()
+    _local.endpoint = _endpoint()
+    _local.sql = [0, 0.0, 0]
+
+
+def _after(response):
+    # 스트리밍 응답은 본문 전송이 끝나야 닫히므로 기록은 응답이 닫힐 때
+    start = g.pop("metrics_start", None)
+    if start is not None:
+        response.call_on_close(
+            partial(_finish, request.method, _local.endpoint, start, response.status_code)
+        )
+    return response
+
+
+def _teardown(error=None):
+    # after_request 까지 가지 못한 요청 (처리되지 않은 예외 등)
+    start = g.pop("metrics_start", None)
+    if start is not None:
+        _finish(request.method, _local.endpoint, start, 500)
+
+
+def _finish(method, endpoint, start, status):
+    elapsed = time.perf_counter() - start
+    acc = getattr(_local, "sql", None) or [0, 0.0, 0]
+    _local.sql = None
+    _local.endpoint = BACKGROUND
+
+    key = (method, endpoint)
+    with _lock:
+        hist = _latency.get(key)
+        if hist is None:
+            hist = _latency[key] = [0] * len(LATENCY_BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                hist[i] += 1
+        hist[-2] += elapsed
+        hist[-1] += 1
+
+        rkey = (method, endpoint, str(status))
+        _requests[rkey] = _requests.get(rkey, 0) + 1
+
+        total = _sql.setdefault(endpoint, [0, 0.0, 0])
+        total[0] += acc[0]
+        total[1] += acc[1]
+        total[2] += acc[2]
+
+
+def init_app(app):
+    """다른 before_request 훅(IP 제한 등)보다 먼저 등록해야 거부된 요청도 집계됨"""
+    app.before_request(_before)
+    app.after_request(_after)
+    app.teardown_request(_teardown)
+
+
+def register_gauge(name, help_text, fn):
+    """fn() -> 숫자 또는 {라벨 dict 튜플: 값}. /metrics 출력 시마다 호출"""
+    _gauges.append((name, help_text, fn))
+
+
+# ─────────────────────────────────────────────────────────────
+# Prometheus 텍스트 포맷
+# ─────────────────────────────────────────────────────────────
+def _labels(**labels):
+    def esc(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels.items()) + "}"
+
+
+def _num(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def render():
+    with _lock:
+        latency = {k: list(v) for k, v in _latency.items()}
+        requests_ = dict(_requests)
+        sql = {k: list(v) for k, v in _sql.items()}
+
+    out = [
+        "# HELP http_request_duration_seconds Request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, endpoint), hist in sorted(latency.items()):
+        for bound, n in zip(LATENCY_BUCKETS, hist):
+            out.append(f"http_request_duration_seconds_bucket"
+                       f"{_labels(method=method, endpoint=endpoint, le=bound)} {n}")
+        out.append(f"http_request_duration_seconds_bucket"
+                   f"{_labels(method=method, endpoint=endpoint, le='+Inf')} {hist[-1]}")
+        out.append(f"http_request_duration_seconds_sum{_labels(method=method, endpoint=endpoint)} {_num(hist[-2])}")
+        out.append(f"http_request_duration_seconds_count{_labels(method=method, endpoint=endpoint)} {hist[-1]}")
+
+    out += [
+        "# HELP http_requests_total Requests by route and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, endpoint, status), n in sorted(requests_.items()):
+        out.append(f"http_requests_total{_labels(method=method, endpoint=endpoint, status=status)} {n}")
+
+    for idx, (name, help_text) in enumerate((
+        ("db_queries_total", "SQL statements executed."),
+        ("db_query_seconds_total", "Time spent in SQL execute/fetch."),
+        ("db_slow_queries_total", f"SQL statements slower than {SLOW_QUERY_MS:g} ms."),
+    )):
+        out += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for endpoint, values in sorted(sql.items()):
+            out.append(f"{name}{_labels(endpoint=endpoint)} {_num(values[idx])}")
+
+    for name, help_text, fn in _gauges:
+        out += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        value = fn()
+        if isinstance(value, dict):
+            for labels, v in value.items():
+                out.append(f"{name}{_labels(**dict(labels))} {_num(v)}")
+        else:
+            out.append(f"{name} {_num(value)}")
+
+    return "\n".join(out) + "\n"
@@ -0,0 +1,231 @@
+# backend/migrations.py
+"""
+스키마 마이그레이션.
+
+schema.sql = 버전 0 (기본 테이블). 이후 변경은 MIGRATIONS 에 (버전, 설명, 함수)로
+순서대로 추가하고, 적용된 버전은 PRAGMA user_version 에 기록한다.
+각 단계는 하나의 트랜잭션(BEGIN IMMEDIATE)에서 실행되므로 실패하면 통째로 롤백된다.
+
+    python migrations.py          # 미적용 마이그레이션 적용
+    python migrations.py status   # 현재 / 최신 버전 출력
+"""
+import sqlite3
+import sys
+
+import db as dbpool
+from routes.search import SEARCH_DDL, PREFIX_LENGTHS, rebuild_search_index
+from rollups import ROLLUP_DDL, rebuild_rollups
+from ledger import LEDGER_DDL, record_opening_balances, take_snapshots
+from forecast import USAGE_DDL, rebuild_usage
+
+
+def run_script(conn, script):
+    """
+    여러 문장으로 된 SQL을 문장 단위로 실행.
+    (executescript는 먼저 COMMIT을 해버려 트랜잭션이 깨지므로 사용하지 않음)
+    """
+    buf = ""
+    for line in script.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            if buf.strip():
+                conn.execute(buf)
+            buf = ""
+    if buf.strip():
+        conn.execute(buf)
+
+
+# ─────────────────────────────────────────────────────────────
+# 마이그레이션 단계
+# ─────────────────────────────────────────────────────────────
+def m001_hot_path_indexes(conn):
+    run_script(conn, """
+        -- where-used / 프로젝트 부품 목록 (assembly_parts PK는 assembly_id 선두)
+        CREATE INDEX IF NOT EXISTS idx_assembly_parts_part ON assembly_parts(part_id);
+        CREATE INDEX IF NOT EXISTS idx_part_orders_part_date ON part_orders(part_id, order_date);
+        CREATE INDEX IF NOT EXISTS idx_alias_links_part ON alias_links(part_id);
+        CREATE INDEX IF NOT EXISTS idx_project_assemblies_assembly ON project_assemblies(assembly_id);
+
+        -- GET /api/parts keyset 페이지네이션 + 서버 필터
+        CREATE INDEX IF NOT EXISTS idx_parts_update_date ON parts(update_date, id);
+        CREATE INDEX IF NOT EXISTS idx_parts_in_stock ON parts(update_date, id) WHERE quantity > 0;
+        CREATE INDEX IF NOT EXISTS idx_parts_category_large ON parts(category_large, update_date, id);
+        CREATE INDEX IF NOT EXISTS idx_parts_category_medium ON parts(category_medium, update_date, id);
+        CREATE INDEX IF NOT EXISTS idx_parts_category_small ON parts(category_small, update_date, id);
+        CREATE INDEX IF NOT EXISTS idx_parts_supplier ON parts(supplier, update_date, id);
+        CREATE INDEX IF NOT EXISTS idx_parts_manufacturer ON parts(manufacturer, update_date, id);
+        CREATE INDEX IF NOT EXISTS idx_parts_location ON parts(location, update_date, id);
+        CREATE INDEX IF NOT EXISTS idx_parts_package ON parts(package, update_date, id);
+    """)
+    conn.execute("ANALYZE")
+
+
+def m002_parts_search(conn):
+    run_script(conn, SEARCH_DDL)
+    rebuild_search_index(conn)
+
+
+def m003_change_versions(conn):
+    run_script(conn, """
+        CREATE TABLE IF NOT EXISTS change_versions (
+            name    TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID;
+
+        -- DB 파일마다 다른 값: DB를 새로 만들면 카운터가 0부터 다시 시작해도 ETag가 겹치지 않도록
+        INSERT OR IGNORE INTO change_versions(name, version) VALUES ('epoch', abs(random() % 1000000000));
+
+        -- /api/categories/tree 캐시: 분류 / 재고 수량이 바뀌면 증가
+        INSERT OR IGNORE INTO change_versions(name, version) VALUES ('category_tree', 0);
+
+        CREATE TRIGGER IF NOT EXISTS parts_category_tree_ai AFTER INSERT ON parts BEGIN
+            UPDATE change_versions SET version = version + 1 WHERE name = 'category_tree';
+        END;
+        CREATE TRIGGER IF NOT EXISTS parts_category_tree_ad AFTER DELETE ON parts BEGIN
+            UPDATE change_versions SET version = version + 1 WHERE name = 'category_tree';
+        END;
+        CREATE TRIGGER IF NOT EXISTS parts_category_tree_au
+        AFTER UPDATE OF category_large, category_medium, category_small, quantity ON parts BEGIN
+            UPDATE change_versions SET version = version + 1 WHERE name = 'category_tree';
+        END;
+    """)
+
+
+def m004_table_versions(conn):
+    # 목록 API ETag 용 테이블별 변경 카운터 (INSERT/UPDATE/DELETE 마다 +1)
+    tables = (
+        "parts", "part_orders", "assemblies", "assembly_parts",
+        "projects", "project_assemblies", "aliases", "alias_links",
+    )
+    for table in tables:
+        conn.execute(
+            "INSERT OR IGNORE INTO change_versions(name, version) VALUES (?, 0)", (table,)
+        )
+        for op, tag in (("INSERT", "ai"), ("UPDATE", "au"), ("DELETE", "ad")):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{tag} AFTER {op} ON {table} BEGIN
+                    UPDATE change_versions SET version = version + 1 WHERE name = '{table}';
+                END
+            """)
+
+
+def m005_assembly_rollups(conn):
+    run_script(conn, ROLLUP_DDL)
+    rebuild_rollups(conn)
+
+
+def m006_mrp_covering_index(conn):
+    # MRP 전체 스캔을 테이블 대신 인덱스만으로 (assembly_id 순서 그대로 group_concat)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_assembly_parts_mrp
+        ON assembly_parts(assembly_id, part_id, quantity_per, allocated_quantity)
+    """)
+
+
+def m007_image_derivatives(conn):
+    # 업로드 이미지 파생본 파일명 (images.py, image_filename 과 같은 폴더)
+    for table in ("parts", "assemblies"):
+        existing = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+        for column in ("image_thumb", "image_detail", "image_webp"):
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+
+
+def m008_stock_ledger(conn):
+    # 재고 이동 원장: 현재 재고를 시작 잔고(adjust)로 넣고 첫 스냅샷
+    run_script(conn, LEDGER_DDL)
+    if not conn.execute("SELECT 1 FROM stock_movements LIMIT 1").fetchone():
+        record_opening_balances(conn)
+    take_snapshots(conn)
+
+
+def m009_part_usage_daily(conn):
+    # 일간 사용량 집계 (stock_movements 트리거로 유지, 소진 예측용)
+    run_script(conn, USAGE_DDL)
+    rebuild_usage(conn)
+
+
+def m010_part_orders_unique(conn):
+    # 같은 부품 / 같은 날짜 주문은 한 행 (POST /api/part_orders 의 ON CONFLICT 대상).
+    # 기존 중복은 가장 먼저 만든 행으로 수량을 합친 뒤 나머지를 지운다.
+    run_script(conn, """
+        UPDATE part_orders
+           SET quantity_ordered = dup.total
+          FROM (SELECT MIN(id) AS id, SUM(quantity_ordered) AS total
+                FROM part_orders
+                GROUP BY part_id, order_date
+                HAVING COUNT(*) > 1) AS dup
+         WHERE part_orders.id = dup.id;
+
+        DELETE FROM part_orders
+         WHERE id NOT IN (SELECT MIN(id) FROM part_orders GROUP BY part_id, order_date);
+
+        DROP INDEX IF EXISTS idx_part_orders_part_date;
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_part_orders_part_date ON part_orders(part_id, order_date);
+    """)
+
+
+def m011_parts_search_prefix4(conn):
+    # 접두어 인덱스 3/4글자 ("MLCC", "0603" 같은 토큰도 용어 병합 없이 조회, 2글자 이하는 완전 일치라 불필요).
+    # FTS5 옵션은 바꿀 수 없으므로 새로 만든 DB(m002 가 이미 같은 옵션)가 아니면 다시 만든다.
+    prefix = f"prefix = '{' '.join(map(str, PREFIX_LENGTHS))}'"
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'parts_fts'").fetchone()
+    if sql and prefix in sql[0]:
+        return
+    conn.execute("DROP TABLE IF EXISTS parts_fts")
+    run_script(conn, SEARCH_DDL)
+    rebuild_search_index(conn)
+
+
+MIGRATIONS = [
+    (1, "hot-path indexes + ANALYZE", m001_hot_path_indexes),
+    (2, "parts_fts 전문 검색 인덱스", m002_parts_search),
+    (3, "change_versions 변경 카운터 (분류 트리)", m003_change_versions),
+    (4, "테이블별 변경 카운터 (목록 ETag)", m004_table_versions),
+    (5, "assembly_rollups 할당 집계", m005_assembly_rollups),
+    (6, "MRP covering index", m006_mrp_covering_index),
+    (7, "이미지 파생본 컬럼", m007_image_derivatives),
+    (8, "재고 이동 원장 + 스냅샷", m008_stock_ledger),
+    (9, "부품 일간 사용량 집계", m009_part_usage_daily),
+    (10, "part_orders (part_id, order_date) 유니크", m010_part_orders_unique),
+    (11, "parts_fts 3/4글자 접두어 인덱스", m011_parts_search_prefix4),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, verbose=True):
+    """미적용 마이그레이션을 순서대로 적용하고 최종 버전을 반환."""
+    applied = current_version(conn)
+    for version, desc, step in MIGRATIONS:
+        if version <= applied:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 다른 프로세스가 먼저 적용했을 수 있으므로 잠금 후 재확인
+            if current_version(conn) >= version:
+                conn.rollback()
+                applied = current_version(conn)
+                continue
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied = version
+        if verbose:
+            print(f"마이그레이션 {version} 적용: {desc}")
+    return applied
+
+
+if __name__ == "__main__":
+    with dbpool.connection() as conn:
+        if len(sys.argv) > 1 and sys.argv[1] == "status":
+            print(f"현재 버전: {current_version(conn)} / 최신: {LATEST_VERSION}")
+        else:
+            print(f"DB 버전: {migrate(conn)}")
@@ -0,0 +1,358 @@
+# backend/mrp.py
+"""
+전 프로젝트 자재 소요 계획(MRP).
+
+몇 번의 벌크 쿼리로 재고 / 할당 / 미입고 주문 / 호환 그룹 / 프로젝트-어셈블리 관계를 읽고
+순소요량·부족분은 numpy / pandas 로 한 번에 계산한다.
+
+    잔여 소요  = MAX(quantity_per * quantity_to_build - allocated_quantity, 0)   (BOM 행별)
+    공급       = MAX(parts.quantity, 0) + SUM(part_orders.quantity_ordered)
+    부족       = MAX(잔여 소요 합 - 공급, 0)                                      (부품별)
+    그룹 부족  = MAX(그룹 소요 합 - 그룹 공급 합, 0)                              (호환 그룹별)
+    순부족     = 그룹 부족을 그룹 내 부품별 부족 비율로 배분 (올림)
+
+할당분은 이미 parts.quantity 에서 빠져 있으므로 공급에 다시 더하지 않는다.
+quantity_per 는 소수(2.5 등)가 저장될 수 있어 올림으로 센다 (0.5개가 필요해도 부품 1개를 쓴다).
+프로젝트에 연결된 어셈블리만 수요로 잡고, 한 어셈블리가 여러 프로젝트에 속하면
+수요는 한 번만 세고 drivers 에는 각 프로젝트를 모두 표시한다.
+
+같은 입력으로 어셈블리별 "지금 재고로 만들 수 있는 수량"(compute_buildable)도 계산한다.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+# BOM 행 (커서에서 바로 읽는 구조화 배열)
+BOM_DTYPE = np.dtype([
+    ("assembly_id", np.int64), ("part_id", np.int64), ("quantity_per", np.float64), ("allocated", np.float64),
+])
+# 비정상적으로 큰 수량(1e400 -> inf 등)은 이 범위로 자름 (quantity_per * quantity_to_build 가 넘치지 않도록)
+QTY_LIMIT = 2 ** 31 - 1
+
+
+def _rows(conn, sql, params=()):
+    """Row 객체 없이 튜플로 (대량 행)"""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur.execute(sql, params).fetchall()
+
+
+def _part_names(conn, part_ids):
+    """{part_id: part_name} (IN 절 500개씩)"""
+    names = {}
+    ids = [int(p) for p in part_ids]
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        names.update(_rows(
+            conn, f"SELECT id, part_name FROM parts WHERE id IN ({','.join('?' * len(chunk))})", chunk
+        ))
+    return names
+
+
+def alias_pools(links):
+    """
+    호환 그룹 연결 요소.
+    links: DataFrame[alias_id, part_id] -> Series(index=part_id, value=pool_id)
+    pool_id 는 연결 요소 안의 최소 part_id. (부품이 여러 그룹에 걸치면 하나로 합쳐짐)
+    """
+    if links.empty:
+        return pd.Series(dtype="int64")
+
+    parts, part_idx = np.unique(links["part_id"].to_numpy(np.int64), return_inverse=True)
+    aliases, alias_idx = np.unique(links["alias_id"].to_numpy(np.int64), return_inverse=True)
+
+    # 최소 라벨 전파: 부품 -> 그룹 -> 부품 을 변화가 없을 때까지 반복
+    label = parts.copy()
+    big = np.iinfo(np.int64).max
+    while True:
+        alias_min = np.full(len(aliases), big, dtype=np.int64)
+        np.minimum.at(alias_min, alias_idx, label[part_idx])
+        new = label.copy()
+        np.minimum.at(new, part_idx, alias_min[alias_idx])
+        if np.array_equal(new, label):
+            break
+        label = new
+    return pd.Series(label, index=parts)
+
+
+def load_bom_lines(conn, assembly_ids=None):
+    """
+    BOM 전체 -> DataFrame[assembly_id, part_id, quantity_per, allocated] (assembly_id 순, 모두 int64).
+    값은 타입을 정해 읽고(REAL) 반올림 규칙을 여기서 한 번 적용한다
+    (idx_assembly_parts_mrp covering index 스캔, 행 튜플 리스트 없이 커서에서 바로 배열로).
+        quantity_per        올림 (2.5 -> 3)
+        allocated_quantity  버림 (할당된 온전한 개수만)
+    숫자가 아닌 값은 0. assembly_ids 가 주어지면 그 어셈블리만.
+    """
+    sql = """
+        SELECT assembly_id,
+               COALESCE(part_id, 0),
+               CAST(COALESCE(quantity_per, 0) AS REAL),
+               CAST(COALESCE(allocated_quantity, 0) AS REAL)
+        FROM assembly_parts
+    """
+    params = ()
+    if assembly_ids is not None:
+        sql += " WHERE assembly_id IN (SELECT value FROM json_each(?))"
+        params = (json.dumps(sorted(int(a) for a in assembly_ids)),)
+
+    cur = conn.cursor()
+    cur.row_factory = None
+    rows = np.fromiter(cur.execute(sql + " ORDER BY assembly_id", params), dtype=BOM_DTYPE)
+    return pd.DataFrame({
+        "assembly_id": rows["assembly_id"],
+        "part_id": rows["part_id"],
+        "quantity_per": np.clip(np.ceil(rows["quantity_per"]), -QTY_LIMIT, QTY_LIMIT).astype(np.int64),
+        "allocated": np.clip(np.floor(rows["allocated"]), -QTY_LIMIT, QTY_LIMIT).astype(np.int64),
+    })
+
+
+def load_stock(conn):
+    """[[part_id, MAX(quantity, 0)], ...] int64 배열"""
+    return np.array(
+        _rows(conn, "SELECT id, MAX(CAST(COALESCE(quantity, 0) AS INTEGER), 0) FROM parts"), dtype=np.int64
+    ).reshape(-1, 2)
+
+
+def load_alias_links(conn):
+    """호환 그룹 연결 (없는 부품을 가리키는 연결은 제외 - FK 강제 전에 남은 행)"""
+    return pd.DataFrame(
+        _rows(conn, "SELECT alias_id, part_id FROM alias_links WHERE part_id IN (SELECT id FROM parts)"),
+        columns=["alias_id", "part_id"],
+    )
+
+
+def _pool_ids(alias_links, size):
+    """part_id -> 호환 그룹 pool_id 배열 (길이 size, 그룹 없는 부품은 자기 자신)"""
+    pool_id = np.arange(size, dtype=np.int64)
+    if alias_links is None or alias_links.empty:
+        return pool_id
+    pools = alias_pools(alias_links)
+    pool_id[pools.index.to_numpy(np.int64)] = pools.to_numpy(np.int64)
+    return pool_id
+
+
+def load_inputs(conn):
+    """MRP 입력 (벌크 쿼리 6회)"""
+    projects = pd.DataFrame(
+        _rows(conn, """
+            SELECT pa.project_id, pa.assembly_id, p.project_name
+            FROM project_assemblies pa
+            JOIN projects p ON p.id = pa.project_id
+        """),
+        columns=["project_id", "assembly_id", "project_name"],
+    )
+    build = dict(_rows(conn, "SELECT id, COALESCE(quantity_to_build, 0) FROM assemblies"))
+
+    bom = load_bom_lines(conn, set(projects["assembly_id"].tolist()))
+    qty_to_build = bom["assembly_id"].map(build).fillna(0).to_numpy(np.int64)
+    allocated = bom["allocated"].to_numpy(np.int64)
+    lines = pd.DataFrame({
+        "assembly_id": bom["assembly_id"],
+        "part_id": bom["part_id"],
+        "remaining": np.maximum(bom["quantity_per"].to_numpy(np.int64) * qty_to_build - allocated, 0),
+        "allocated": allocated,
+    })
+
+    stock = load_stock(conn)
+    orders = np.array(
+        _rows(conn, "SELECT part_id, SUM(CAST(quantity_ordered AS INTEGER)) FROM part_orders GROUP BY part_id"),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    alias_links = load_alias_links(conn)
+
+    return lines, projects, stock, orders, alias_links
+
+
+def compute_mrp(lines, stock, orders, alias_links):
+    """
+    부품별 순부족 DataFrame (index = part_id, parts 에 있는 부품 전부).
+    part_id 를 그대로 배열 위치로 쓰는 dense 배열 + bincount 로 합산.
+    """
+    size = int(max(
+        stock[:, 0].max(initial=0),
+        lines["part_id"].max() if len(lines) else 0,
+        orders[:, 0].max(initial=0),
+        alias_links["part_id"].max() if len(alias_links) else 0,
+    )) + 1
+
+    pid = lines["part_id"].to_numpy(np.int64)
+    gross = np.bincount(pid, weights=lines["remaining"].to_numpy(), minlength=size).astype(np.int64)
+    allocated = np.bincount(pid, weights=lines["allocated"].to_numpy(), minlength=size).astype(np.int64)
+    on_hand = np.zeros(size, dtype=np.int64)
+    on_hand[stock[:, 0]] = stock[:, 1]
+    on_order = np.zeros(size, dtype=np.int64)
+    on_order[orders[:, 0]] = orders[:, 1]
+
+    supply = on_hand + on_order
+    shortage = np.maximum(gross - supply, 0)
+
+    # 호환 그룹 단위로 소요/공급을 합산 (그룹 없는 부품은 자기 자신이 그룹)
+    pool_id = _pool_ids(alias_links, size)
+
+    pool_gross = np.bincount(pool_id, weights=gross, minlength=size)
+    pool_supply = np.bincount(pool_id, weights=supply, minlength=size)
+    pool_short_sum = np.bincount(pool_id, weights=shortage, minlength=size)
+    pool_short = np.maximum(pool_gross - pool_supply, 0)[pool_id]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(pool_short_sum[pool_id] > 0, shortage / pool_short_sum[pool_id], 0.0)
+
+    ids = stock[:, 0]
+    return pd.DataFrame({
+        "gross_demand": gross[ids],
+        "allocated": allocated[ids],
+        "stock": on_hand[ids],
+        "on_order": on_order[ids],
+        "shortage": shortage[ids],
+        "pool_id": pool_id[ids],
+        "pool_shortage": pool_short[ids].astype(np.int64),
+        "net_shortage": np.ceil(share * pool_short)[ids].astype(np.int64),
+    }, index=pd.Index(ids, name="part_id"))
+
+
+def project_drivers(lines, projects, part_ids):
+    """part_ids 부품들의 (부품, 프로젝트)별 잔여 소요"""
+    sub = lines.loc[
+        lines["part_id"].isin(part_ids) & (lines["remaining"] > 0),
+        ["assembly_id", "part_id", "remaining"],
+    ]
+    return (
+        sub.merge(projects, on="assembly_id")
+        .groupby(["part_id", "project_id", "project_name"], sort=False)["remaining"]
+        .sum()
+        .reset_index()
+        .sort_values(["part_id", "remaining"], ascending=[True, False])
+    )
+
+
+def mrp_report(conn, include_all=False, limit=None):
+    """
+    API 응답용: 순부족이 큰 순서의 부품 목록 (include_all이면 수요가 있는 모든 부품) + 요약.
+    drivers 는 반환되는 부품에 대해서만 계산.
+    """
+    lines, projects, stock, orders, alias_links = load_inputs(conn)
+    result = compute_mrp(lines, stock, orders, alias_links)
+
+    mask = result["net_shortage"] > 0
+    if include_all:
+        mask |= result["gross_demand"] > 0
+    rows = result[mask].sort_values(
+        ["net_shortage", "shortage"], ascending=False, kind="stable"
+    )
+    if limit:
+        rows = rows.head(limit)
+
+    part_ids = rows.index.to_numpy()
+    by_part = {}
+    for pid, project_id, name, qty in project_drivers(lines, projects, part_ids).itertuples(index=False):
+        by_part.setdefault(int(pid), []).append(
+            {"project_id": int(project_id), "project_name": name, "demand": int(qty)}
+        )
+
+    names = _part_names(conn, part_ids)
+
+    items = []
+    for rec in rows.reset_index().to_dict("records"):
+        item = {k: int(v) for k, v in rec.items()}
+        item["part_name"] = names.get(item["part_id"])
+        item["drivers"] = by_part.get(item["part_id"], [])
+        items.append(item)
+
+    return {
+        "parts": items,
+        "summary": {
+            "bom_lines": int(len(lines)),
+            "parts_with_demand": int((result["gross_demand"] > 0).sum()),
+            "parts_short": int((result["net_shortage"] > 0).sum()),
+            "total_net_shortage": int(result["net_shortage"].sum()),
+        },
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# 생산 가능 수량
+# ─────────────────────────────────────────────────────────────
+def compute_buildable(bom, stock, alias_links=None):
+    """
+    어셈블리별 현재 재고로 만들 수 있는 수량.
+        행별 가능 = floor((재고 + 이 행에 할당된 수량) / quantity_per)
+        어셈블리  = 행별 가능의 최소값, 그 행의 부품이 limiting part
+    alias_links 가 주어지면 부품 재고 대신 호환 그룹 재고 합계를 사용.
+    quantity_per <= 0 인 행은 제약이 아니므로 제외.
+    반환: DataFrame[assembly_id, buildable, limiting_part_id, limiting_available,
+                    limiting_quantity_per, lines]  (assembly_id 오름차순)
+    """
+    bom = bom[bom["quantity_per"] > 0]
+    size = int(max(
+        stock[:, 0].max(initial=0),
+        bom["part_id"].max() if len(bom) else 0,
+        alias_links["part_id"].max() if alias_links is not None and len(alias_links) else 0,
+    )) + 1
+
+    on_hand = np.zeros(size, dtype=np.int64)
+    on_hand[stock[:, 0]] = stock[:, 1]
+    if alias_links is not None:
+        pool_id = _pool_ids(alias_links, size)
+        on_hand = np.bincount(pool_id, weights=on_hand, minlength=size).astype(np.int64)[pool_id]
+
+    asm = bom["assembly_id"].to_numpy(np.int64)
+    pid = bom["part_id"].to_numpy(np.int64)
+    qp = bom["quantity_per"].to_numpy(np.int64)
+    available = on_hand[pid] + bom["allocated"].to_numpy(np.int64)
+    units = available // qp
+
+    # 어셈블리별 최소 행: (assembly_id, units) 정렬 후 각 그룹의 첫 행
+    order = np.lexsort((units, asm))
+    sorted_asm = asm[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_asm[1:] != sorted_asm[:-1]
+    pick = order[first]
+    _, lines = np.unique(asm, return_counts=True)
+
+    return pd.DataFrame({
+        "assembly_id": asm[pick],
+        "buildable": units[pick],
+        "limiting_part_id": pid[pick],
+        "limiting_available": available[pick],
+        "limiting_quantity_per": qp[pick],
+        "lines": lines,
+    })
+
+
+def buildable_report(conn, use_aliases=False):
+    """API 응답용: 어셈블리 전체, 생산 가능 수량 오름차순 (BOM 없는 어셈블리는 buildable = None, 맨 뒤)"""
+    assemblies = _rows(conn, "SELECT id, assembly_name, quantity_to_build FROM assemblies")
+    result = compute_buildable(
+        load_bom_lines(conn),
+        load_stock(conn),
+        load_alias_links(conn) if use_aliases else None,
+    )
+    names = _part_names(conn, result["limiting_part_id"].unique())
+    by_assembly = {int(r["assembly_id"]): r for r in result.to_dict("records")}
+
+    items = []
+    for aid, name, qty_to_build in assemblies:
+        r = by_assembly.get(aid)
+        item = {
+            "id": aid,
+            "assembly_name": name,
+            "quantity_to_build": qty_to_build,
+            "buildable": None,
+            "lines": 0,
+            "limiting_part": None,
+        }
+        if r is not None:
+            item["buildable"] = int(r["buildable"])
+            item["lines"] = int(r["lines"])
+            item["limiting_part"] = {
+                "part_id": int(r["limiting_part_id"]),
+                "part_name": names.get(int(r["limiting_part_id"])),
+                "available": int(r["limiting_available"]),
+                "quantity_per": int(r["limiting_quantity_per"]),
+            }
+        items.append(item)
+
+    items.sort(key=lambda x: (x["buildable"] is None, x["buildable"] or 0, x["assembly_name"]))
+    return items
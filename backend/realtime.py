@@ -0,0 +1,190 @@
+# backend/realtime.py
+import os
+import threading
+
+from flask import request
+from flask_socketio import SocketIO, join_room, leave_room
+
+# app.py 에서 socketio.init_app(app) 으로 연결
+socketio = SocketIO()
+
+
+def job_room(job_id):
+    return f"job:{job_id}"
+
+
+def emit(event, payload, room=None):
+    """요청/백그라운드 스레드 어디서든 호출 가능. 서버 초기화 전이면 무시."""
+    if socketio.server is None:
+        return
+    socketio.emit(event, payload, to=room)
+
+
+# ─────────────────────────────────────────────────────────────
+# 백그라운드 작업 진행률 구독
+#   client: socket.emit("subscribe_job", {job_id})
+#   server: "job_progress" 이벤트 (jobs.snapshot 형태)
+# ─────────────────────────────────────────────────────────────
+@socketio.on("subscribe_job")
+def on_subscribe_job(data):
+    job_id = data.get("job_id") if isinstance(data, dict) else None
+    if job_id:
+        join_room(job_room(job_id), sid=request.sid)
+
+
+@socketio.on("unsubscribe_job")
+def on_unsubscribe_job(data):
+    job_id = data.get("job_id") if isinstance(data, dict) else None
+    if job_id:
+        leave_room(job_room(job_id), sid=request.sid)
+
+
+# ─────────────────────────────────────────────────────────────
+# 재고/할당 변경 이벤트 (room 단위 구독 + 짧은 구간 합치기)
+#   client: socket.emit("subscribe", {parts: [..], assemblies: [..], projects: [..]})
+#   server 이벤트:
+#     part_quantity    {part_id, quantity}
+#     allocation       {assembly_id, part_id, allocated_quantity, quantity_per}
+#     assembly_status  {assembly_id, status}
+#     order_fulfilled  {order_id, part_id, quantity}
+#   같은 (이벤트, 대상)은 COALESCE_SEC 안에서 마지막 값 한 번만 전송
+# ─────────────────────────────────────────────────────────────
+COALESCE_SEC = int(os.getenv("REALTIME_COALESCE_MS", "100")) / 1000
+
+ROOM_KINDS = {"parts": "part", "assemblies": "assembly", "projects": "project"}
+
+_pending = {}
+_pending_lock = threading.Lock()
+_flush_scheduled = False
+
+
+def _object_id(value):
+    """클라이언트가 보낸 id -> 양의 정수, 아니면 None (bool / 실수 / 숫자가 아닌 문자열 등)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if value > 0 else None
+    if isinstance(value, str) and value.strip().isdecimal():
+        return int(value) or None
+    return None
+
+
+def _rooms_from(data):
+    """구독 요청 -> (room 목록, 무시한 값 목록). 형식이 잘못된 값은 건너뜀"""
+    rooms, ignored = [], []
+    if not isinstance(data, dict):
+        return rooms, [data] if data is not None else []
+    for key, kind in ROOM_KINDS.items():
+        ids = data.get(key) or []
+        if not isinstance(ids, (list, tuple)):
+            ignored.append({key: ids})
+            continue
+        for obj_id in ids:
+            n = _object_id(obj_id)
+            if n is None:
+                ignored.append({key: obj_id})
+            else:
+                rooms.append(f"{kind}:{n}")
+    return rooms, ignored
+
+
+# 반환값은 클라이언트가 ack 콜백을 넘긴 경우에만 전달됨
+@socketio.on("subscribe")
+def on_subscribe(data):
+    rooms, ignored = _rooms_from(data)
+    for room in rooms:
+        join_room(room, sid=request.sid)
+    return {"rooms": len(rooms), "ignored": ignored}
+
+
+@socketio.on("unsubscribe")
+def on_unsubscribe(data):
+    rooms, ignored = _rooms_from(data)
+    for room in rooms:
+        leave_room(room, sid=request.sid)
+    return {"rooms": len(rooms), "ignored": ignored}
+
+
+def publish(event, key, payload, rooms):
+    """(event, key) 단위로 최신 payload만 남겨 두었다가 COALESCE_SEC 후 일괄 전송"""
+    global _flush_scheduled
+    if socketio.server is None or not rooms:
+        return
+    with _pending_lock:
+        _pending[(event, key)] = (payload, rooms)
+        if _flush_scheduled:
+            return
+        _flush_scheduled = True
+    socketio.start_background_task(_flush_later)
+
+
+def stats():
+    with _pending_lock:
+        return {"pending_events": len(_pending), "flush_scheduled": _flush_scheduled}
+
+
+def _flush_later():
+    global _flush_scheduled
+    socketio.sleep(COALESCE_SEC)
+    with _pending_lock:
+        batch = dict(_pending)
+        _pending.clear()
+        _flush_scheduled = False
+    for (event, _), (payload, rooms) in batch.items():
+        socketio.emit(event, payload, to=rooms)
+
+
+def _project_rooms(conn, assembly_id):
+    rows = conn.execute(
+        "SELECT project_id FROM project_assemblies WHERE assembly_id = ?", (assembly_id,)
+    ).fetchall()
+    return [f"project:{r[0]}" for r in rows]
+
+
+# 아래 함수들은 커밋 이후 호출 (커밋된 값을 읽어서 전송)
+def notify_part_quantity(conn, *part_ids):
+    if socketio.server is None or not part_ids:
+        return
+    rows = conn.execute(
+        f"SELECT id, quantity FROM parts WHERE id IN ({','.join('?' * len(part_ids))})",
+        part_ids,
+    ).fetchall()
+    for r in rows:
+        publish("part_quantity", r["id"], {"part_id": r["id"], "quantity": r["quantity"]},
+                [f"part:{r['id']}"])
+
+
+def notify_allocation(conn, assembly_id, part_id):
+    if socketio.server is None:
+        return
+    assembly_id, part_id = int(assembly_id), int(part_id)
+    row = conn.execute(
+        "SELECT allocated_quantity, quantity_per FROM assembly_parts WHERE assembly_id = ? AND part_id = ?",
+        (assembly_id, part_id),
+    ).fetchone()
+    payload = {
+        "assembly_id": assembly_id,
+        "part_id": part_id,
+        # BOM 행이 사라진 경우 (스왑 등) None
+        "allocated_quantity": row["allocated_quantity"] if row else None,
+        "quantity_per": row["quantity_per"] if row else None,
+    }
+    rooms = [f"assembly:{assembly_id}", f"part:{part_id}"] + _project_rooms(conn, assembly_id)
+    publish("allocation", (assembly_id, part_id), payload, rooms)
+
+
+def notify_assembly_status(conn, assembly_id):
+    if socketio.server is None:
+        return
+    row = conn.execute("SELECT status FROM assemblies WHERE id = ?", (assembly_id,)).fetchone()
+    if not row:
+        return
+    rooms = [f"assembly:{assembly_id}"] + _project_rooms(conn, assembly_id)
+    publish("assembly_status", assembly_id, {"assembly_id": assembly_id, "status": row["status"]}, rooms)
+
+
+def notify_order_fulfilled(order_id, part_id, quantity, remaining=0):
+    # remaining > 0 이면 부분 입고 (주문은 남은 수량으로 열려 있음)
+    publish("order_fulfilled", order_id,
+            {"order_id": order_id, "part_id": part_id, "quantity": quantity, "remaining": remaining},
+            [f"part:{part_id}"])
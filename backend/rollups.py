@@ -0,0 +1,137 @@
+# backend/rollups.py
+"""
+어셈블리별 할당 집계(assembly_rollups) — assembly_parts / assemblies 트리거로 증분 유지.
+
+    total_lines        BOM 행 수
+    total_needed       SUM(quantity_per)                    (1대 기준)
+    total_required     total_needed * quantity_to_build
+    total_allocated    SUM(allocated_quantity)
+    allocation_percent 100 * total_allocated / total_required (필요량 0이면 0)
+
+상태 계산 / low_stock 목록은 이 테이블을 PK·인덱스로 읽기만 한다.
+집계가 어긋났다고 의심되면:
+
+    python rollups.py            # 전체 재계산
+"""
+import db as dbpool
+
+# 파생 컬럼 재계산 (트리거 안에서 :aid 자리에 new./old.assembly_id 등을 넣어 사용)
+REFRESH_DERIVED = """
+    UPDATE assembly_rollups
+       SET total_required = total_needed * COALESCE(
+               (SELECT quantity_to_build FROM assemblies WHERE id = {aid}), 0)
+     WHERE assembly_id = {aid};
+    UPDATE assembly_rollups
+       SET allocation_percent = CASE WHEN total_required > 0
+                                     THEN 100.0 * total_allocated / total_required
+                                     ELSE 0 END
+     WHERE assembly_id = {aid};
+"""
+
+
+def _apply_line(aid, sign, line):
+    """BOM 한 행(line = new / old)을 집계에 더하거나(+1) 빼는(-1) 문장."""
+    return f"""
+    UPDATE assembly_rollups
+       SET total_lines = total_lines + ({sign}),
+           total_needed = total_needed + ({sign}) * COALESCE({line}.quantity_per, 0),
+           total_allocated = total_allocated + ({sign}) * COALESCE({line}.allocated_quantity, 0)
+     WHERE assembly_id = {aid};
+    {REFRESH_DERIVED.format(aid=aid)}
+    """
+
+
+ROLLUP_DDL = f"""
+CREATE TABLE IF NOT EXISTS assembly_rollups (
+    assembly_id        INTEGER PRIMARY KEY REFERENCES assemblies(id) ON DELETE CASCADE,
+    total_lines        INTEGER NOT NULL DEFAULT 0,
+    total_needed       INTEGER NOT NULL DEFAULT 0,
+    total_required     INTEGER NOT NULL DEFAULT 0,
+    total_allocated    INTEGER NOT NULL DEFAULT 0,
+    allocation_percent REAL    NOT NULL DEFAULT 0
+);
+
+-- low_stock: BOM이 있는 어셈블리를 할당률 오름차순으로
+CREATE INDEX IF NOT EXISTS idx_assembly_rollups_percent
+    ON assembly_rollups(allocation_percent, assembly_id) WHERE total_lines > 0;
+
+CREATE TRIGGER IF NOT EXISTS assemblies_rollup_ai AFTER INSERT ON assemblies BEGIN
+    INSERT OR IGNORE INTO assembly_rollups(assembly_id) VALUES (new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS assemblies_rollup_au
+AFTER UPDATE OF quantity_to_build ON assemblies BEGIN
+    {REFRESH_DERIVED.format(aid='new.id')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS assembly_parts_rollup_ai AFTER INSERT ON assembly_parts BEGIN
+    INSERT OR IGNORE INTO assembly_rollups(assembly_id) VALUES (new.assembly_id);
+    {_apply_line('new.assembly_id', '+1', 'new')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS assembly_parts_rollup_au
+AFTER UPDATE OF assembly_id, quantity_per, allocated_quantity ON assembly_parts BEGIN
+    {_apply_line('old.assembly_id', '-1', 'old')}
+    INSERT OR IGNORE INTO assembly_rollups(assembly_id) VALUES (new.assembly_id);
+    {_apply_line('new.assembly_id', '+1', 'new')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS assembly_parts_rollup_ad AFTER DELETE ON assembly_parts BEGIN
+    {_apply_line('old.assembly_id', '-1', 'old')}
+END;
+"""
+
+
+def rebuild_rollups(conn):
+    """assembly_parts 전체로 집계를 다시 계산 (커밋은 호출자 몫)."""
+    conn.execute("DELETE FROM assembly_rollups")
+    conn.execute("""
+        INSERT INTO assembly_rollups(assembly_id, total_lines, total_needed, total_required,
+                                     total_allocated, allocation_percent)
+        SELECT a.id,
+               COUNT(ap.part_id),
+               COALESCE(SUM(ap.quantity_per), 0),
+               COALESCE(SUM(ap.quantity_per), 0) * COALESCE(a.quantity_to_build, 0),
+               COALESCE(SUM(ap.allocated_quantity), 0),
+               CASE WHEN COALESCE(SUM(ap.quantity_per), 0) * COALESCE(a.quantity_to_build, 0) > 0
+                    THEN 100.0 * COALESCE(SUM(ap.allocated_quantity), 0)
+                         / (SUM(ap.quantity_per) * a.quantity_to_build)
+                    ELSE 0 END
+        FROM assemblies a
+        LEFT JOIN assembly_parts ap ON ap.assembly_id = a.id
+        GROUP BY a.id
+    """)
+
+
+def recalculate_assembly_status(conn, assembly_id):
+    """집계 기준으로 assemblies.status 갱신 후 커밋 (BOM이 비어 있으면 그대로 둠)."""
+    row = conn.execute(
+        "SELECT total_lines, total_required, total_allocated FROM assembly_rollups WHERE assembly_id = ?",
+        (assembly_id,),
+    ).fetchone()
+
+    if not row or not row["total_lines"]:
+        return
+
+    total_required = row["total_required"]
+    allocated = row["total_allocated"]
+    percent = 0 if total_required == 0 else (allocated / total_required)
+
+    if percent == 1:
+        status = "Completed"
+    elif percent > 0:
+        status = "In Progress"
+    else:
+        status = "Planned"
+
+    conn.execute("UPDATE assemblies SET status = ? WHERE id = ?", (status, assembly_id))
+    conn.commit()
+
+
+if __name__ == "__main__":
+    with dbpool.connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rebuild_rollups(conn)
+        conn.commit()
+        n = conn.execute("SELECT COUNT(*) FROM assembly_rollups").fetchone()[0]
+        print(f"assembly_rollups 재계산 완료: {n}개 어셈블리")
@@ -13,15 +13,9 @@ CORS(aliases_bp, resources={r"/api/*": {
     "origins": ["http://192.168.0.2:3000", "http://localhost:3000"]
 }})
 
-DB_PATH = os.path.join(os.getcwd(), 'inventory.db')
-
-def get_db():
-    if 'db' not in g:
-        g.db = sqlite3.connect(DB_PATH)
-        g.db.row_factory = sqlite3.Row
-        # [중요] 외래키 제약조건 활성화 (그룹 삭제 시 링크도 자동 삭제되도록)
-        g.db.execute("PRAGMA foreign_keys=ON")
-    return g.db
+# [중요] 외래키 제약조건(PRAGMA foreign_keys=ON)은 db.py 연결 풀에서 일괄 적용
+#        (그룹 삭제 시 링크도 자동 삭제되도록)
+from db import get_db
 
 # ==========================================
 # 1. 특정 부품의 Alias 여부 확인
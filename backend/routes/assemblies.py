@@ -2,32 +2,40 @@
 from flask import Blueprint, request, jsonify, g, current_app
 import sqlite3
 import os
+import numpy as np
 import pandas as pd
 from werkzeug.utils import secure_filename
 import glob
 from collections import defaultdict
 import traceback
 import re, unicodedata  # ← 필요 임포트
+import io
+import csv
+import json
+import itertools
 
 # CORS (블루프린트 레벨)
 from flask_cors import CORS
 
+from db import get_db, connection as dbconn
+from rollups import recalculate_assembly_status
+import jobs
+import versions
+import realtime
+import mrp
+import images
+import streaming
+import ledger
+
 assemblies_bp = Blueprint('assemblies', __name__)
 CORS(assemblies_bp, resources={r"/api/*": {
     "origins": ["http://192.168.0.2:3000", "http://localhost:3000"]
 }})
 
-DB_PATH = os.path.join(os.getcwd(), 'inventory.db')
 ASSEMBLY_IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'static', 'images', 'assemblies')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 os.makedirs(ASSEMBLY_IMAGE_DIR, exist_ok=True)
 
-def get_db():
-    if 'db' not in g:
-        g.db = sqlite3.connect(DB_PATH)
-        g.db.row_factory = sqlite3.Row
-    return g.db
-
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -67,24 +75,18 @@ def create_assembly():
     return jsonify({"message": f"{name} 생성 완료", "assembly_id": cur.lastrowid})
 
 @assemblies_bp.route("/api/assemblies", methods=["GET"])
+@versions.conditional("assemblies", "assemblies")
+@streaming.json_stream
 def get_assemblies():
-    try:
-        db = get_db()
-        rows = db.execute("SELECT * FROM assemblies ORDER BY update_date DESC").fetchall()
+    return streaming.Rows(
+        "SELECT * FROM assemblies ORDER BY update_date DESC", (), assembly_row_to_dict
+    )
 
-        assemblies = []
-        for row in rows:
-            a = dict(row)
-            if a.get("image_filename"):
-                a["image_url"] = f"/static/images/assemblies/{a['image_filename']}"
-            else:
-                a["image_url"] = None
-            assemblies.append(a)
 
-        return jsonify(assemblies)
-    except Exception as e:
-        current_app.logger.error(f"Error fetching assemblies: {e}")
-        return jsonify({'error': str(e)}), 500
+def assembly_row_to_dict(row):
+    a = dict(row)
+    a.update(images.image_urls("assemblies", a))
+    return a
 
 @assemblies_bp.route('/api/assemblies', methods=['DELETE'])
 def delete_assemblies():
@@ -95,19 +97,16 @@ def delete_assemblies():
         return jsonify({'error': '삭제할 ID가 없습니다.'}), 400
 
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
 
         for assembly_id in ids:
-            pattern = os.path.join(ASSEMBLY_IMAGE_DIR, f"assembly_{assembly_id}.*")
-            for file in glob.glob(pattern):
-                os.remove(file)
+            images.remove_images("assemblies", assembly_id)
 
             cursor.execute("DELETE FROM assembly_parts WHERE assembly_id = ?", (assembly_id,))
 
         cursor.executemany("DELETE FROM assemblies WHERE id = ?", [(i,) for i in ids])
         conn.commit()
-        conn.close()
 
         return jsonify({'message': f'{len(ids)}개 어셈블리 삭제됨'}), 200
 
@@ -139,181 +138,277 @@ def parse_qty_py(v):
     if not m: return 0
     return int(m.group(0).replace(',', '').replace(' ', ''))
 
+def to_qty_py(v):
+    """CSV 수량 셀 -> 정수 (int(float(v)) 실패 시 parse_qty_py)"""
+    try:
+        return int(float(v)) if (v is not None and not pd.isnull(v)) else 0
+    except Exception:
+        return parse_qty_py(v)
+
 def pick(colset, names):
     for n in names:
         if n in colset:
             return n
     return None
 
-@assemblies_bp.route("/api/assemblies/upload_csv", methods=["POST", "OPTIONS"])
-def upload_assembly_csv():
-    if request.method == "OPTIONS":
-        return ("", 204)
+def resolve_bom_columns(columns):
+    """CSV 헤더 -> 역할별 컬럼명 매핑(별칭)"""
+    cols = set(columns)
+    return {
+        "part_name":   pick(cols, ['part_name', 'Part Name', 'Part_Name']),
+        "quantity":    pick(cols, ['quantity', 'Qty', 'Quantity']),
+        "reference":   pick(cols, ['reference', 'Parts', 'Ref', 'Designator']),
+        "description": pick(cols, ['description', 'Detailed Description', 'Desc']),
+        "package":     pick(cols, ['package', 'Footprint Name', 'Package']),
+        "device":      pick(cols, ['Device', 'device']),
+        "value":       pick(cols, ['Value', 'value', 'Val', 'Spec']),
+        "mfr":         pick(cols, ['Manufacturer', 'Mfr', 'manufacturer', 'MANUFACTURER_NAME']),
+        "category":    pick(cols, ['CATEGORY', 'category_large', 'category']),
+    }
 
-    # 파일 존재 확인
-    if 'file' not in request.files:
-        return jsonify({"error": "CSV 파일이 필요합니다"}), 400
+def map_unique(series, func, na_value):
+    """
+    series의 고유값에만 func를 적용하고 코드로 다시 펼침.
+    BOM 컬럼은 중복값이 많아 행 단위 호출보다 훨씬 적게 호출된다.
+    """
+    codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+    mapped = np.array([func(u) for u in uniques] + [na_value], dtype=object)
+    return pd.Series(mapped[codes], index=series.index, dtype=object)
 
-    file = request.files['file']
-    if not file.filename.lower().endswith('.csv'):
-        return jsonify({"error": "CSV 파일만 업로드 가능합니다"}), 400
+def text_column(df, col):
+    """셀 -> str(v).strip(), 빈 셀/없는 컬럼은 ''"""
+    if not col or col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    return map_unique(df[col], lambda v: str(v).strip(), '')
+
+def alnum_only(s):
+    return re.sub(r'[^a-z0-9]', '', s)
+
+def join_refs(ref):
+    """'R1;R2, R3' -> 'R1, R2, R3' (';' / ',' 구분, 빈 토큰 제거)"""
+    return ', '.join(r.strip() for chunk in ref.split(';') for r in chunk.split(',') if r and r.strip())
 
-    # CSV 읽기 (encoding/sep 유연)
+def derive_bom_rows(df, cols):
+    """
+    DataFrame -> 행 단위 BOM (컬럼 연산으로 처리)
+    반환: (rows DataFrame, skipped_empty, skipped_zero, failed_rows)
+      rows: part_name, quantity, reference, description, manufacturer, package, category, src_row
+    """
+    # part_name 우선
+    pn = text_column(df, cols["part_name"])
+
+    # part_name이 비어있으면 device/value 규칙 적용 (DB 저장엔 쓰지 않음)
+    unnamed = pn == ''
+    if unnamed.any():
+        sub = df[unnamed]
+        device_raw = text_column(sub, cols["device"])
+        value_raw = text_column(sub, cols["value"])
+
+        dev_norm = map_unique(device_raw, canon_compare_py, '')
+        val_norm = map_unique(value_raw, canon_compare_py, '')
+        device_tok = map_unique(device_raw, sanitize_token_py, '')
+        value_tok = map_unique(value_raw, sanitize_token_py, '')
+
+        has_dev = dev_norm != ''
+        has_val = val_norm != ''
+        same = (dev_norm == val_norm) | (
+            map_unique(dev_norm, alnum_only, '') == map_unique(val_norm, alnum_only, '')
+        )
+        base = pd.Series(np.select(
+            [has_dev & has_val & same, has_dev & has_val, has_dev, has_val],
+            [device_tok, device_tok + '_' + value_tok, device_tok, value_tok],
+            default='',
+        ), index=sub.index, dtype=object)
+
+        # 둘 다 없으면 reference로 대체
+        by_ref = ~has_dev & ~has_val
+        if by_ref.any():
+            base[by_ref] = map_unique(text_column(sub[by_ref], cols["reference"]), sanitize_token_py, '')
+        pn = pn.copy()
+        pn[unnamed] = base
+
+    # 비어 있으면 스킵/실패 기록
+    no_name = pn == ''
+    blank = df[no_name]
+    all_empty = pd.Series(True, index=blank.index)
+    for c in blank.columns:
+        all_empty &= text_column(blank, c) == ''
+    skipped_empty = int(all_empty.sum())
+    failed_rows = [(int(idx) + 2, "part_name empty") for idx in blank.index[~all_empty]]
+
+    # quantity 파싱
+    qty = map_unique(df[cols["quantity"]], to_qty_py, 0)
+    zero = ~no_name & (qty == 0)
+    skipped_zero = int(zero.sum())
+
+    keep = ~no_name & ~zero
+    rows = pd.DataFrame({
+        "part_name": pn[keep],
+        "quantity": qty[keep].astype('int64'),
+        "reference": map_unique(text_column(df[keep], cols["reference"]), join_refs, ''),
+        "description": text_column(df, cols["description"])[keep],
+        "manufacturer": text_column(df, cols["mfr"])[keep],
+        "package": text_column(df, cols["package"])[keep],
+        "category": text_column(df, cols["category"])[keep],
+        "src_row": df.index[keep],
+    })
+    return rows, skipped_empty, skipped_zero, failed_rows
+
+def group_bom_rows(rows):
+    """
+    같은 part_name 행 합치기 (첫 등장 순서 유지)
+    - quantity 합, reference 순서대로 이어붙임, 나머지 속성은 마지막 행 기준
+    """
+    if rows.empty:
+        return rows
+    grouped = rows.groupby("part_name", sort=False).agg(
+        quantity=("quantity", "sum"),
+        description=("description", "last"),
+        manufacturer=("manufacturer", "last"),
+        package=("package", "last"),
+        category=("category", "last"),
+        src_row=("src_row", "last"),
+    ).reset_index()
+
+    refs = {}
+    for name, ref in zip(rows["part_name"], rows["reference"]):
+        if ref:
+            refs.setdefault(name, []).append(ref)
+    grouped["reference"] = [', '.join(refs.get(name, ())) for name in grouped["part_name"]]
+    grouped["package"] = grouped["package"].where(grouped["package"] != '', grouped["part_name"])
+    return grouped
+
+def insert_bom_rows(cur, assembly_id, bom):
+    """
+    그룹핑된 BOM을 DB에 반영 (value는 절대 저장X)
+    - 기존 부품은 part_name 일괄 조회, 신규 부품/assembly_parts는 executemany
+    반환: (inserted, failed_rows, created)
+    """
+    names = bom["part_name"].tolist()
+    if not names:
+        return 0, [], 0
+
+    def lookup_ids(wanted):
+        found = {}
+        for i in range(0, len(wanted), 500):
+            chunk = wanted[i:i + 500]
+            cur.execute(
+                f"SELECT id, part_name FROM parts WHERE part_name IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update({r['part_name']: r['id'] for r in cur.fetchall()})
+        return found
+
+    part_ids = lookup_ids(names)
+    new_parts = bom[~bom["part_name"].isin(part_ids.keys())]
+    if not new_parts.empty:
+        cur.executemany("""
+            INSERT INTO parts (
+                part_name, manufacturer, description, package,
+                category_large, memo, create_date, update_date
+            ) VALUES (?, ?, ?, ?, ?, '', datetime('now'), datetime('now'))
+        """, new_parts[["part_name", "manufacturer", "description", "package", "category"]]
+            .itertuples(index=False, name=None))
+        part_ids.update(lookup_ids(new_parts["part_name"].tolist()))
+
+    links = [
+        (assembly_id, part_ids[name], int(q), ref)
+        for name, q, ref in zip(names, bom["quantity"], bom["reference"])
+    ]
+    sql = """
+        INSERT INTO assembly_parts (assembly_id, part_id, quantity_per, reference)
+        VALUES (?, ?, ?, ?)
+    """
+    cur.execute("SAVEPOINT bom_links")
     try:
-        file.stream.seek(0)
+        cur.executemany(sql, links)
+        cur.execute("RELEASE bom_links")
+        return len(links), [], len(new_parts)
+    except sqlite3.Error:
+        # 한 건이라도 실패하면 행 단위로 다시 넣어 실패 행만 기록
+        cur.execute("ROLLBACK TO bom_links")
+        cur.execute("RELEASE bom_links")
+
+    inserted, failed_rows = 0, []
+    for link, src_row in zip(links, bom["src_row"]):
         try:
-            df = pd.read_csv(file, sep=None, engine='python', encoding='utf-8-sig')
+            cur.execute(sql, link)
+            inserted += 1
+        except Exception as e:
+            failed_rows.append((int(src_row) + 2, str(e)))
+    return inserted, failed_rows, len(new_parts)
+
+BOM_CHUNK_ROWS = 5000
+
+def read_bom_csv(raw, chunksize=None):
+    """
+    CSV 바이트 -> 헤더 정규화된 DataFrame 조각 리스트/제너레이터 (encoding/sep 유연)
+    chunksize가 없으면 한 덩어리 리스트
+    """
+    for encoding in ('utf-8-sig', 'utf-8', 'cp949'):
+        try:
+            text = raw.decode(encoding)
+            break
         except UnicodeDecodeError:
-            file.stream.seek(0)
-            try:
-                df = pd.read_csv(file, sep=None, engine='python', encoding='utf-8')
-            except UnicodeDecodeError:
-                file.stream.seek(0)
-                df = pd.read_csv(file, sep=None, engine='python', encoding='cp949')
-    except Exception as e:
-        return jsonify({"error": f"CSV 파싱 오류: {str(e)}"}), 400
+            continue
+    else:
+        raise UnicodeDecodeError('cp949', raw, 0, 1, 'CSV 인코딩을 알 수 없습니다')
 
     # 컬럼 정규화 (헤더 트림)
     def norm_col(c): return str(c).strip().strip('"').strip()
-    df.columns = [norm_col(c) for c in df.columns]
-    cols = set(df.columns)
-
-    # 컬럼 매핑(별칭)
-    col_part_name   = pick(cols, ['part_name', 'Part Name', 'Part_Name'])
-    col_quantity    = pick(cols, ['quantity', 'Qty', 'Quantity'])
-    col_reference   = pick(cols, ['reference', 'Parts', 'Ref', 'Designator'])
-    col_description = pick(cols, ['description', 'Detailed Description', 'Desc'])
-    col_package     = pick(cols, ['package', 'Footprint Name', 'Package'])
-    col_device      = pick(cols, ['Device', 'device'])
-    col_value       = pick(cols, ['Value', 'value', 'Val', 'Spec'])
-    col_mfr         = pick(cols, ['Manufacturer', 'Mfr', 'manufacturer', 'MANUFACTURER_NAME'])
-    col_category    = pick(cols, ['CATEGORY', 'category_large', 'category'])
-
-    # 기본 검증
-    if not col_quantity:
-        return jsonify({"error": "필수 열 누락: quantity/Qty"}), 400
 
-    assembly_name = request.form.get('assembly_name') or os.path.splitext(secure_filename(file.filename))[0]
+    def normalized(df):
+        df.columns = [norm_col(c) for c in df.columns]
+        return df
+
+    if chunksize is None:
+        return [normalized(pd.read_csv(io.StringIO(text), sep=None, engine='python'))]
+    reader = pd.read_csv(io.StringIO(text), sep=None, engine='python', chunksize=chunksize)
+    return (normalized(df) for df in reader)
+
+def import_bom(db, assembly_name, frames, report=None):
+    """
+    BOM CSV 조각들 -> 어셈블리 + BOM 등록
+    report(rows_parsed=, parts_created=, failures=) 로 진행률 전달 (백그라운드 작업용)
+    반환: (HTTP status, result dict)
+    """
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        return 400, {"error": "CSV 파싱 오류: 데이터가 없습니다"}
+
+    # 컬럼 매핑(별칭) + 기본 검증
+    cols = resolve_bom_columns(first.columns)
+    if not cols["quantity"]:
+        return 400, {"error": "필수 열 누락: quantity/Qty"}
 
-    db = get_db()
     cur = db.cursor()
 
     # 중복 어셈블리명 방지
     cur.execute("SELECT id FROM assemblies WHERE assembly_name = ?", (assembly_name,))
     if cur.fetchone():
-        return jsonify({"error": f"이미 존재하는 어셈블리 이름입니다: {assembly_name}"}), 400
+        return 400, {"error": f"이미 존재하는 어셈블리 이름입니다: {assembly_name}"}
 
-    # 어셈블리 생성
+    # 행 처리 (쓰기 잠금 잡기 전에 파싱을 끝냄)
+    parsed, rows_parsed = [], 0
+    skipped_empty = skipped_zero = 0
+    failed_rows = []
+    for df in itertools.chain([first], frames):
+        rows, empty, zero, failed = derive_bom_rows(df, cols)
+        parsed.append(rows)
+        skipped_empty += empty
+        skipped_zero += zero
+        failed_rows.extend(failed)
+        rows_parsed += len(df)
+        if report:
+            report(rows_parsed=rows_parsed, failures=len(failed_rows))
+    bom = group_bom_rows(pd.concat(parsed))
+
+    # 어셈블리 생성 + DB 반영
     cur.execute("INSERT INTO assemblies (assembly_name, create_date, update_date) VALUES (?, datetime('now'), datetime('now'))", (assembly_name,))
     assembly_id = cur.lastrowid
-
-    grouped_parts = defaultdict(lambda: {"quantity": 0, "reference": [], "row": None})
-    skipped_empty = 0
-    skipped_zero = 0
-    failed_rows = []
-
-    # 행 처리
-    for idx, row in df.iterrows():
-        # part_name 우선
-        pn = ""
-        if col_part_name and col_part_name in row and pd.notna(row[col_part_name]):
-            pn = str(row[col_part_name]).strip()
-
-        # part_name이 비어있으면 device/value 규칙 적용 (DB 저장엔 쓰지 않음)
-        if not pn:
-            device_raw = (str(row[col_device]).strip() if col_device and col_device in row and pd.notna(row[col_device]) else "")
-            value_raw  = (str(row[col_value]).strip()  if col_value  and col_value  in row and pd.notna(row[col_value])  else "")
-
-            dev_norm = canon_compare_py(device_raw)
-            val_norm = canon_compare_py(value_raw)
-            device_tok = sanitize_token_py(device_raw)
-            value_tok  = sanitize_token_py(value_raw)
-
-            base = ""
-            if dev_norm and val_norm:
-                if (dev_norm == val_norm) or (re.sub(r'[^a-z0-9]', '', dev_norm) == re.sub(r'[^a-z0-9]', '', val_norm)):
-                    base = device_tok
-                else:
-                    base = f"{device_tok}_{value_tok}"
-            elif dev_norm:
-                base = device_tok
-            elif val_norm:
-                base = value_tok
-            else:
-                # 둘 다 없으면 reference로 대체
-                ref_raw = (str(row[col_reference]).strip() if col_reference and col_reference in row and pd.notna(row[col_reference]) else "")
-                base = sanitize_token_py(ref_raw)
-
-            pn = base
-
-        # 비어 있으면 스킵/실패 기록
-        if not pn:
-            if all((not pd.notna(row[c]) or str(row[c]).strip() == "") for c in df.columns):
-                skipped_empty += 1
-                continue
-            else:
-                failed_rows.append((int(idx) + 2, "part_name empty"))
-                continue
-
-        # quantity 파싱
-        raw_q = row[col_quantity] if col_quantity in row else None
-        try:
-            qty = int(float(raw_q)) if (raw_q is not None and not pd.isnull(raw_q)) else 0
-        except Exception:
-            qty = parse_qty_py(raw_q)
-        if not qty:
-            skipped_zero += 1
-            continue
-
-        # reference 처리
-        ref = ""
-        if col_reference and col_reference in row and pd.notna(row[col_reference]):
-            ref = str(row[col_reference]).strip()
-        refs = [r.strip() for chunk in str(ref).split(';') for r in chunk.split(',') if r and r.strip()]
-
-        grouped_parts[pn]["quantity"] += qty
-        grouped_parts[pn]["reference"].extend(refs)
-        grouped_parts[pn]["row"] = row
-
-    # DB 반영 (value는 절대 저장X)
-    inserted = 0
-    for part_name, data in grouped_parts.items():
-        row = data["row"]
-        quantity = data["quantity"]
-        reference = ', '.join(data["reference"])
-
-        def get_opt(col):
-            return (str(row[col]).strip() if (col and col in row and pd.notna(row[col])) else "")
-
-        description = get_opt(col_description)
-        manufacturer = get_opt(col_mfr)
-        package = get_opt(col_package) or part_name
-        category = get_opt(col_category)
-        memo = ""
-
-        try:
-            # parts upsert (part_name 기준)
-            cur.execute("SELECT id FROM parts WHERE part_name = ?", (part_name,))
-            existing = cur.fetchone()
-            if existing:
-                part_id = existing['id']
-            else:
-                cur.execute("""
-                    INSERT INTO parts (
-                        part_name, manufacturer, description, package,
-                        category_large, memo, create_date, update_date
-                    ) VALUES (?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
-                """, (part_name, manufacturer, description, package, category, memo))
-                part_id = cur.lastrowid
-
-            cur.execute("""
-                INSERT INTO assembly_parts (assembly_id, part_id, quantity_per, reference)
-                VALUES (?, ?, ?, ?)
-            """, (assembly_id, part_id, quantity, reference))
-            inserted += 1
-        except Exception as e:
-            failed_rows.append((int(getattr(row, 'name', 0)) + 2, str(e)))
-            continue
+    inserted, insert_failures, created = insert_bom_rows(cur, assembly_id, bom)
+    failed_rows.extend(insert_failures)
 
     # 상태 갱신 및 커밋
     try:
@@ -321,7 +416,10 @@ def upload_assembly_csv():
         db.commit()
     except Exception as e:
         db.rollback()
-        return jsonify({"error": f"DB 커밋 실패: {str(e)}"}), 500
+        return 500, {"error": f"DB 커밋 실패: {str(e)}"}
+
+    if report:
+        report(parts_created=created, failures=len(failed_rows))
 
     result = {
         "message": f"어셈블리 '{assembly_name}' 등록 완료",
@@ -333,8 +431,58 @@ def upload_assembly_csv():
     if failed_rows:
         result["warnings"] = (result.get("warnings", "") + f" 실패 {len(failed_rows)}건").strip() if result.get("warnings") else f"실패 {len(failed_rows)}건"
         result["failed_rows"] = failed_rows
+    return 200, result
+
+def run_bom_import_job(report, raw, assembly_name):
+    """백그라운드 작업: 조각 단위 파싱 + 진행률 전송"""
+    try:
+        frames = read_bom_csv(raw, chunksize=BOM_CHUNK_ROWS)
+        with dbconn() as db:
+            status, result = import_bom(db, assembly_name, frames, report)
+    except (UnicodeDecodeError, pd.errors.ParserError, pd.errors.EmptyDataError, csv.Error) as e:
+        raise ValueError(f"CSV 파싱 오류: {str(e)}")
+    if status != 200:
+        raise ValueError(result["error"])
+    return result
+
+@assemblies_bp.route("/api/assemblies/upload_csv", methods=["POST", "OPTIONS"])
+def upload_assembly_csv():
+    """
+    BOM CSV 업로드.
+    - 기본: 작업 id만 즉시 반환(202 {job_id, status}), 진행률은 SocketIO "job_progress",
+      결과(또는 error)는 GET /api/jobs/<id>
+    - sync=1 (form 또는 query): 요청 안에서 처리 후 결과 반환 (스크립트 / 테스트용)
+    """
+    if request.method == "OPTIONS":
+        return ("", 204)
+
+    # 파일 존재 확인
+    if 'file' not in request.files:
+        return jsonify({"error": "CSV 파일이 필요합니다"}), 400
+
+    file = request.files['file']
+    if not file.filename.lower().endswith('.csv'):
+        return jsonify({"error": "CSV 파일만 업로드 가능합니다"}), 400
+
+    assembly_name = request.form.get('assembly_name') or os.path.splitext(secure_filename(file.filename))[0]
+
+    # 이름 중복은 파싱 전에 바로 알려줌 (작업 안에서 잠금 후 다시 확인)
+    if get_db().execute("SELECT 1 FROM assemblies WHERE assembly_name = ?", (assembly_name,)).fetchone():
+        return jsonify({"error": f"이미 존재하는 어셈블리 이름입니다: {assembly_name}"}), 400
+
+    raw = file.read()
+
+    if (request.values.get('sync') or '').lower() not in ('1', 'true', 'yes'):
+        job = jobs.submit("bom_import", run_bom_import_job, raw, assembly_name)
+        return jsonify({"job_id": job["id"], "status": job["status"]}), 202
+
+    try:
+        frames = read_bom_csv(raw)
+    except Exception as e:
+        return jsonify({"error": f"CSV 파싱 오류: {str(e)}"}), 400
 
-    return jsonify(result), 200
+    status, result = import_bom(get_db(), assembly_name, frames)
+    return jsonify(result), status
 
 @assemblies_bp.route('/api/assemblies/<int:assembly_id>/upload-image', methods=['POST'])
 def upload_assembly_image(assembly_id):
@@ -349,21 +497,20 @@ def upload_assembly_image(assembly_id):
         return jsonify({'error': '허용되지 않는 파일 확장자입니다.'}), 400
 
     ext = file.filename.rsplit('.', 1)[1].lower()
-    filename = f"assembly_{assembly_id}.{ext}"
-    save_path = os.path.join(ASSEMBLY_IMAGE_DIR, filename)
 
     try:
-        existing_images = glob.glob(os.path.join(ASSEMBLY_IMAGE_DIR, f"assembly_{assembly_id}.*"))
-        for img in existing_images:
-            os.remove(img)
+        filename = images.save_upload("assemblies", assembly_id, file, ext)
 
-        file.save(save_path)
-
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
-        cursor.execute("UPDATE assemblies SET image_filename = ? WHERE id = ?", (filename, assembly_id))
+        cursor.execute("""
+            UPDATE assemblies
+            SET image_filename = ?, image_thumb = NULL, image_detail = NULL, image_webp = NULL
+            WHERE id = ?
+        """, (filename, assembly_id))
         conn.commit()
-        conn.close()
+
+        images.schedule("assemblies", assembly_id, filename)
 
         image_url = f"/static/images/assemblies/{filename}"
         return jsonify({'image_url': image_url}), 200
@@ -379,7 +526,26 @@ def get_assembly_detail(assembly_id):
         if not assembly:
             return jsonify({'error': 'Assembly not found'}), 404
 
+        # alias_pool: BOM에 나오는 호환 그룹별 재고 합계 + 구성 부품 (같은 쿼리에서 집계)
         parts = db.execute("""
+            WITH bom_aliases AS (
+                SELECT DISTINCT l.alias_id
+                FROM assembly_parts ap
+                JOIN alias_links l ON l.part_id = ap.part_id
+                WHERE ap.assembly_id = ?
+            ),
+            alias_pool AS (
+                SELECT l.alias_id,
+                       SUM(MAX(COALESCE(p.quantity, 0), 0)) AS pool_stock,
+                       json_group_array(json_object(
+                           'link_id', l.id, 'part_id', p.id,
+                           'part_name', p.part_name, 'quantity', p.quantity
+                       )) AS members
+                FROM alias_links l
+                JOIN parts p ON p.id = l.part_id
+                WHERE l.alias_id IN (SELECT alias_id FROM bom_aliases)
+                GROUP BY l.alias_id
+            )
             SELECT 
                 ap.reference, 
                 ap.quantity_per, 
@@ -389,18 +555,29 @@ def get_assembly_detail(assembly_id):
                 p.package, 
                 p.id as part_id,
                 al.alias_id,   
-                a.alias_name      
+                a.alias_name,
+                pool.pool_stock AS alias_pool_stock,
+                pool.members AS alias_members
             FROM assembly_parts ap
             JOIN parts p ON ap.part_id = p.id
             LEFT JOIN alias_links al ON p.id = al.part_id  
             LEFT JOIN aliases a ON al.alias_id = a.id     
+            LEFT JOIN alias_pool pool ON pool.alias_id = al.alias_id
             WHERE ap.assembly_id = ?
             ORDER BY p.part_name
-        """, (assembly_id,)).fetchall()
+        """, (assembly_id, assembly_id)).fetchall()
+
+        rows = []
+        for row in parts:
+            item = dict(row)
+            members = json.loads(item.pop('alias_members') or '[]')
+            # 대체 가능 부품 = 같은 그룹의 다른 부품
+            item['substitutes'] = [m for m in members if m['part_id'] != item['part_id']]
+            rows.append(item)
 
         return jsonify({
-            'assembly': dict(assembly),
-            'parts': [dict(row) for row in parts]
+            'assembly': dict(dict(assembly), **images.image_urls('assemblies', dict(assembly))),
+            'parts': rows
         })
 
     except Exception as e:
@@ -572,59 +749,35 @@ def add_bom_item(assembly_id):
         db.rollback()
         return jsonify({'error': f'추가 실패: {str(e)}'}), 500
 
-def recalculate_assembly_status(db, assembly_id):
-    row = db.execute("""
-        SELECT a.quantity_to_build, 
-               SUM(ap.quantity_per) as total_needed, 
-               SUM(ap.allocated_quantity) as total_allocated
-        FROM assemblies a
-        JOIN assembly_parts ap ON a.id = ap.assembly_id
-        WHERE a.id = ?
-        GROUP BY a.id
-    """, (assembly_id,)).fetchone()
-
-    if not row:
-        return 
-
-    total_required = row['quantity_to_build'] * row['total_needed']
-    allocated = row['total_allocated'] or 0
-    percent = 0 if total_required == 0 else (allocated / total_required)
-
-    if percent == 1:
-        status = 'Completed'
-    elif percent > 0:
-        status = 'In Progress'
-    else:
-        status = 'Planned'
-
-    db.execute("UPDATE assemblies SET status = ? WHERE id = ?", (status, assembly_id))
-    db.commit()
+@assemblies_bp.route("/api/assemblies/buildable", methods=["GET"])
+@versions.conditional("buildable", "parts", "assemblies", "assembly_parts", "alias_links")
+def get_buildable_assemblies():
+    """
+    어셈블리별 현재 재고로 생산 가능한 수량 + 제약 부품(limiting_part).
+    ?aliases=1 이면 호환 그룹 재고 합계로 계산.
+    """
+    try:
+        use_aliases = request.args.get("aliases") in ("1", "true")
+        return jsonify(mrp.buildable_report(get_db(), use_aliases=use_aliases))
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
 
 @assemblies_bp.route("/api/assemblies/low_stock", methods=["GET"])
+@versions.conditional("low-stock", "assemblies", "assembly_parts")
 def get_low_stock_assemblies():
     try:
         db = get_db()
         rows = db.execute("""
-            SELECT a.id, a.assembly_name, a.quantity_to_build,
-                   SUM(ap.quantity_per) AS total_needed,
-                   SUM(ap.allocated_quantity) AS total_allocated
-            FROM assemblies a
-            JOIN assembly_parts ap ON a.id = ap.assembly_id
-            GROUP BY a.id
-            HAVING total_allocated < (a.quantity_to_build * total_needed)
-            ORDER BY (1.0 * total_allocated / NULLIF(a.quantity_to_build * total_needed, 0)) ASC
+            SELECT a.id, a.assembly_name, r.allocation_percent
+            FROM assembly_rollups r
+            JOIN assemblies a ON a.id = r.assembly_id
+            WHERE r.total_lines > 0
+              AND r.total_allocated < r.total_required
+            ORDER BY r.allocation_percent ASC
         """).fetchall()
 
-        assemblies = []
-        for row in rows:
-            total_needed = row["quantity_to_build"] * row["total_needed"]
-            allocated = row["total_allocated"] or 0
-            percent = 0 if total_needed == 0 else (allocated / total_needed * 100)
-            assemblies.append({
-                "id": row["id"],
-                "assembly_name": row["assembly_name"],
-                "allocation_percent": percent
-            })
+        assemblies = [dict(r) for r in rows]
 
         return jsonify(assemblies)
     except Exception as e:
@@ -840,6 +993,7 @@ def swap_bom_quantity(assembly_id):
                 
                 # 1) 재고로 반납
                 cursor.execute("UPDATE parts SET quantity = quantity + ? WHERE id = ?", (return_to_stock, src_part_id))
+                ledger.record(db, ledger.SWAP_RETURN, [(src_part_id, return_to_stock)], assembly_id=assembly_id)
                 
                 # 2) BOM 할당량 줄임 (딱 필요한 만큼만 남김)
                 cursor.execute("""
@@ -860,11 +1014,16 @@ def swap_bom_quantity(assembly_id):
             # 할당되어 있던 모든 수량을 재고로 반납
             if src_allocated > 0:
                 cursor.execute("UPDATE parts SET quantity = quantity + ? WHERE id = ?", (src_allocated, src_part_id))
+                ledger.record(db, ledger.SWAP_RETURN, [(src_part_id, src_allocated)], assembly_id=assembly_id)
             
             # BOM 행 삭제
             cursor.execute("DELETE FROM assembly_parts WHERE assembly_id=? AND part_id=?", (assembly_id, src_part_id))
 
         db.commit()
+
+        realtime.notify_part_quantity(db, src_part_id)
+        realtime.notify_allocation(db, assembly_id, src_part_id)
+        realtime.notify_allocation(db, assembly_id, tgt_part_id)
         return jsonify({"message": "교체 완료 (과잉 할당분 반납됨)"})
 
     except Exception as e:
@@ -0,0 +1,14 @@
+# backend/routes/jobs.py
+from flask import Blueprint, jsonify
+
+import jobs
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+@jobs_bp.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = jobs.snapshot(job_id)
+    if job is None:
+        return jsonify({"error": "해당 작업을 찾을 수 없습니다."}), 404
+    return jsonify(job), 200
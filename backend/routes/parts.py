@@ -1,21 +1,27 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from datetime import datetime
 import sqlite3
 import os
 import glob
+import io
+import csv
+import json
+import base64
+import threading
+import itertools
+
+import versions
+import realtime
+import images
+import streaming
+import ledger
+
+from db import get_db, connection as dbconn
+from rollups import recalculate_assembly_status
 
 parts_bp = Blueprint("parts", __name__)
 order_bp = Blueprint("orders", __name__)
 
-
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "inventory.db")
-
 # 이미지 저장 폴더: 프로젝트 루트/static/images/parts
 IMAGE_DIR = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "..", "static", "images", "parts"
@@ -40,7 +46,7 @@ def add_part():
         return jsonify({"error": "part_name은 필수입니다."}), 400
 
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -73,9 +79,9 @@ def add_part():
                 datetime.now(),
             ),
         )
+        ledger.record_created(conn, [cursor.lastrowid], note="create")
 
         conn.commit()
-        conn.close()
         return jsonify({"message": "부품이 성공적으로 추가되었습니다."}), 201
     except sqlite3.IntegrityError:
         return jsonify({"error": "이미 존재하는 부품 이름입니다."}), 409
@@ -84,41 +90,424 @@ def add_part():
         return jsonify({"error": str(e)}), 500
 
 
+# 서버 측 필터 (쿼리스트링 이름 == 컬럼 이름). 각 필터는 (컬럼, update_date, id) 인덱스를 탄다.
+PART_FILTER_COLUMNS = (
+    "category_large", "category_medium", "category_small",
+    "supplier", "manufacturer", "location", "package",
+)
+PARTS_PAGE_DEFAULT = 100
+PARTS_PAGE_MAX = 500
+
+
+def encode_cursor(update_date, part_id):
+    raw = json.dumps([update_date, part_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    update_date, part_id = json.loads(raw)
+    return update_date, int(part_id)
+
+
+def part_filter_clause(args):
+    """요청 파라미터 -> (WHERE 조건 리스트, 바인딩 값 리스트)"""
+    where, params = [], []
+    for col in PART_FILTER_COLUMNS:
+        value = args.get(col)
+        if value not in (None, ""):
+            where.append(f"{col} = ?")
+            params.append(value)
+
+    in_stock = (args.get("in_stock") or "").lower()
+    if in_stock in ("1", "true", "yes"):
+        where.append("quantity > 0")
+    elif in_stock in ("0", "false", "no"):
+        where.append("quantity <= 0")
+    return where, params
+
+
+def part_row_to_dict(row):
+    part_dict = dict(row)
+
+    # image_url + 파생본(thumb_url / detail_url / webp_url) 필드 추가
+    part_dict.update(images.image_urls("parts", part_dict))
+    return part_dict
+
+
 @parts_bp.route("/api/parts", methods=["GET"])
+@versions.conditional("parts", "parts")
+@streaming.json_stream
 def get_parts():
+    """
+    부품 목록.
+    - 필터: category_large/medium/small, supplier, manufacturer, location, package, in_stock
+    - limit 또는 cursor가 있으면 (update_date, id) 기준 keyset 페이지네이션
+      -> {"items": [...], "next_cursor": "...", "total": N}
+      total은 첫 페이지(cursor 없음)에서만 계산 (인덱스만으로 COUNT)
+    - 둘 다 없으면 기존처럼 배열 전체 반환 (기존 화면 호환, fetchmany 로 스트리밍)
+    """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = get_db()
         cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM parts ORDER BY update_date DESC")
-        rows = cursor.fetchall()
+        where, params = part_filter_clause(request.args)
+        paginate = "limit" in request.args or "cursor" in request.args
+
+        if not paginate:
+            sql = "SELECT * FROM parts"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            return streaming.Rows(sql + " ORDER BY update_date DESC, id DESC", params, part_row_to_dict)
+
+        try:
+            limit = int(request.args.get("limit", PARTS_PAGE_DEFAULT))
+        except ValueError:
+            return jsonify({"error": "limit은 정수여야 합니다."}), 400
+        limit = max(1, min(limit, PARTS_PAGE_MAX))
+
+        total = None
+        token = request.args.get("cursor")
+        if not token:
+            count_sql = "SELECT COUNT(*) FROM parts"
+            if where:
+                count_sql += " WHERE " + " AND ".join(where)
+            total = cursor.execute(count_sql, params).fetchone()[0]
+
+        last_date, last_id = None, None
+        if token:
+            try:
+                last_date, last_id = decode_cursor(token)
+            except Exception:
+                return jsonify({"error": "잘못된 cursor 입니다."}), 400
+
+        def page(extra, extra_params, n):
+            sql = "SELECT * FROM parts WHERE " + " AND ".join(where + [extra])
+            sql += " ORDER BY update_date DESC, id DESC LIMIT ?"
+            return cursor.execute(sql, params + extra_params + [n]).fetchall()
+
+        # DESC 정렬에서 NULL update_date는 맨 뒤. 한 WHERE 에 OR 로 묶으면 인덱스 범위를 못 쓰므로
+        # update_date 가 있는 구간 -> (페이지가 덜 차면) NULL 구간 순서로 따로 조회 (둘 다 인덱스 SEARCH)
+        # 다음 페이지 존재 여부 확인용으로 1건 더 조회
+        if token and last_date is None:
+            rows = page("update_date IS NULL AND id < ?", [last_id], limit + 1)
+        else:
+            if token:
+                rows = page("(update_date, id) < (?, ?)", [last_date, last_id], limit + 1)
+            else:
+                rows = page("update_date IS NOT NULL", [], limit + 1)
+            if len(rows) <= limit:
+                rows += page("update_date IS NULL", [], limit + 1 - len(rows))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last["update_date"], last["id"])
+
+        return jsonify({
+            "items": [part_row_to_dict(row) for row in rows],
+            "next_cursor": next_cursor,
+            "total": total,
+        })
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        parts = []
-        for row in rows:
-            part_dict = dict(row)
 
-            # image_url 필드 추가
-            if part_dict.get("image_filename"):
-                part_dict["image_url"] = (
-                    f"/static/images/parts/{part_dict['image_filename']}"
+# -------------------------------------------------------
+# 부품 일괄 내보내기 / 가져오기 (CSV, JSON Lines)
+# -------------------------------------------------------
+EXPORT_COLUMNS = (
+    "id", "part_name", "quantity", "ordered_quantity", "price", "supplier",
+    "purchase_date", "purchase_url", "manufacturer", "description", "mounting_type",
+    "package", "location", "memo", "category_large", "category_medium", "category_small",
+    "create_date", "update_date",
+)
+# 가져오기에서 받는 컬럼 (part_name 기준 upsert, 파일에 있는 컬럼만 갱신)
+IMPORT_COLUMNS = (
+    "part_name", "quantity", "ordered_quantity", "price", "supplier",
+    "purchase_date", "purchase_url", "manufacturer", "description", "mounting_type",
+    "package", "location", "memo", "category_large", "category_medium", "category_small",
+)
+IMPORT_INT_COLUMNS = {"quantity", "ordered_quantity"}
+IMPORT_FLOAT_COLUMNS = {"price"}
+IMPORT_INT_RANGE = (-2 ** 63, 2 ** 63 - 1)  # SQLite INTEGER (64비트)
+EXPORT_CHUNK = 1000
+IMPORT_BATCH = 1000
+IMPORT_MAX_ERRORS = 500
+
+
+def export_rows(where, params, fmt):
+    """부품을 EXPORT_CHUNK 행씩 읽어 CSV / JSONL 텍스트 조각으로 내보냄 (전체를 메모리에 올리지 않음)"""
+    sql = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM parts"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id"
+
+    with dbconn() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        cur.execute(sql, params)
+
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            buf.write("\ufeff")  # 엑셀에서 한글이 깨지지 않도록 BOM
+            writer.writerow(EXPORT_COLUMNS)
+            while True:
+                rows = cur.fetchmany(EXPORT_CHUNK)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+            if buf.tell():
+                yield buf.getvalue()
+        else:
+            while True:
+                rows = cur.fetchmany(EXPORT_CHUNK)
+                if not rows:
+                    break
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, r)), ensure_ascii=False) + "\n" for r in rows
                 )
-            else:
-                part_dict["image_url"] = None
 
-            parts.append(part_dict)
 
-        conn.close()
-        return jsonify(parts)
+@parts_bp.route("/api/parts/export", methods=["GET"])
+def export_parts():
+    """
+    부품 전체 내보내기 (스트리밍).
+    ?format=csv (기본) | jsonl, 필터는 GET /api/parts 와 동일
+    """
+    fmt = (request.args.get("format") or "csv").lower()
+    if fmt not in ("csv", "jsonl"):
+        return jsonify({"error": "format은 csv 또는 jsonl 이어야 합니다."}), 400
+
+    where, params = part_filter_clause(request.args)
+    filename = f"parts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(
+        stream_with_context(export_rows(where, params, fmt)),
+        mimetype=f"{mimetype}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def import_records(stream, fmt):
+    """업로드 스트림 -> (행 번호, dict) 를 한 행씩 (CSV 는 헤더 기준, JSONL 은 줄 단위)"""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        reader.fieldnames = [(c or "").strip() for c in (reader.fieldnames or [])]
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_no, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, e
+                continue
+            yield line_no, record if isinstance(record, dict) else ValueError("JSON 객체가 아닙니다.")
+
+
+def coerce_import_row(record, columns):
+    """한 행 -> columns 순서의 값 튜플. 빈 값은 None (= 기존 값 유지 / 신규는 기본값)"""
+    values = []
+    for col in columns:
+        v = record.get(col)
+        if isinstance(v, str):
+            v = v.strip()
+            if v == "":
+                v = None
+        if v is not None and col in IMPORT_INT_COLUMNS:
+            text = str(v).replace(",", "")
+            try:
+                # 정수 문자열은 float 를 거치지 않아야 큰 값도 그대로 유지됨
+                v = int(text) if text.lstrip("+-").isdigit() else int(float(text))
+            except (ValueError, OverflowError):  # "abc" / "nan" / "inf", "1e400"
+                raise ValueError(f"{col} 값이 숫자가 아닙니다: {v}")
+            if not IMPORT_INT_RANGE[0] <= v <= IMPORT_INT_RANGE[1]:
+                raise ValueError(f"{col} 값이 범위를 벗어났습니다: {v}")
+        elif v is not None and col in IMPORT_FLOAT_COLUMNS:
+            try:
+                v = float(str(v).replace(",", ""))
+            except ValueError:
+                raise ValueError(f"{col} 값이 숫자가 아닙니다: {v}")
+        elif v is not None:
+            v = str(v)
+        values.append(v)
+    if not values[0]:
+        raise ValueError("part_name이 비어 있습니다.")
+    return tuple(values)
+
+
+def upsert_sql(columns):
+    """
+    part_name 충돌 시 파일에 있는 컬럼만 갱신 (빈 값이면 기존 값 유지).
+    신규 행의 수량 기본값(0)이 갱신에 섞이지 않도록 UPDATE 쪽은 원래 파라미터(?N)를 직접 참조.
+    """
+    placeholders = ", ".join(
+        f"COALESCE(?{i}, 0)" if c in IMPORT_INT_COLUMNS else f"?{i}"
+        for i, c in enumerate(columns, start=1)
+    )
+    updates = ", ".join(
+        f"{c} = COALESCE(?{i}, parts.{c})"
+        for i, c in enumerate(columns, start=1) if c != "part_name"
+    )
+    return f"""
+        INSERT INTO parts ({", ".join(columns)}, update_date)
+        VALUES ({placeholders}, CURRENT_TIMESTAMP)
+        ON CONFLICT(part_name) DO UPDATE SET
+            {updates + ", " if updates else ""}update_date = CURRENT_TIMESTAMP
+    """
+
+
+def _stock_by_name(conn, names):
+    """part_name -> (id, quantity)"""
+    found = {}
+    for i in range(0, len(names), 500):
+        chunk = names[i:i + 500]
+        found.update((r[0], (r[1], r[2] or 0)) for r in conn.execute(
+            f"SELECT part_name, id, quantity FROM parts WHERE part_name IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ))
+    return found
+
+
+def apply_import_batch(conn, batch):
+    """
+    한 배치를 한 트랜잭션으로 upsert. batch: [(행 번호, upsert SQL, 값), ...]
+    (inserted, updated, 실패 행 목록) 반환.
+    같은 SQL(= 같은 컬럼 조합)이 이어지는 구간마다 executemany, 파일 순서대로 적용한다.
+    executemany 가 실패하면 SAVEPOINT 로 행 단위 재시도해 실패 행만 골라냄.
+    재고 전후 차이는 원장에 adjust 로 기록.
+    """
+    names = list({values[0] for _, _, values in batch})
+
+    failed, ok = [], []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # 쓰기 잠금을 잡은 뒤에 읽어야 다른 요청의 재고 변경이 전후 차이에 섞이지 않음
+        before = _stock_by_name(conn, names)
+        existing = set(before)
+        for sql, run in itertools.groupby(batch, key=lambda item: item[1]):
+            run = [(line_no, values) for line_no, _, values in run]
+            conn.execute("SAVEPOINT import_batch")
+            try:
+                conn.executemany(sql, [values for _, values in run])
+                conn.execute("RELEASE import_batch")
+                ok.extend(run)
+            except sqlite3.Error:
+                conn.execute("ROLLBACK TO import_batch")
+                conn.execute("RELEASE import_batch")
+                for line_no, values in run:
+                    try:
+                        conn.execute(sql, values)
+                        ok.append((line_no, values))
+                    except sqlite3.Error as e:
+                        failed.append({"row": line_no, "part_name": values[0], "error": str(e)})
+        if ok:
+            after = _stock_by_name(conn, list({values[0] for _, values in ok}))
+            ledger.record(conn, ledger.ADJUST, [
+                (pid, qty - before.get(name, (pid, 0))[1]) for name, (pid, qty) in after.items()
+            ], note="import")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
+    inserted = 0
+    for _, values in ok:
+        if values[0] not in existing:
+            existing.add(values[0])
+            inserted += 1
+    return inserted, len(ok) - inserted, failed
+
+
+@parts_bp.route("/api/parts/import", methods=["POST"])
+def import_parts():
+    """
+    부품 일괄 가져오기 (part_name 기준 upsert).
+    multipart 'file' (.csv / .jsonl) 또는 요청 본문 그대로, ?format=csv|jsonl 로 지정 가능.
+    IMPORT_BATCH 행씩 한 트랜잭션, 잘못된 행은 건너뛰고 errors 에 행 번호와 함께 보고.
+    갱신할 컬럼은 행마다 그 행에 있는 키 (JSONL 은 줄마다 다를 수 있음, 없는 키는 기존 값 유지).
+    가져오지 않는 키(id, create_date 등)는 ignored_columns 로 알려줌.
+    """
+    upload = request.files.get("file")
+    name = (upload.filename if upload else "") or ""
+    fmt = (request.args.get("format") or ("jsonl" if name.lower().endswith((".jsonl", ".ndjson")) else "csv")).lower()
+    if fmt not in ("csv", "jsonl"):
+        return jsonify({"error": "format은 csv 또는 jsonl 이어야 합니다."}), 400
+    stream = upload.stream if upload else request.stream
+
+    conn = get_db()
+    errors = []
+    result = {"inserted": 0, "updated": 0, "failed": 0}
+    header_checked = False
+    sql_by_columns = {}
+    ignored = set()
+    batch = []
+
+    def fail(row, part_name, error):
+        # 보고는 IMPORT_MAX_ERRORS 건까지만 보관 (개수는 전부 셈)
+        result["failed"] += 1
+        if len(errors) <= IMPORT_MAX_ERRORS:
+            errors.append({"row": row, "part_name": part_name, "error": error})
+
+    def flush():
+        inserted, updated, failed = apply_import_batch(conn, batch)
+        result["inserted"] += inserted
+        result["updated"] += updated
+        for f in failed:
+            fail(**f)
+        batch.clear()
+
+    try:
+        for line_no, record in import_records(stream, fmt):
+            if isinstance(record, Exception):
+                fail(line_no, None, str(record))
+                continue
+            if not header_checked:
+                # 첫 행(CSV 헤더)에 part_name 이 없으면 파일 형식 자체가 잘못된 것
+                if "part_name" not in record:
+                    return jsonify({"error": "part_name 컬럼이 필요합니다."}), 400
+                header_checked = True
+            columns = tuple(["part_name"] + [c for c in IMPORT_COLUMNS if c in record and c != "part_name"])
+            if columns not in sql_by_columns:
+                sql_by_columns[columns] = upsert_sql(columns)
+            ignored.update(k for k in record if k is not None and k not in IMPORT_COLUMNS)
+            try:
+                batch.append((line_no, sql_by_columns[columns], coerce_import_row(record, columns)))
+            except ValueError as e:
+                fail(line_no, record.get("part_name"), str(e))
+                continue
+            if len(batch) >= IMPORT_BATCH:
+                flush()
+        if batch:
+            flush()
+    except UnicodeDecodeError:
+        return jsonify({"error": "UTF-8 로 인코딩된 파일만 지원합니다.", **result}), 400
+    except csv.Error as e:
+        return jsonify({"error": f"CSV 형식 오류: {e}", **result}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        current_app.logger.exception("parts import failed")
+        return jsonify({"error": str(e), **result}), 500
+
+    result["errors"] = errors[:IMPORT_MAX_ERRORS]
+    result["errors_truncated"] = len(errors) > IMPORT_MAX_ERRORS
+    result["ignored_columns"] = sorted(ignored)
+    return jsonify(result), 200
 
 
 @parts_bp.route("/api/categories/large", methods=["GET"])
 def get_large_categories():
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -136,7 +525,7 @@ def get_large_categories():
 @parts_bp.route("/api/categories/medium", methods=["GET"])
 def get_medium_categories():
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -154,7 +543,7 @@ def get_medium_categories():
 @parts_bp.route("/api/categories/small", methods=["GET"])
 def get_small_categories():
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -169,6 +558,72 @@ def get_small_categories():
         return jsonify({"error": str(e)}), 500
 
 
+# 분류 트리 캐시: change_versions['category_tree'] 값이 같으면 재사용
+_category_tree_cache = {"version": None, "tree": None}
+_category_tree_lock = threading.Lock()
+
+
+def build_category_tree(conn):
+    """large -> medium -> small 계층 + 부품 수 / 재고 있는 부품 수 (GROUP BY 한 번)"""
+    rows = conn.execute(
+        """
+        SELECT category_large, category_medium, category_small,
+               COUNT(*) AS part_count,
+               SUM(CASE WHEN quantity > 0 THEN 1 ELSE 0 END) AS in_stock_count
+        FROM parts
+        GROUP BY category_large, category_medium, category_small
+        ORDER BY category_large, category_medium, category_small
+        """
+    ).fetchall()
+
+    tree, index = [], {}
+
+    def node(siblings, key, name):
+        if key not in index:
+            index[key] = {"name": name, "part_count": 0, "in_stock_count": 0, "children": []}
+            siblings.append(index[key])
+        n = index[key]
+        n["part_count"] += row["part_count"]
+        n["in_stock_count"] += row["in_stock_count"]
+        return n
+
+    for row in rows:
+        large = node(tree, (row[0],), row[0])
+        medium = node(large["children"], (row[0], row[1]), row[1])
+        small = node(medium["children"], (row[0], row[1], row[2]), row[2])
+        del small["children"]
+    return tree
+
+
+@parts_bp.route("/api/categories/tree", methods=["GET"])
+def get_category_tree():
+    """
+    분류 트리 (부품 수 / 재고 보유 부품 수 포함).
+    부품 분류나 수량이 바뀌면 트리거가 change_versions를 올려 캐시/ETag가 무효화된다.
+    """
+    try:
+        conn = get_db()
+        epoch, version = versions.current(conn, "epoch", "category_tree")
+        etag = versions.make_etag("cat", (epoch, version))
+
+        cached = versions.not_modified(etag)
+        if cached is not None:
+            return cached
+
+        with _category_tree_lock:
+            if _category_tree_cache["version"] != version:
+                _category_tree_cache["tree"] = build_category_tree(conn)
+                _category_tree_cache["version"] = version
+            tree = _category_tree_cache["tree"]
+
+        resp = jsonify(tree)
+        resp.set_etag(etag)
+        return resp
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @parts_bp.route("/api/parts", methods=["DELETE"])
 def delete_parts():
     data = request.get_json()
@@ -178,7 +633,7 @@ def delete_parts():
         return jsonify({"error": "삭제할 ID가 없습니다."}), 400
 
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
 
         # 삭제 불가 조건 체크 (재고 > 0 인 부품 확인)
@@ -196,16 +651,40 @@ def delete_parts():
                 "details": [{"id": row[0], "quantity": row[1]} for row in not_deletable]
             }), 400
 
-        # 이미지 파일 삭제
-        for part_id in ids:
-            pattern = os.path.join(IMAGE_DIR, f"part_{part_id}.*")
-            for file in glob.glob(pattern):
-                os.remove(file)
+        # BOM 에 쓰이는 부품 확인 (assembly_parts.part_id FK 는 CASCADE 가 없어 DELETE 가 실패함)
+        cursor.execute(
+            """
+            SELECT ap.part_id, a.id, a.assembly_name
+            FROM assembly_parts ap
+            JOIN assemblies a ON a.id = ap.assembly_id
+            WHERE ap.part_id IN ({seq})
+            ORDER BY ap.part_id, a.id
+            """.format(seq=",".join(["?"] * len(ids))),
+            ids
+        )
+        in_bom = cursor.fetchall()
+
+        if in_bom:
+            return jsonify({
+                "error": "BOM 에 사용 중인 부품은 삭제할 수 없습니다.",
+                "details": [
+                    {"id": row[0], "assembly_id": row[1], "assembly_name": row[2]}
+                    for row in in_bom
+                ]
+            }), 409
 
         # DB 삭제
-        cursor.executemany("DELETE FROM parts WHERE id = ?", [(i,) for i in ids])
-        conn.commit()
-        conn.close()
+        try:
+            cursor.executemany("DELETE FROM parts WHERE id = ?", [(i,) for i in ids])
+            conn.commit()
+        except sqlite3.IntegrityError as e:
+            # 확인 뒤 다른 요청이 참조를 추가한 경우
+            conn.rollback()
+            return jsonify({"error": f"다른 데이터가 참조 중인 부품은 삭제할 수 없습니다: {e}"}), 409
+
+        # 이미지 파일 삭제 (커밋이 성공한 뒤에만)
+        for part_id in ids:
+            images.remove_images("parts", part_id)
 
         return jsonify({"message": f"{len(ids)}개 부품 삭제됨"}), 200
 
@@ -215,28 +694,17 @@ def delete_parts():
 @parts_bp.route("/api/parts/<int:part_id>", methods=["GET"])
 def get_part_detail(part_id):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = get_db()
         cursor = conn.cursor()
 
         cursor.execute("SELECT * FROM parts WHERE id = ?", (part_id,))
         row = cursor.fetchone()
-        conn.close()
 
         if not row:
             return jsonify({"error": "해당 부품을 찾을 수 없습니다."}), 404
 
-        part_dict = dict(row)
-
         # 이미지 URL 생성 (image_filename이 있을 때만)
-        if part_dict.get("image_filename"):
-            part_dict["image_url"] = (
-                f"/static/images/parts/{part_dict['image_filename']}"
-            )
-        else:
-            part_dict["image_url"] = None
-
-        return jsonify(part_dict)
+        return jsonify(part_row_to_dict(row))
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -250,9 +718,10 @@ def update_part(part_id):
     data = request.get_json()
 
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
 
+        ledger.record_adjustments(conn, [(part_id, data.get("quantity") or 0)], note="edit")
         cursor.execute(
             """
             UPDATE parts SET
@@ -296,8 +765,8 @@ def update_part(part_id):
         )
 
         conn.commit()
-        conn.close()
 
+        realtime.notify_part_quantity(conn, part_id)
         return jsonify({"message": "부품 정보가 수정되었습니다."}), 200
 
     except Exception as e:
@@ -308,7 +777,7 @@ def update_part(part_id):
 def upload_part_image(part_id):
     """
     클라이언트에서 multipart/form-data로 'image' 필드를 보내면,
-    part_{id}.확장자 형태로 저장하고 DB에 image_filename 컬럼으로 기록
+    part_{id}.{내용 해시}.확장자 형태로 저장하고 DB에 image_filename 컬럼으로 기록
     """
     if "image" not in request.files:
         return jsonify({"error": "업로드할 이미지 파일이 없습니다."}), 400
@@ -322,25 +791,25 @@ def upload_part_image(part_id):
 
     # 확장자 추출
     ext = file.filename.rsplit(".", 1)[1].lower()
-    filename = f"part_{part_id}.{ext}"
-    save_path = os.path.join(IMAGE_DIR, filename)
 
     try:
-        # 기존 이미지 삭제
-        existing_images = glob.glob(os.path.join(IMAGE_DIR, f"part_{part_id}.*"))
-        for img in existing_images:
-            os.remove(img)
+        # 내용 해시 이름으로 저장 (기존 이미지 / 파생본은 삭제)
+        filename = images.save_upload("parts", part_id, file, ext)
 
-        file.save(save_path)
-
-        # DB에 파일명 기록
-        conn = sqlite3.connect(DB_PATH)
+        # DB에 파일명 기록 (파생본은 작업 프로세스가 만든 뒤 채움)
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute(
-            "UPDATE parts SET image_filename = ? WHERE id = ?", (filename, part_id)
+            """
+            UPDATE parts
+            SET image_filename = ?, image_thumb = NULL, image_detail = NULL, image_webp = NULL
+            WHERE id = ?
+            """,
+            (filename, part_id),
         )
         conn.commit()
-        conn.close()
+
+        images.schedule("parts", part_id, filename)
 
         image_url = f"/static/images/parts/{filename}"
         return jsonify({"image_url": image_url}), 200
@@ -352,8 +821,7 @@ def upload_part_image(part_id):
 @order_bp.route("/api/parts/<int:part_id>/orders", methods=["GET"])
 def get_orders_by_part(part_id):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = get_db()
         cur = conn.cursor()
 
         cur.execute(
@@ -374,43 +842,117 @@ def get_orders_by_part(part_id):
         return jsonify({"error": str(e)}), 500
 
 
+ORDER_BATCH_MAX = 1000
+
+# (part_id, order_date) 유니크 인덱스 기준: 같은 날 같은 부품 주문은 수량을 더함
+ORDER_UPSERT_SQL = """
+    INSERT INTO part_orders (part_id, order_date, quantity_ordered)
+    VALUES (?, ?, ?)
+    ON CONFLICT(part_id, order_date) DO UPDATE SET
+        quantity_ordered = quantity_ordered + excluded.quantity_ordered
+"""
+
+
+def parse_order_line(item):
+    """주문 한 줄 -> (part_id, order_date, quantity_ordered). 잘못되면 ValueError"""
+    if not isinstance(item, dict):
+        raise ValueError("각 줄은 객체여야 합니다.")
+    part_id, order_date, qty = item.get("part_id"), item.get("order_date"), item.get("quantity_ordered")
+    if isinstance(part_id, bool) or not isinstance(part_id, int):
+        raise ValueError("part_id는 정수여야 합니다.")
+    if not isinstance(order_date, str) or not order_date.strip():
+        raise ValueError("order_date가 필요합니다.")
+    if isinstance(qty, bool) or not isinstance(qty, int) or qty <= 0:
+        raise ValueError("quantity_ordered는 양의 정수여야 합니다.")
+    return part_id, order_date.strip(), qty
+
+
 @order_bp.route("/api/part_orders", methods=["POST"])
 def create_or_merge_order():
-    data = request.get_json()
-    print("[POST] /api/part_orders - 받은 데이터:", data)
-    part_id = data["part_id"]
-    order_date = data["order_date"]
-    qty = data["quantity_ordered"]
+    """
+    발주 등록. 본문은 주문 한 건 또는 배열 [{part_id, order_date, quantity_ordered}, ...].
+    유효한 줄은 한 트랜잭션에서 (part_id, order_date) upsert (같은 날 주문은 수량 합산).
+    results: 줄 순서대로 {line, ok, order_id, merged, quantity_ordered(합산 후)} 또는 {line, ok: false, error}
+    """
+    data = request.get_json(silent=True)
+    single = isinstance(data, dict)
+    items = [data] if single else data
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "주문 객체 또는 비어 있지 않은 배열이 필요합니다."}), 400
+    if len(items) > ORDER_BATCH_MAX:
+        return jsonify({"error": f"한 번에 최대 {ORDER_BATCH_MAX}줄까지 등록할 수 있습니다."}), 400
+
+    results, lines = [], []
+    for i, item in enumerate(items):
+        try:
+            lines.append((i, parse_order_line(item)))
+            results.append(None)
+        except ValueError as e:
+            results.append({"line": i, "ok": False, "error": str(e)})
 
     conn = get_db()
-    cur = conn.cursor()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+
+        part_ids = list({pid for _, (pid, _, _) in lines})
+        known = set()
+        for j in range(0, len(part_ids), 500):
+            chunk = part_ids[j:j + 500]
+            known.update(r[0] for r in conn.execute(
+                f"SELECT id FROM parts WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        for i, (pid, _, _) in lines:
+            if pid not in known:
+                results[i] = {"line": i, "ok": False, "error": "해당 부품이 없습니다."}
+        lines = [(i, line) for i, line in lines if line[0] in known]
+
+        # 합산 여부 판단용: 이 배치 이전에 이미 있던 (part_id, order_date)
+        keys = list({(pid, day) for _, (pid, day, _) in lines})
+        before = set()
+        for j in range(0, len(keys), 250):
+            chunk = keys[j:j + 250]
+            before.update(tuple(r) for r in conn.execute(
+                f"""
+                SELECT part_id, order_date FROM part_orders
+                WHERE (part_id, order_date) IN (VALUES {','.join(['(?, ?)'] * len(chunk))})
+                """,
+                [v for key in chunk for v in key],
+            ))
+
+        conn.executemany(ORDER_UPSERT_SQL, [line for _, line in lines])
+
+        after = {}
+        for j in range(0, len(keys), 250):
+            chunk = keys[j:j + 250]
+            after.update(((r[0], r[1]), (r[2], r[3])) for r in conn.execute(
+                f"""
+                SELECT part_id, order_date, id, quantity_ordered FROM part_orders
+                WHERE (part_id, order_date) IN (VALUES {','.join(['(?, ?)'] * len(chunk))})
+                """,
+                [v for key in chunk for v in key],
+            ))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return jsonify({"error": str(e)}), 500
 
-    cur.execute(
-        """
-        SELECT id, quantity_ordered FROM part_orders
-        WHERE part_id = ? AND order_date = ?
-    """,
-        (part_id, order_date),
-    )
-    existing = cur.fetchone()
+    seen = set(before)
+    for i, (pid, day, qty) in lines:
+        order_id, total = after[(pid, day)]
+        results[i] = {
+            "line": i, "ok": True, "order_id": order_id, "part_id": pid, "order_date": day,
+            "added": qty, "quantity_ordered": total, "merged": (pid, day) in seen,
+        }
+        seen.add((pid, day))
 
-    if existing:
-        new_qty = existing["quantity_ordered"] + qty
-        cur.execute(
-            "UPDATE part_orders SET quantity_ordered = ? WHERE id = ?",
-            (new_qty, existing["id"]),
-        )
-    else:
-        cur.execute(
-            """
-            INSERT INTO part_orders (part_id, order_date, quantity_ordered)
-            VALUES (?, ?, ?)
-        """,
-            (part_id, order_date, qty),
-        )
+    if single:
+        result = results[0]
+        if not result["ok"]:
+            return jsonify({"error": result["error"]}), 400
+        return jsonify({"success": True, **result}), 200
 
-    conn.commit()
-    return jsonify({"success": True})
+    applied = sum(1 for r in results if r["ok"])
+    return jsonify({"applied": applied, "failed": len(results) - applied, "results": results}), 200
 
 
 @order_bp.route("/api/part_orders/<int:order_id>/fulfill", methods=["PATCH"])
@@ -447,14 +989,156 @@ def fulfill_part_order(order_id):
         )
 
         cur.execute("DELETE FROM part_orders WHERE id = ?", (order_id,))
+        ledger.record(conn, ledger.RECEIVE, [(part_id, qty)], order_id=order_id)
 
         conn.commit()
+
+        realtime.notify_order_fulfilled(order_id, part_id, qty)
+        realtime.notify_part_quantity(conn, part_id)
         return jsonify({"message": "배송 완료 처리 및 재고 반영 완료"}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+RECEIVE_BATCH_MAX = 1000
+
+
+@order_bp.route("/api/part_orders/receive", methods=["POST"])
+def receive_part_orders():
+    """
+    일괄 / 부분 입고 (한 트랜잭션).
+    body: [{order_id, received_qty?}, ...]  (received_qty 생략 시 남은 수량 전부, 같은 주문이 여러 줄이면 합산)
+    - 재고 증가 / 주문 차감은 입고 계획 임시 테이블 기준 UPDATE ... FROM 한 번씩
+    - 남은 수량이 있으면 주문은 그 수량으로 열어 두고, 0이 되면 삭제
+    - 주문이 없거나 남은 수량보다 많이 받은 줄은 건너뛰고 results 에 오류로 보고
+    응답: results(줄별), orders(주문별 입고 / 남은 수량), parts(갱신된 재고)
+    """
+    items = request.get_json(silent=True)
+    if isinstance(items, dict):
+        items = items.get("lines")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "[{order_id, received_qty}, ...] 배열이 필요합니다."}), 400
+    if len(items) > RECEIVE_BATCH_MAX:
+        return jsonify({"error": f"한 번에 최대 {RECEIVE_BATCH_MAX}줄까지 입고할 수 있습니다."}), 400
+
+    results = [None] * len(items)
+    lines = []  # (줄 번호, order_id, 수량 또는 None)
+    for i, item in enumerate(items):
+        order_id = item.get("order_id") if isinstance(item, dict) else None
+        qty = item.get("received_qty") if isinstance(item, dict) else None
+        if isinstance(order_id, bool) or not isinstance(order_id, int):
+            results[i] = {"line": i, "ok": False, "error": "order_id는 정수여야 합니다."}
+        elif qty is not None and (isinstance(qty, bool) or not isinstance(qty, int) or qty <= 0):
+            results[i] = {"line": i, "ok": False, "error": "received_qty는 양의 정수여야 합니다."}
+        else:
+            lines.append((i, order_id, qty))
+
+    conn = get_db()
+    cur = conn.cursor()
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+
+        order_ids = list({order_id for _, order_id, _ in lines})
+        open_orders = {}
+        for j in range(0, len(order_ids), 500):
+            chunk = order_ids[j:j + 500]
+            open_orders.update((r[0], (r[1], r[2])) for r in cur.execute(
+                f"SELECT id, part_id, quantity_ordered FROM part_orders WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ))
+
+        # 주문별 입고 합 (수량 생략 = 남은 수량 전부)
+        wanted = {}
+        for _, order_id, qty in lines:
+            if order_id in open_orders:
+                wanted[order_id] = wanted.get(order_id, 0) + (qty or open_orders[order_id][1])
+        plan = []
+        for i, order_id, qty in lines:
+            if order_id not in open_orders:
+                results[i] = {"line": i, "ok": False, "error": "해당 주문을 찾을 수 없습니다."}
+            elif wanted[order_id] > open_orders[order_id][1]:
+                results[i] = {
+                    "line": i, "ok": False, "order_id": order_id,
+                    "error": f"남은 주문 수량({open_orders[order_id][1]})보다 많이 입고할 수 없습니다.",
+                }
+        for order_id, total in wanted.items():
+            if total <= open_orders[order_id][1]:
+                plan.append((order_id, open_orders[order_id][0], total))
+
+        cur.execute("""
+            CREATE TEMP TABLE receipt_plan (
+                order_id INTEGER PRIMARY KEY,
+                part_id  INTEGER NOT NULL,
+                received INTEGER NOT NULL
+            )
+        """)
+        cur.executemany("INSERT INTO temp.receipt_plan VALUES (?, ?, ?)", plan)
+        cur.execute(
+            """
+            UPDATE parts
+            SET quantity = COALESCE(quantity, 0) + t.received
+            FROM (SELECT part_id, SUM(received) AS received
+                  FROM temp.receipt_plan GROUP BY part_id) AS t
+            WHERE parts.id = t.part_id
+            """
+        )
+        cur.execute(
+            """
+            UPDATE part_orders
+            SET quantity_ordered = quantity_ordered - plan.received
+            FROM temp.receipt_plan AS plan
+            WHERE part_orders.id = plan.order_id
+            """
+        )
+        cur.execute(
+            """
+            DELETE FROM part_orders
+            WHERE id IN (SELECT order_id FROM temp.receipt_plan) AND quantity_ordered <= 0
+            """
+        )
+        ledger.record_receipts(conn, plan)
+        cur.execute("DROP TABLE temp.receipt_plan")
+
+        part_ids = list({part_id for _, part_id, _ in plan})
+        stock = []
+        for j in range(0, len(part_ids), 500):
+            chunk = part_ids[j:j + 500]
+            stock.extend(dict(r) for r in cur.execute(
+                f"SELECT id, part_name, quantity FROM parts WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    orders = []
+    for order_id, part_id, received in plan:
+        remaining = open_orders[order_id][1] - received
+        orders.append({
+            "order_id": order_id, "part_id": part_id, "received": received,
+            "remaining": remaining, "closed": remaining == 0,
+        })
+    by_order = {o["order_id"]: o for o in orders}
+    for i, order_id, qty in lines:
+        if results[i] is None:
+            results[i] = {"line": i, "ok": True, **by_order[order_id]}
+
+    for o in orders:
+        realtime.notify_order_fulfilled(o["order_id"], o["part_id"], o["received"], o["remaining"])
+    realtime.notify_part_quantity(conn, *[p["id"] for p in stock])
+
+    received_lines = sum(1 for r in results if r["ok"])
+    return jsonify({
+        "received_lines": received_lines,
+        "failed_lines": len(results) - received_lines,
+        "results": results,
+        "orders": orders,
+        "parts": sorted(stock, key=lambda p: p["id"]),
+    }), 200
+
+
 @parts_bp.route(
     "/api/assemblies/<int:assembly_id>/bom/<int:part_id>/allocate", methods=["PUT"]
 )
@@ -513,11 +1197,125 @@ def allocate_part(assembly_id, part_id):
     """,
         (amount, part_id),
     )
+    ledger.record(conn, ledger.ALLOCATE, [(part_id, -amount)], assembly_id=assembly_id)
     recalculate_assembly_status(conn, assembly_id)
     conn.commit()
+
+    realtime.notify_part_quantity(conn, part_id)
+    realtime.notify_allocation(conn, assembly_id, part_id)
+    realtime.notify_assembly_status(conn, assembly_id)
     return jsonify({"success": True}), 200
 
 
+@parts_bp.route("/api/assemblies/<int:assembly_id>/allocate-all", methods=["POST"])
+def allocate_all_parts(assembly_id):
+    """
+    BOM 전체 일괄 할당 (한 트랜잭션).
+    body: { fraction?: 0~1 (기본 1) }  -> 목표 = quantity_per * floor(quantity_to_build * fraction)
+    각 행은 (목표 - 현재 할당) 만큼, 재고 한도 내에서 할당하고 행별 결과를 돌려준다.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        fraction = float(data.get("fraction", 1))
+    except (TypeError, ValueError):
+        return jsonify({"error": "fraction은 숫자여야 합니다."}), 400
+    if not 0 < fraction <= 1:
+        return jsonify({"error": "fraction은 0보다 크고 1 이하여야 합니다."}), 400
+
+    conn = get_db()
+    cur = conn.cursor()
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+
+        assembly = cur.execute(
+            "SELECT quantity_to_build FROM assemblies WHERE id = ?", (assembly_id,)
+        ).fetchone()
+        if not assembly:
+            conn.rollback()
+            return jsonify({"error": "해당 어셈블리가 없습니다."}), 404
+        units = int((assembly["quantity_to_build"] or 0) * fraction)
+
+        # 행별 할당 계획 (재고 차감 전 값 기준)
+        cur.execute(
+            """
+            CREATE TEMP TABLE alloc_plan AS
+            SELECT part_id, part_name, quantity_per, allocated_before, stock_before, target,
+                   MIN(want, stock_before) AS give,
+                   want
+            FROM (
+                SELECT ap.part_id,
+                       p.part_name,
+                       ap.quantity_per,
+                       COALESCE(ap.allocated_quantity, 0) AS allocated_before,
+                       MAX(COALESCE(p.quantity, 0), 0) AS stock_before,
+                       ap.quantity_per * ? AS target,
+                       MAX(ap.quantity_per * ? - COALESCE(ap.allocated_quantity, 0), 0) AS want
+                FROM assembly_parts ap
+                JOIN parts p ON p.id = ap.part_id
+                WHERE ap.assembly_id = ?
+            )
+            """,
+            (units, units, assembly_id),
+        )
+        cur.execute(
+            """
+            UPDATE assembly_parts
+            SET allocated_quantity = COALESCE(allocated_quantity, 0) + plan.give
+            FROM temp.alloc_plan AS plan
+            WHERE assembly_parts.assembly_id = ?
+              AND assembly_parts.part_id = plan.part_id
+              AND plan.give > 0
+            """,
+            (assembly_id,),
+        )
+        cur.execute(
+            """
+            UPDATE parts
+            SET quantity = quantity - plan.give
+            FROM temp.alloc_plan AS plan
+            WHERE parts.id = plan.part_id
+              AND plan.give > 0
+            """
+        )
+        ledger.record_query(
+            conn, ledger.ALLOCATE,
+            "SELECT part_id, -give AS quantity FROM temp.alloc_plan WHERE give > 0",
+            assembly_id=assembly_id,
+        )
+        lines = cur.execute(
+            """
+            SELECT part_id, part_name, quantity_per, target AS required,
+                   allocated_before, give AS allocated, allocated_before + give AS allocated_total,
+                   stock_before, stock_before - give AS stock_after,
+                   want - give AS shortage
+            FROM temp.alloc_plan
+            ORDER BY shortage DESC, part_name
+            """
+        ).fetchall()
+        cur.execute("DROP TABLE temp.alloc_plan")
+
+        # 상태 갱신 + 커밋
+        recalculate_assembly_status(conn, assembly_id)
+    except Exception as e:
+        conn.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    lines = [dict(r) for r in lines]
+    changed = [l["part_id"] for l in lines if l["allocated"] > 0]
+    realtime.notify_part_quantity(conn, *changed)
+    for pid in changed:
+        realtime.notify_allocation(conn, assembly_id, pid)
+    realtime.notify_assembly_status(conn, assembly_id)
+
+    return jsonify({
+        "assembly_id": assembly_id,
+        "units": units,
+        "lines": lines,
+        "allocated_total": sum(l["allocated"] for l in lines),
+        "short_lines": sum(1 for l in lines if l["shortage"] > 0),
+    }), 200
+
+
 @parts_bp.route(
     "/api/assemblies/<int:assembly_id>/bom/<int:part_id>/deallocate", methods=["PUT"]
 )
@@ -567,43 +1365,18 @@ def deallocate_part(assembly_id, part_id):
     """,
         (amount, part_id),
     )
+    ledger.record(conn, ledger.DEALLOCATE, [(part_id, amount)], assembly_id=assembly_id)
     recalculate_assembly_status(conn, assembly_id)
     conn.commit()
-    return jsonify({"success": True}), 200
 
+    realtime.notify_part_quantity(conn, part_id)
+    realtime.notify_allocation(conn, assembly_id, part_id)
+    realtime.notify_assembly_status(conn, assembly_id)
+    return jsonify({"success": True}), 200
 
-def recalculate_assembly_status(conn, assembly_id):
-    row = conn.execute(
-        """
-        SELECT a.quantity_to_build, 
-               SUM(ap.quantity_per) as total_needed, 
-               SUM(ap.allocated_quantity) as total_allocated
-        FROM assemblies a
-        JOIN assembly_parts ap ON a.id = ap.assembly_id
-        WHERE a.id = ?
-        GROUP BY a.id
-    """,
-        (assembly_id,),
-    ).fetchone()
-
-    if not row:
-        return
-
-    total_required = row["quantity_to_build"] * row["total_needed"]
-    allocated = row["total_allocated"] or 0
-    percent = 0 if total_required == 0 else (allocated / total_required)
-
-    if percent == 1:
-        status = "Completed"
-    elif percent > 0:
-        status = "In Progress"
-    else:
-        status = "Planned"
-
-    conn.execute("UPDATE assemblies SET status = ? WHERE id = ?", (status, assembly_id))
-    conn.commit()
 
 @parts_bp.route("/api/part_orders/recent", methods=["GET"])
+@versions.conditional("orders-recent", "part_orders", "parts")
 def get_recent_part_orders():
     try:
         db = get_db()
@@ -654,6 +1427,8 @@ def update_part_full(part_id):
         print("[DEBUG][parts FULL] SQL:", f"UPDATE parts SET {sets} WHERE id=?")
         print("[DEBUG][parts FULL] VAL:", values)
 
+        if "quantity" in data:
+            ledger.record_adjustments(db, [(part_id, data["quantity"] or 0)], note="edit")
         cur.execute(f"UPDATE parts SET {sets} WHERE id=?", values)
         db.commit()
         print("[DEBUG][parts FULL] rowcount:", cur.rowcount)
@@ -662,6 +1437,9 @@ def update_part_full(part_id):
         if not row:
             return jsonify({"error":"Part not found"}), 404
 
+        if "quantity" in data:
+            realtime.notify_part_quantity(db, part_id)
+
         return jsonify(dict(row)), 200
     except Exception as e:
         import traceback; traceback.print_exc()
@@ -5,21 +5,11 @@ import traceback
 
 projects_bp = Blueprint('projects', __name__)
 
-# ====== DB 연결 유틸 ======
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, '..', 'inventory.db')  
-
-def get_db():
-    if 'db' not in g:
-        g.db = sqlite3.connect(DB_PATH, check_same_thread=False)
-        g.db.row_factory = sqlite3.Row
-    return g.db
-
-@projects_bp.teardown_app_request
-def close_db(exception):
-    db = g.pop('db', None)
-    if db is not None:
-        db.close()
+# ====== DB 연결 유틸 (연결 풀 / teardown은 db.py) ======
+from db import get_db
+import versions
+import streaming
+import mrp
 
 # ====== 공통 헬퍼 ======
 def rowdicts(rows):
@@ -27,6 +17,7 @@ def rowdicts(rows):
 
 # ------------------ 프로젝트 ------------------
 @projects_bp.route('/api/projects', methods=['GET'])
+@versions.conditional('projects', 'projects')
 def get_projects():
     try:
         db = get_db()
@@ -88,19 +79,15 @@ def delete_project(project_id):
         return jsonify({'error': '프로젝트 삭제 중 오류 발생'}), 500
 
 @projects_bp.route('/api/assemblies', methods=['GET'])
+@versions.conditional('assemblies-simple', 'assemblies')
+@streaming.json_stream
 def list_assemblies_simple():
     """프론트 검색 모달용(이름/설명 정도만)."""
-    try:
-        db = get_db()
-        rows = db.execute("""
-            SELECT id, assembly_name, COALESCE(description, '') AS description
-            FROM assemblies
-            ORDER BY id DESC
-        """).fetchall()
-        return jsonify(rowdicts(rows)), 200
-    except Exception:
-        traceback.print_exc()
-        return jsonify({'error': 'Failed to fetch assemblies'}), 500
+    return streaming.Rows("""
+        SELECT id, assembly_name, COALESCE(description, '') AS description
+        FROM assemblies
+        ORDER BY id DESC
+    """)
 
 @projects_bp.route('/api/projects/<int:project_id>/assemblies/create', methods=['POST'])
 def create_assembly_and_add_to_project(project_id):
@@ -213,91 +200,83 @@ def remove_assembly_from_project(project_id, assembly_id):
 
 # ------------------ 요약 & 부품 ------------------
 @projects_bp.route('/api/projects/<int:project_id>/summary', methods=['GET'])
+@versions.conditional('project-summary', 'projects', 'assemblies', 'project_assemblies', 'assembly_parts', 'parts', 'part_orders')
+@streaming.json_stream
 def get_project_summary(project_id):
     """
     assemblies: id, assembly_name, quantity_to_build, status
     orders: 프로젝트 관련 부품 주문
     materials: 프로젝트 전체 관점의 자재 소요/재고/할당
+    (세 배열 모두 fetchmany 로 스트리밍)
     """
-    try:
-        db = get_db()
-
-        assemblies = db.execute('''
-            SELECT a.id, a.assembly_name, a.quantity_to_build, a.status
-            FROM assemblies a
-            JOIN project_assemblies pa ON a.id = pa.assembly_id
-            WHERE pa.project_id = ?
-            ORDER BY a.id DESC
-        ''', (project_id,)).fetchall()
-
-        # 이 프로젝트의 어셈블리에 속한 부품들만의 주문
-        orders = db.execute('''
-            SELECT po.*, p.part_name
-              FROM part_orders po
-              JOIN parts p ON po.part_id = p.id
-             WHERE EXISTS (
-                SELECT 1
-                  FROM assembly_parts ap
-                  JOIN project_assemblies pa ON ap.assembly_id = pa.assembly_id
-                 WHERE pa.project_id = ?
-                   AND ap.part_id = po.part_id
-             )
-             ORDER BY po.id DESC
-        ''', (project_id,)).fetchall()
-
-        materials = db.execute('''
-            SELECT 
-              p.id AS part_id,
-              p.part_name,
-              SUM(ap.quantity_per * a.quantity_to_build) AS total_required,
-              p.quantity AS current_stock,
-              COALESCE(SUM(ap.allocated_quantity), 0) AS allocated_quantity
-            FROM parts p
-            JOIN assembly_parts ap ON p.id = ap.part_id
-            JOIN assemblies a ON ap.assembly_id = a.id
-            JOIN project_assemblies pa ON a.id = pa.assembly_id
-            WHERE pa.project_id = ?
-            GROUP BY p.id, p.part_name, p.quantity
-            ORDER BY p.id DESC
-        ''', (project_id,)).fetchall()
-
-        return jsonify({
-            'assemblies': rowdicts(assemblies),
-            'orders': rowdicts(orders),
-            'materials': rowdicts(materials),
-        }), 200
-    except Exception:
-        traceback.print_exc()
-        return jsonify({'error': 'Failed to fetch project summary'}), 500
+    assemblies = streaming.Rows('''
+        SELECT a.id, a.assembly_name, a.quantity_to_build, a.status
+        FROM assemblies a
+        JOIN project_assemblies pa ON a.id = pa.assembly_id
+        WHERE pa.project_id = ?
+        ORDER BY a.id DESC
+    ''', (project_id,))
+
+    # 이 프로젝트의 어셈블리에 속한 부품들만의 주문
+    orders = streaming.Rows('''
+        SELECT po.*, p.part_name
+          FROM part_orders po
+          JOIN parts p ON po.part_id = p.id
+         WHERE EXISTS (
+            SELECT 1
+              FROM assembly_parts ap
+              JOIN project_assemblies pa ON ap.assembly_id = pa.assembly_id
+             WHERE pa.project_id = ?
+               AND ap.part_id = po.part_id
+         )
+         ORDER BY po.id DESC
+    ''', (project_id,))
+
+    materials = streaming.Rows('''
+        SELECT 
+          p.id AS part_id,
+          p.part_name,
+          SUM(ap.quantity_per * a.quantity_to_build) AS total_required,
+          p.quantity AS current_stock,
+          COALESCE(SUM(ap.allocated_quantity), 0) AS allocated_quantity
+        FROM parts p
+        JOIN assembly_parts ap ON p.id = ap.part_id
+        JOIN assemblies a ON ap.assembly_id = a.id
+        JOIN project_assemblies pa ON a.id = pa.assembly_id
+        WHERE pa.project_id = ?
+        GROUP BY p.id, p.part_name, p.quantity
+        ORDER BY p.id DESC
+    ''', (project_id,))
+
+    # 키 순서는 jsonify(sort_keys) 결과와 동일하게
+    return {
+        'assemblies': assemblies,
+        'materials': materials,
+        'orders': orders,
+    }
 
 @projects_bp.route('/api/projects/<int:project_id>/parts', methods=['GET'])
+@streaming.json_stream
 def get_all_project_parts(project_id):
-    """프로젝트에 포함된 모든 어셈블리의 부품 상세 목록."""
-    try:
-        db = get_db()
-        rows = db.execute('''
-            SELECT
-              ap.part_id,
-              p.part_name,
-              ap.reference,
-              ap.quantity_per,
-              p.quantity AS stock_quantity,
-              ap.allocated_quantity,
-              a.id AS assembly_id,
-              a.assembly_name,
-              a.quantity_to_build
-            FROM project_assemblies pa
-            JOIN assemblies a       ON pa.assembly_id = a.id
-            JOIN assembly_parts ap  ON a.id = ap.assembly_id
-            JOIN parts p            ON ap.part_id = p.id
-            WHERE pa.project_id = ?
-            ORDER BY a.id DESC, p.id DESC
-        ''', (project_id,)).fetchall()
-
-        return jsonify(rowdicts(rows)), 200
-    except Exception:
-        traceback.print_exc()
-        return jsonify({'error': 'Failed to fetch parts for project'}), 500
+    """프로젝트에 포함된 모든 어셈블리의 부품 상세 목록 (fetchmany 로 스트리밍)."""
+    return streaming.Rows('''
+        SELECT
+          ap.part_id,
+          p.part_name,
+          ap.reference,
+          ap.quantity_per,
+          p.quantity AS stock_quantity,
+          ap.allocated_quantity,
+          a.id AS assembly_id,
+          a.assembly_name,
+          a.quantity_to_build
+        FROM project_assemblies pa
+        JOIN assemblies a       ON pa.assembly_id = a.id
+        JOIN assembly_parts ap  ON a.id = ap.assembly_id
+        JOIN parts p            ON ap.part_id = p.id
+        WHERE pa.project_id = ?
+        ORDER BY a.id DESC, p.id DESC
+    ''', (project_id,))
 
 @projects_bp.route('/api/assemblies/<int:assembly_id>/update', methods=['PUT'])
 def update_assembly(assembly_id):
@@ -408,13 +387,38 @@ def update_project_full(project_id):
     
 # ------------------ 대시보드 전용 API ------------------
 
+@projects_bp.route('/api/mrp', methods=['GET'])
+@versions.conditional(
+    'mrp', 'parts', 'part_orders', 'assemblies', 'assembly_parts',
+    'projects', 'project_assemblies', 'alias_links',
+)
+def get_mrp():
+    """
+    전 프로젝트 자재 소요 계획.
+    - 재고 + 미입고 주문 + 호환 그룹 재고를 고려한 부품별 순부족(net_shortage)
+    - drivers: 그 부품 수요를 만드는 프로젝트별 잔여 소요
+    ?all=1 이면 부족이 없어도 수요가 있는 부품 전부, ?limit=N (기본 500, 0이면 전부)
+    """
+    try:
+        include_all = request.args.get('all') in ('1', 'true')
+        limit = int(request.args.get('limit', 500))
+    except ValueError:
+        return jsonify({'error': 'limit은 정수여야 합니다.'}), 400
+    try:
+        report = mrp.mrp_report(get_db(), include_all=include_all, limit=max(limit, 0))
+        return jsonify(report), 200
+    except Exception:
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to compute MRP'}), 500
+
 @projects_bp.route('/api/assemblies/low_stock', methods=['GET'])
+@versions.conditional('low-stock', 'assemblies', 'assembly_parts')
 def get_low_stock_assemblies():
     """
     '재고 부족 pcb' 카드용.
-    아이디어: 어셈블리별 필요 총량 대비 현재 재고(또는 할당) 수준으로 부족도를 계산.
-    - allocation_percent: (할당량 / 필요총량)*100 으로 가정.
-      필요총량 = SUM(ap.quantity_per * a.quantity_to_build)
+    어셈블리별 필요 총량 대비 할당 수준(assembly_rollups, 트리거로 유지)으로 부족도를 계산.
+    - allocation_percent: (할당량 / 필요총량)*100
+      필요총량 = SUM(ap.quantity_per) * a.quantity_to_build
       할당량   = SUM(ap.allocated_quantity)
     """
     try:
@@ -425,22 +429,14 @@ def get_low_stock_assemblies():
               a.assembly_name,
               a.quantity_to_build,
               a.status,
-              -- 필요 총량
-              SUM(ap.quantity_per * a.quantity_to_build) AS total_required,
-              -- 현재 할당량(없으면 0)
-              COALESCE(SUM(ap.allocated_quantity), 0)    AS allocated_quantity,
-              -- % 계산(0으로 나눔 방지)
-              CASE 
-                WHEN SUM(ap.quantity_per * a.quantity_to_build) > 0 
-                THEN 100.0 * COALESCE(SUM(ap.allocated_quantity), 0) 
-                          / SUM(ap.quantity_per * a.quantity_to_build)
-                ELSE 0
-              END AS allocation_percent
-            FROM assemblies a
-            JOIN assembly_parts ap ON a.id = ap.assembly_id
-            GROUP BY a.id, a.assembly_name, a.quantity_to_build, a.status
-            HAVING allocation_percent < 100.0
-            ORDER BY allocation_percent ASC, a.id DESC
+              r.total_required,
+              r.total_allocated AS allocated_quantity,
+              r.allocation_percent
+            FROM assembly_rollups r
+            JOIN assemblies a ON a.id = r.assembly_id
+            WHERE r.total_lines > 0
+              AND r.allocation_percent < 100.0
+            ORDER BY r.allocation_percent ASC, a.id DESC
         """).fetchall()
 
         return jsonify([dict(r) for r in rows]), 200
@@ -449,6 +445,7 @@ def get_low_stock_assemblies():
         return jsonify({'error': 'Failed to fetch low stock assemblies'}), 500
     
 @projects_bp.route('/api/part_orders/recent', methods=['GET'])
+@versions.conditional('orders-recent', 'part_orders', 'parts')
 def get_recent_part_orders():
     try:
         db = get_db()
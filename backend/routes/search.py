@@ -0,0 +1,160 @@
+# backend/routes/search.py
+from flask import Blueprint, request, jsonify
+import sqlite3
+import traceback
+
+import metrics
+from db import get_db
+
+search_bp = Blueprint('search', __name__)
+
+# ─────────────────────────────────────────────────────────────
+# FTS5 인덱스 (rowid == parts.id)
+#   part_name, description, manufacturer, package, memo + 소속 호환 그룹 이름
+#   parts / aliases / alias_links 트리거로 동기화
+# ─────────────────────────────────────────────────────────────
+FTS_COLUMNS = ('part_name', 'description', 'manufacturer', 'package', 'memo', 'alias_names')
+
+# bm25 컬럼 가중치 (FTS_COLUMNS 순서)
+BM25_WEIGHTS = (10.0, 2.0, 3.0, 3.0, 1.0, 6.0)
+
+# 접두어 인덱스 길이. 이보다 짧은 토큰("r", "10")은 접두어 확장 없이 완전 일치로 검색
+# (한두 글자 접두어는 부품 대부분과 일치해 모든 일치에 bm25 를 계산하는 비용만 커짐)
+PREFIX_LENGTHS = (3, 4)
+MIN_PREFIX_LEN = PREFIX_LENGTHS[0]
+
+ALIAS_NAMES_OF = """(
+    SELECT group_concat(a.alias_name, ' ')
+    FROM alias_links al JOIN aliases a ON a.id = al.alias_id
+    WHERE al.part_id = {pid}
+)"""
+
+SEARCH_DDL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS parts_fts USING fts5(
+    part_name, description, manufacturer, package, memo, alias_names,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '{' '.join(map(str, PREFIX_LENGTHS))}'
+);
+
+CREATE TRIGGER IF NOT EXISTS parts_fts_ai AFTER INSERT ON parts BEGIN
+    INSERT INTO parts_fts(rowid, part_name, description, manufacturer, package, memo, alias_names)
+    VALUES (new.id, new.part_name, new.description, new.manufacturer, new.package, new.memo,
+            {ALIAS_NAMES_OF.format(pid='new.id')});
+END;
+
+CREATE TRIGGER IF NOT EXISTS parts_fts_au
+AFTER UPDATE OF part_name, description, manufacturer, package, memo ON parts BEGIN
+    UPDATE parts_fts
+       SET part_name = new.part_name, description = new.description,
+           manufacturer = new.manufacturer, package = new.package, memo = new.memo
+     WHERE rowid = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS parts_fts_ad AFTER DELETE ON parts BEGIN
+    DELETE FROM parts_fts WHERE rowid = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS alias_links_fts_ai AFTER INSERT ON alias_links BEGIN
+    UPDATE parts_fts SET alias_names = {ALIAS_NAMES_OF.format(pid='new.part_id')}
+     WHERE rowid = new.part_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS alias_links_fts_au AFTER UPDATE ON alias_links BEGIN
+    UPDATE parts_fts SET alias_names = {ALIAS_NAMES_OF.format(pid='old.part_id')}
+     WHERE rowid = old.part_id;
+    UPDATE parts_fts SET alias_names = {ALIAS_NAMES_OF.format(pid='new.part_id')}
+     WHERE rowid = new.part_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS alias_links_fts_ad AFTER DELETE ON alias_links BEGIN
+    UPDATE parts_fts SET alias_names = {ALIAS_NAMES_OF.format(pid='old.part_id')}
+     WHERE rowid = old.part_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS aliases_fts_au AFTER UPDATE OF alias_name ON aliases BEGIN
+    UPDATE parts_fts SET alias_names = {ALIAS_NAMES_OF.format(pid='parts_fts.rowid')}
+     WHERE rowid IN (SELECT part_id FROM alias_links WHERE alias_id = new.id);
+END;
+"""
+
+
+def rebuild_search_index(conn):
+    """parts 전체로 FTS 인덱스를 다시 채움 (커밋은 호출자 몫)."""
+    conn.execute("DELETE FROM parts_fts")
+    conn.execute(f"""
+        INSERT INTO parts_fts(rowid, part_name, description, manufacturer, package, memo, alias_names)
+        SELECT p.id, p.part_name, p.description, p.manufacturer, p.package, p.memo,
+               {ALIAS_NAMES_OF.format(pid='p.id')}
+        FROM parts p
+    """)
+    conn.execute("INSERT INTO parts_fts(parts_fts) VALUES ('optimize')")
+
+
+def to_match_query(q):
+    """
+    사용자 입력 -> FTS5 MATCH 식.
+    토큰마다 따옴표로 감싸 접두어 검색("tok"*)으로 만들고 AND 결합.
+    MIN_PREFIX_LEN 보다 짧은 토큰("r")은 완전 일치("r")로.
+    (FTS 문법 문자/따옴표는 제거해 구문 오류 방지)
+    """
+    terms = []
+    for raw in q.split():
+        tok = raw.replace('"', '').strip()
+        if tok:
+            terms.append(f'"{tok}"*' if len(tok) >= MIN_PREFIX_LEN else f'"{tok}"')
+    return ' '.join(terms)
+
+
+# ==========================================
+# 통합 검색 (BM25 + 하이라이트)
+# ==========================================
+@search_bp.route("/api/search", methods=["GET"])
+def search_parts():
+    q = (request.args.get("q") or "").strip()
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
+    except ValueError:
+        return jsonify({"error": "limit은 정수여야 합니다."}), 400
+
+    match = to_match_query(q)
+    if not match:
+        return jsonify([])
+
+    weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+    try:
+        db = get_db()
+        # 순위는 모든 일치에 대해 bm25 로 매기되(가장 좋은 일치가 빠지지 않도록),
+        # 부품 조인 / 하이라이트 / 스니펫은 상위 limit 행에만 계산 (rowid 로 다시 찾음)
+        with metrics.untraced(db):
+            rows = db.execute(f"""
+                WITH top AS (
+                    SELECT rowid AS id, bm25(parts_fts, {weights}) AS score
+                    FROM parts_fts
+                    WHERE parts_fts MATCH ?1
+                    ORDER BY score, rowid
+                    LIMIT ?2
+                )
+                SELECT p.id AS part_id,
+                       p.part_name,
+                       p.quantity,
+                       p.package,
+                       p.manufacturer,
+                       p.category_large,
+                       f.alias_names,
+                       top.score,
+                       highlight(parts_fts, 0, '<mark>', '</mark>') AS part_name_hl,
+                       snippet(parts_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet
+                FROM top
+                CROSS JOIN parts_fts f
+                CROSS JOIN parts p
+                WHERE f.rowid = top.id AND parts_fts MATCH ?1
+                  AND p.id = top.id
+                ORDER BY top.score, top.id
+            """, (match, limit)).fetchall()
+        return jsonify([dict(r) for r in rows])
+    except sqlite3.OperationalError as e:
+        # 잘못된 검색식 등
+        return jsonify({"error": f"검색식 오류: {str(e)}"}), 400
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
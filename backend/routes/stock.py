@@ -0,0 +1,134 @@
+# backend/routes/stock.py
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+
+import ledger
+import forecast
+import versions
+from db import get_db
+
+stock_bp = Blueprint('stock', __name__)
+
+MOVEMENTS_PAGE_DEFAULT = 100
+MOVEMENTS_PAGE_MAX = 1000
+
+
+def parse_at(value):
+    """'YYYY-MM-DD' (그날 마감 시점) 또는 'YYYY-MM-DD HH:MM[:SS]' / ISO 'T' 구분 -> 로컬 시각 문자열"""
+    value = value.strip().replace("T", " ")
+    for fmt, end_of_day in (("%Y-%m-%d", True), ("%Y-%m-%d %H:%M:%S", False), ("%Y-%m-%d %H:%M", False)):
+        try:
+            at = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if end_of_day:
+            at = at.replace(hour=23, minute=59, second=59)
+        return at.strftime("%Y-%m-%d %H:%M:%S")
+    raise ValueError(value)
+
+
+# ==========================================
+# 1. 특정 시점 재고 (스냅샷 + 이후 이동 합)
+# ==========================================
+@stock_bp.route("/api/parts/<int:part_id>/stock", methods=["GET"])
+def get_stock_at(part_id):
+    """?at=YYYY-MM-DD[ HH:MM:SS] (생략하면 현재)"""
+    raw = request.args.get("at")
+    try:
+        at = parse_at(raw) if raw else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return jsonify({"error": "at은 YYYY-MM-DD 또는 YYYY-MM-DD HH:MM:SS 형식이어야 합니다."}), 400
+
+    try:
+        conn = get_db()
+        part = conn.execute("SELECT quantity FROM parts WHERE id = ?", (part_id,)).fetchone()
+        if not part:
+            return jsonify({"error": "해당 부품이 없습니다."}), 404
+        return jsonify({
+            "part_id": part_id,
+            "at": at,
+            **ledger.stock_at(conn, part_id, at),
+            "current_quantity": part["quantity"] or 0,
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ==========================================
+# 2. 이동 내역 (최신순, id 커서 페이지)
+# ==========================================
+@stock_bp.route("/api/parts/<int:part_id>/movements", methods=["GET"])
+def get_movements(part_id):
+    """?limit=100&before_id=<이전 페이지의 next_before_id>"""
+    try:
+        limit = min(max(int(request.args.get("limit", MOVEMENTS_PAGE_DEFAULT)), 1), MOVEMENTS_PAGE_MAX)
+        before_id = request.args.get("before_id", type=int)
+    except ValueError:
+        return jsonify({"error": "limit은 정수여야 합니다."}), 400
+
+    try:
+        conn = get_db()
+        where, params = "part_id = ?", [part_id]
+        if before_id is not None:
+            where += " AND id < ?"
+            params.append(before_id)
+        rows = conn.execute(
+            f"""
+            SELECT id, kind, quantity, assembly_id, order_id, note, created_at
+            FROM stock_movements
+            WHERE {where}
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (*params, limit + 1),
+        ).fetchall()
+        items = [dict(r) for r in rows[:limit]]
+        return jsonify({
+            "items": items,
+            "next_before_id": items[-1]["id"] if len(rows) > limit else None,
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ==========================================
+# 3. 소진 예측 (일간 사용량 집계 기반)
+# ==========================================
+@stock_bp.route("/api/parts/forecast", methods=["GET"])
+def get_parts_forecast():
+    """
+    최근 사용 기록이 있는 부품의 소모율 / 소진까지 일수.
+    ?sort=urgency(기본, 소진 임박 순) | coverage(발주 포함) | burn(소모율 큰 순)
+    ?window=28 (이동평균 일수), ?limit=100 (0이면 전부)
+    재고 / 주문이 바뀌거나 날짜가 바뀌기 전까지는 계산 결과를 재사용한다.
+    """
+    sort = request.args.get("sort", "urgency")
+    if sort not in forecast.SORTS:
+        return jsonify({"error": f"sort는 {', '.join(forecast.SORTS)} 중 하나여야 합니다."}), 400
+    try:
+        window = int(request.args.get("window", forecast.WINDOW_DAYS))
+        limit = int(request.args.get("limit", 100))
+    except ValueError:
+        return jsonify({"error": "window / limit은 정수여야 합니다."}), 400
+    if not 1 <= window <= forecast.MAX_WINDOW_DAYS:
+        return jsonify({"error": f"window는 1~{forecast.MAX_WINDOW_DAYS} 사이여야 합니다."}), 400
+
+    try:
+        conn = get_db()
+        today = datetime.now().date()
+        values = versions.current(conn, "epoch", "parts", "part_orders")
+        etag = versions.make_etag("forecast", (*values, today.toordinal(), window, sort, limit))
+
+        cached = versions.not_modified(etag)
+        if cached is not None:
+            return cached
+
+        resp = jsonify(forecast.forecast_report(
+            conn, values, sort=sort, limit=max(limit, 0), today=today, window=window
+        ))
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -1,3 +1,4 @@
+-- 기본 스키마 (버전 0). 인덱스 / 트리거 등 이후 변경은 migrations.py 참고
 CREATE TABLE parts (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   part_name TEXT NOT NULL UNIQUE,
@@ -0,0 +1,188 @@
+# backend/serve.py
+"""
+운영 서버 실행 (리로더 / 디버거 없음). 개발 중에는 기존처럼 python app.py.
+
+    python serve.py                            # CPU 수만큼 워커, 0.0.0.0:8000
+    python serve.py --workers 4 --port 8000
+    python serve.py --worker-class eventlet    # auto(기본) | eventlet | gevent | threading
+
+- 부모 프로세스가 앱(블루프린트, pandas 등)을 한 번 로드하고 마이그레이션을 적용한 뒤
+  리슨 소켓을 열고 워커를 fork 한다 (preload: 코드 페이지 공유, 워커 시작이 빠름).
+  죽은 워커는 다시 띄우고, SIGTERM / SIGINT 를 받으면 워커들을 멈추고 종료한다.
+- 워커 종류
+    eventlet / gevent  협력적 async 워커 (설치되어 있으면 auto 가 선택). 대기 중인 연결 / 웹소켓을 그린스레드로
+    threading          werkzeug 스레드 서버 (추가 의존성 없음)
+  SQLite 호출은 그린스레드를 양보하지 않으므로 CPU / DB 병렬성은 워커 수로 얻는다.
+- 워커가 2개 이상이면
+    SocketIO emit / room 가입은 ipc.SQLiteManager(로컬 SQLite 메시지 큐)로 모든 워커에 전달되고
+    백그라운드 작업 상태(GET /api/jobs/<id>)도 ipc 파일로 공유한다.
+    커널이 연결을 워커들에 나눠 주므로(sticky session 없음) Socket.IO 는 websocket 전송만 허용한다.
+    클라이언트: io(url, { transports: ["websocket"] })
+- /metrics 값은 워커별로 집계된다 (요청을 받은 워커의 값).
+"""
+import os
+import sys
+import time
+import signal
+import socket
+import logging
+import argparse
+
+WORKER_CLASSES = ("auto", "eventlet", "gevent", "threading")
+RESPAWN_BACKOFF_SEC = 1.0  # 시작하자마자 죽는 워커를 계속 다시 띄우지 않도록
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="재고 관리 API 운영 서버")
+    ap.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    ap.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    ap.add_argument("--workers", type=int, default=int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1))))
+    ap.add_argument("--worker-class", choices=WORKER_CLASSES, default=os.getenv("WORKER_CLASS", "auto"))
+    ap.add_argument("--backlog", type=int, default=1024)
+    ap.add_argument("--access-log", action="store_true", help="요청마다 접근 로그 출력")
+    return ap.parse_args(argv)
+
+
+def pick_worker_class(name):
+    if name != "auto":
+        return name
+    for candidate in ("eventlet", "gevent"):
+        try:
+            __import__(candidate)
+            return candidate
+        except ImportError:
+            pass
+    return "threading"
+
+
+def monkey_patch(worker_class):
+    # 앱 / 소켓 모듈을 import 하기 전에 패치해야 표준 라이브러리 블로킹 호출이 그린스레드로 바뀜
+    if worker_class == "eventlet":
+        import eventlet
+        eventlet.monkey_patch()
+    elif worker_class == "gevent":
+        from gevent import monkey
+        monkey.patch_all()
+
+
+# ─────────────────────────────────────────────────────────────
+# 워커: 물려받은 리슨 소켓으로 WSGI 서버 실행
+# ─────────────────────────────────────────────────────────────
+def serve(app, sock, worker_class, access_log=False):
+    if worker_class == "eventlet":
+        import eventlet.wsgi
+        eventlet.wsgi.server(sock, app, log_output=access_log)
+
+    elif worker_class == "gevent":
+        from gevent.pywsgi import WSGIServer
+        try:
+            from geventwebsocket.handler import WebSocketHandler
+        except ImportError:  # gevent-websocket 이 없으면 simple-websocket 이 처리
+            WebSocketHandler = None
+        kwargs = {"handler_class": WebSocketHandler} if WebSocketHandler else {}
+        WSGIServer(sock, app, log="default" if access_log else None, **kwargs).serve_forever()
+
+    else:
+        from werkzeug.serving import make_server
+        if not access_log:
+            logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        # 여러 워커가 같은 소켓을 select 하므로 accept 가 한쪽에서만 성공함 -> 논블로킹으로 빈 accept 는 건너뜀
+        sock.setblocking(False)
+        host, port = sock.getsockname()[:2]
+        server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+        server.serve_forever()
+
+
+class Arbiter:
+    """워커 fork / 감시 / 재시작 (gunicorn 의 arbiter 를 최소한으로)"""
+
+    def __init__(self, count, run_worker):
+        self.count = count
+        self.run_worker = run_worker
+        self.workers = {}  # pid -> 시작 시각
+        self.stopping = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return
+        # 워커: Ctrl-C 는 부모가 받아 SIGTERM 으로 전달
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            self.run_worker()
+        except BaseException:
+            logging.exception("worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.count):
+            self.spawn()
+
+        while self.workers:
+            pid, status = os.wait()
+            started = self.workers.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            print(f"[serve] 워커 {pid} 종료 (status {status}), 다시 시작")
+            if time.monotonic() - started < RESPAWN_BACKOFF_SEC:
+                time.sleep(RESPAWN_BACKOFF_SEC)
+            self.spawn()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    worker_class = pick_worker_class(args.worker_class)
+    workers = max(1, args.workers)
+    monkey_patch(worker_class)
+
+    if workers > 1:
+        os.environ["INVENTORY_IPC"] = "1"  # jobs.py / ipc.enabled()
+
+    # preload: 라우트 / 블루프린트 / 의존 모듈을 fork 전에 로드
+    import app as inventory
+    import db as dbpool
+    import ipc
+
+    inventory.init_db_once()
+
+    options = {"async_mode": worker_class}
+    if workers > 1:
+        ipc.reset()
+        options["client_manager"] = ipc.SQLiteManager()
+        options["transports"] = ["websocket"]
+    app = inventory.create_app(**options)
+
+    # 부모가 연 DB 연결을 워커들이 물려받아 같이 쓰지 않도록
+    dbpool.pool.close_all()
+
+    sock = socket.create_server((args.host, args.port), backlog=args.backlog)
+    print(f"[serve] http://{args.host}:{args.port}  {worker_class} 워커 {workers}개  (pid {os.getpid()})")
+
+    if workers == 1:
+        try:
+            serve(app, sock, worker_class, args.access_log)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    Arbiter(workers, lambda: serve(app, sock, worker_class, args.access_log)).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# backend/streaming.py
+"""
+큰 목록 응답을 JSON 으로 흘려보내기 (fetchmany + 제너레이터).
+
+fetchall -> dict 리스트 -> jsonify 는 결과가 메모리에 세 번 올라간다.
+뷰가 행 대신 지연 쿼리(Rows)를 돌려주면 데코레이터가 CHUNK_ROWS 행씩 읽어
+JSON 배열을 조각으로 써 내려가므로, 행 수와 상관없이 메모리 사용량이 일정하다.
+
+    @parts_bp.route("/api/parts", methods=["GET"])
+    @versions.conditional("parts", "parts")
+    @streaming.json_stream
+    def get_parts():
+        return streaming.Rows("SELECT * FROM parts", (), part_row_to_dict)
+
+    # 객체 응답: 값 중 Rows 만 배열로 스트리밍, 나머지는 그대로 직렬화
+    return {"assemblies": streaming.Rows(...), "orders": streaming.Rows(...)}
+
+- 쿼리는 응답을 돌려주기 전에 모두 실행하고 첫 묶음(CHUNK_ROWS 행)까지 읽어 직렬화하므로
+  SQL / 변환 오류가 첫 묶음 안에서 나면 제대로 된 500 으로 응답한다.
+  열린 문장들이 한 읽기 트랜잭션을 공유해 객체 안의 배열들이 같은 시점의 데이터가 된다.
+- 본문을 보내기 시작한 뒤의 오류는 상태 코드를 바꿀 수 없으므로 라우트 이름과 함께 로그를 남기고
+  다시 던져 서버가 연결을 끊게 한다 (정상 종료된 200 + 잘린 JSON 으로 보이지 않도록).
+- Rows 가 아닌 반환값(페이지 응답, 오류 튜플 등)은 손대지 않고 그대로 돌려준다.
+- 요청 컨텍스트는 본문 전송 전에 정리(teardown)되므로, 요청 연결(g.db)을 g 에서 떼어
+  응답이 닫힐 때(call_on_close) 풀에 반납한다.
+"""
+import os
+from functools import wraps, partial
+
+from flask import Response, current_app, g, jsonify, request, stream_with_context
+
+import db as dbpool
+from db import get_db
+
+CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "500"))
+
+
+class Rows:
+    """응답을 쓰는 시점에 fetchmany 로 읽어 배열 원소(transform(row))로 내보낼 쿼리"""
+
+    __slots__ = ("sql", "params", "transform", "cursor", "head")
+
+    def __init__(self, sql, params=(), transform=dict):
+        self.sql = sql
+        self.params = params
+        self.transform = transform
+        self.cursor = None
+        self.head = None
+
+    def open(self, conn, dumps):
+        """쿼리 실행 + 첫 묶음 직렬화 (응답 헤더를 보내기 전에 오류를 드러내려고)"""
+        self.cursor = conn.execute(self.sql, self.params)
+        self.head = self._encode_batch(dumps)
+
+    def _encode_batch(self, dumps):
+        batch = self.cursor.fetchmany(CHUNK_ROWS)
+        if not batch:
+            return None
+        # 묶음 단위로 한 번에 직렬화하고 바깥 [] 만 떼어냄
+        return dumps([self.transform(r) for r in batch])[1:-1]
+
+    def chunks(self, dumps):
+        """'[', 원소 묶음들, ']' 순서로 텍스트 조각 생성"""
+        yield "["
+        body, first = self.head, True
+        while body is not None:
+            yield body if first else "," + body
+            body, first = self._encode_batch(dumps), False
+        self.cursor.close()
+        yield "]"
+
+
+def _streamable(result):
+    if isinstance(result, Rows):
+        return True
+    return isinstance(result, dict) and any(isinstance(v, Rows) for v in result.values())
+
+
+def _encode(result, dumps):
+    if isinstance(result, Rows):
+        yield from result.chunks(dumps)
+        yield "\n"  # jsonify 와 같은 끝 줄바꿈
+        return
+
+    yield "{"
+    for i, (key, value) in enumerate(result.items()):
+        yield ("," if i else "") + dumps(key) + ":"
+        if isinstance(value, Rows):
+            yield from value.chunks(dumps)
+        else:
+            yield dumps(value)
+    yield "}\n"
+
+
+def _guarded(chunks, endpoint):
+    """본문 전송 중 오류: 라우트 이름과 함께 기록하고 다시 던져 연결을 끊음"""
+    sent = 0
+    try:
+        for chunk in chunks:
+            yield chunk
+            sent += len(chunk)
+    except Exception:
+        current_app.logger.exception(f"{endpoint}: stream aborted after {sent} chars")
+        raise
+
+
+def _release(queries, conn):
+    # 응답이 닫힐 때(전송 완료 / 클라이언트 끊김 / HEAD) 문장을 정리하고 연결을 반납
+    for q in queries:
+        if q.cursor is not None:
+            q.cursor.close()
+    dbpool.pool.release(conn)
+
+
+def json_stream(view):
+    """뷰가 Rows(또는 Rows 를 값으로 가진 dict)를 반환하면 스트리밍 JSON 응답으로 변환"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        result = view(*args, **kwargs)
+        if not _streamable(result):
+            return result
+
+        queries = [result] if isinstance(result, Rows) else [
+            v for v in result.values() if isinstance(v, Rows)
+        ]
+        # jsonify 와 같은 설정(ensure_ascii / sort_keys / default)에 압축 구분자
+        dumps = partial(current_app.json.dumps, separators=(",", ":"))
+        endpoint = request.endpoint or view.__name__
+        try:
+            conn = get_db()
+            for q in queries:
+                q.open(conn, dumps)
+        except Exception as e:
+            # 아직 아무것도 보내지 않았으므로 500 (연결은 teardown 이 반납)
+            current_app.logger.exception(f"{endpoint}: query failed")
+            for q in queries:
+                if q.cursor is not None:
+                    q.cursor.close()
+            return jsonify({"error": str(e)}), 500
+
+        # 연결 소유권을 제너레이터로 이전 (teardown 의 close_db 가 반납하지 않도록)
+        g.pop("db", None)
+
+        resp = Response(
+            stream_with_context(_guarded(_encode(result, dumps), endpoint)),
+            mimetype=current_app.json.mimetype,
+        )
+        resp.call_on_close(partial(_release, queries, conn))
+        return resp
+    return wrapper
@@ -0,0 +1,62 @@
+# backend/versions.py
+"""
+트리거로 올라가는 변경 카운터(change_versions) 조회 + ETag 헬퍼.
+
+카운터는 DB 안에 있으므로 여러 워커 프로세스에서도 같은 값을 본다.
+캐시/ETag는 "카운터 값이 같으면 결과도 같다"는 전제로 동작한다.
+"""
+from functools import wraps
+from flask import request, make_response
+
+from db import get_db
+
+
+def current(conn, *names):
+    """change_versions 값 튜플 (없는 이름은 0)"""
+    rows = conn.execute(
+        f"SELECT name, version FROM change_versions WHERE name IN ({','.join('?' * len(names))})",
+        names,
+    ).fetchall()
+    found = {r["name"]: r["version"] for r in rows}
+    return tuple(found.get(n, 0) for n in names)
+
+
+def make_etag(prefix, versions):
+    return f'{prefix}-' + '.'.join(str(v) for v in versions)
+
+
+def not_modified(etag):
+    """If-None-Match 가 etag와 같으면 304 응답, 아니면 None"""
+    if etag in request.if_none_match:
+        resp = make_response("", 304)
+        resp.set_etag(etag)
+        return resp
+    return None
+
+
+def conditional(prefix, *tables):
+    """
+    목록 API용 데코레이터: 관련 테이블 카운터로 ETag를 만들고,
+    If-None-Match 가 일치하면 본문 쿼리를 돌리기 전에 304로 응답.
+
+        @conditional("parts", "parts")
+        def get_parts(): ...
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            values = current(get_db(), "epoch", *tables)
+            etag = make_etag(prefix, values)
+
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code == 200:
+                resp.set_etag(etag)
+                # 캐시는 하되 매번 재검증 (304면 본문 없음)
+                resp.headers["Cache-Control"] = "no-cache"
+            return resp
+        return wrapper
+    return decorator
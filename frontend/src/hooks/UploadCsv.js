@@ -133,6 +133,23 @@ const normalizeCsvText = (text) => {
   return { csv: out.join('\n'), stats: { skippedEmpty, skippedZero } };
 };
 
+/* ---------- 백그라운드 작업 대기 ---------- */
+// 202 {job_id} 로 접수된 업로드: /api/jobs/<id> 를 done / failed 가 될 때까지 폴링
+export const waitForJob = async (jobId, { onProgress, intervalMs = 500, baseUrl = SERVER_URL } = {}) => {
+  for (;;) {
+    const res = await fetch(`${baseUrl}/api/jobs/${jobId}`);
+    const job = await res.json();
+    if (!res.ok) throw new Error(job.error || '작업 상태 조회 실패');
+    if (job.status === 'done') return job.result;
+    if (job.status === 'failed') throw new Error(job.error || '작업 실패');
+    if (onProgress) onProgress(job.progress || {});
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
+
+const progressText = (p) =>
+  p.rows_parsed != null ? `처리 중... ${p.rows_parsed}행` : '처리 중...';
+
 /* ---------- 훅 ---------- */
 export const useCsvUploader = (uploadPath) => {
   const [file, setFile] = useState(null);
@@ -158,7 +175,12 @@ export const useCsvUploader = (uploadPath) => {
       // axios: 브라우저가 Content-Type 경계(boundary)를 붙이도록 헤더 지정 금지
       const res = await axios.post(`${SERVER_URL}${uploadPath}`, formData);
 
-      const inserted = res?.data?.inserted ?? 0;
+      // 서버가 작업으로 접수하면(202) 끝날 때까지 기다렸다가 결과 표시
+      const data = res.status === 202 && res.data?.job_id
+        ? await waitForJob(res.data.job_id, { onProgress: (p) => setMessage(progressText(p)) })
+        : res.data;
+
+      const inserted = data?.inserted ?? 0;
       const suffix = (stats.skippedEmpty || stats.skippedZero)
         ? ` (빈행 ${stats.skippedEmpty}건, 수량 0행 ${stats.skippedZero}건 스킵)` : '';
       setMessage(`업로드 성공: ${inserted}개 등록됨${suffix}`);
@@ -3,6 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { Row, Col, Form, Card, Pagination, Button, InputGroup, Modal, Badge, Table } from 'react-bootstrap';
 import { FiGrid, FiList, FiTrash2 } from 'react-icons/fi';
 import { MdOutlineAdd, MdOutlineCancel } from "react-icons/md";
+import { waitForJob } from "../../hooks/UploadCsv";
 
 const SERVER_URL = process.env.REACT_APP_SERVER_URL || "http://localhost:8000";
 
@@ -53,8 +54,8 @@ const BOMPage = () => {
           create_date: d?.create_date ?? a.create_date ?? null,
           status: d?.status ?? a.status ?? 'Planned',
           quantity_to_build: a.quantity_to_build ?? d?.quantity_to_build ?? 0,
-          image_url: a.image_url
-            ?? (d?.image_filename ? `${SERVER_URL}/static/images/assemblies/${d.image_filename}` : null),
+          image_url: a.thumb_url ?? a.image_url
+            ?? (d?.thumb_url ? `${SERVER_URL}${d.thumb_url}` : null),
         };
       });
 
@@ -168,14 +169,16 @@ const BOMPage = () => {
 
       const result = await res.json();
       if (res.ok) {
-        alert(result.message);
+        // 기본은 작업으로 접수(202 {job_id}) -> 완료까지 폴링
+        const done = res.status === 202 ? await waitForJob(result.job_id, { baseUrl: SERVER_URL }) : result;
+        alert(done.message);
         fetchAssemblies();
       } else {
         alert(result.error || "업로드 실패");
       }
     } catch (err) {
       console.error("업로드 오류:", err);
-      alert("업로드 중 오류가 발생했습니다.");
+      alert(err?.message ? `업로드 실패: ${err.message}` : "업로드 중 오류가 발생했습니다.");
     }
     setIsUploading(false);
   };
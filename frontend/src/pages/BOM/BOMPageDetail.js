@@ -524,13 +524,14 @@ const BOMPageDetail = () => {
   const AliasToggleCell = ({ rowPart }) => {
     const [open, setOpen] = useState(false);
     const [loadingAlias, setLoadingAlias] = useState(false);
-    const [links, setLinks] = useState([]);
+    // 상세 응답에 같은 그룹 부품(substitutes)이 포함되어 오면 따로 조회하지 않음
+    const [links, setLinks] = useState(rowPart.substitutes || []);
     const boxRef = useRef(null);
 
     const [hasAlias, setHasAlias] = useState(!!rowPart.alias_id);
 
     useEffect(() => {
-      if (!open || !hasAlias || links.length > 0) return;
+      if (!open || !hasAlias || links.length > 0 || rowPart.substitutes) return;
 
       let alive = true;
       (async () => {
@@ -550,7 +551,7 @@ const BOMPageDetail = () => {
         }
       })();
       return () => { alive = false; };
-    }, [open, hasAlias, rowPart.alias_id, links.length]);
+    }, [open, hasAlias, rowPart.alias_id, rowPart.substitutes, links.length]);
 
     useEffect(() => {
       const onDown = (e) => {
@@ -599,7 +600,12 @@ const BOMPageDetail = () => {
             className="bg-white border rounded shadow p-2"
             style={{ position: 'absolute', top: '100%', right: 0, zIndex: 9999, minWidth: '250px' }}
           >
-            <h6 className="border-bottom pb-2 mb-2">호환 부품 목록</h6>
+            <h6 className="border-bottom pb-2 mb-2">
+              호환 부품 목록
+              {rowPart.alias_pool_stock != null && (
+                <small className="text-muted ms-2">(그룹 재고 {rowPart.alias_pool_stock})</small>
+              )}
+            </h6>
 
             {loadingAlias ? <Spinner size="sm" /> : (
               <ul className="list-unstyled mb-2">
@@ -618,7 +624,7 @@ const BOMPageDetail = () => {
                     </Button>
                   </li>
                 ))}
-                {links.length <= 1 && <li className="text-muted small">다른 연결된 부품이 없습니다.</li>}
+                {links.filter(l => l.part_id !== rowPart.part_id).length === 0 && <li className="text-muted small">다른 연결된 부품이 없습니다.</li>}
               </ul>
             )}
 
@@ -1,13 +1,14 @@
 import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Row, Col, Card, ListGroup, Badge, Accordion } from 'react-bootstrap';
-import { FaBoxOpen, FaTruck } from 'react-icons/fa';
+import { FaBoxOpen, FaTruck, FaTools } from 'react-icons/fa';
 
 import ProjectPage from '../pages/ProjectPage';
 
 const Dashboard = () => {
   const [lowStockAssemblies, setLowStockAssemblies] = useState([]);
   const [purchaseOrders, setPurchaseOrders] = useState([]);
+  const [buildable, setBuildable] = useState([]);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -18,6 +19,10 @@ const Dashboard = () => {
     fetch(`/api/part_orders/recent`)
       .then(res => res.json())
       .then(data => setPurchaseOrders(data));
+
+    fetch(`/api/assemblies/buildable`)
+      .then(res => res.json())
+      .then(data => setBuildable(Array.isArray(data) ? data.filter(a => a.lines > 0) : []));
   }, []);
 
   return (
@@ -71,6 +76,36 @@ const Dashboard = () => {
         </Col>
       </Row>
 
+      <Row className="mb-4">
+        <Col md={12}>
+          <Card className="border border-success bg-light-subtle shadow-sm">
+            <Card.Body>
+              <Card.Title className="text-success">
+                <FaTools className="me-2" />
+                현재 재고로 생산 가능 수량
+              </Card.Title>
+              <ListGroup variant="flush">
+                {buildable.length > 0 ? buildable.slice(0, 5).map((item) => (
+                  <ListGroup.Item key={item.id} className="d-flex justify-content-between align-items-center">
+                    <span style={{ cursor: "pointer" }} onClick={() => navigate(`/buildDetail/${item.id}`)}>{item.assembly_name}</span>
+                    <span>
+                      {item.limiting_part && (
+                        <small className="text-muted me-2">
+                          제약: {item.limiting_part.part_name} ({item.limiting_part.available}/{item.limiting_part.quantity_per})
+                        </small>
+                      )}
+                      <Badge bg={item.buildable > 0 ? "success" : "secondary"}>{item.buildable}대</Badge>
+                    </span>
+                  </ListGroup.Item>
+                )) : (
+                  <ListGroup.Item>BOM이 등록된 pcb가 없습니다.</ListGroup.Item>
+                )}
+              </ListGroup>
+            </Card.Body>
+          </Card>
+        </Col>
+      </Row>
+
       <Accordion defaultActiveKey="0" className="mt-4">
         <Accordion.Item eventKey="0">
           <Accordion.Header>프로젝트 목록</Accordion.Header>
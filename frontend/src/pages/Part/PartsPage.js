@@ -83,7 +83,7 @@ const GridView = ({
                 variant="top"
                 src={
                   part.image_filename
-                    ? `${SERVER_URL}/static/images/parts/${part.image_filename}`
+                    ? `${SERVER_URL}${part.thumb_url || `/static/images/parts/${part.image_filename}`}`
                     : '/default-part-icon.png'
                 }
                 alt="part preview"